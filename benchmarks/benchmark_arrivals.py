@@ -0,0 +1,95 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Benchmark of arrival sources compared to callbacks which draw their own next arrival:
+arrivals per second, for a number of concurrent Poisson sources.
+
+Usage: python3 benchmarks/benchmark_arrivals.py [num_sources] [num_arrivals]
+"""
+
+import sys
+import time
+import random
+from discrevpy import Simulator, Poisson, replication_seed
+
+
+class CallbackSource:
+    """
+    Source as a callback: each arrival draws the next interarrival time and schedules it.
+    """
+
+    def __init__(self, simulator: Simulator, seed: int, rate: float, num_arrivals: int) -> None:
+        self.simulator = simulator
+        self.rng = random.Random(seed)
+        self.rate = rate
+        self.remaining = num_arrivals
+
+    def arrival(self):
+        self.remaining -= 1
+        if self.remaining > 0:
+            self.simulator.schedule(round(self.rng.expovariate(self.rate)), self.arrival)
+
+
+def arrival():
+    pass
+
+
+def measure(use_sources: bool, num_sources: int, num_arrivals: int) -> float:
+    """
+    Measure the arrivals per second.
+
+    :param use_sources:     Whether to use arrival sources instead of callbacks
+    :param num_sources:     Number of concurrent sources
+    :param num_arrivals:    Number of arrivals per source
+
+    :return: Arrivals per second
+    """
+    simulator = Simulator()
+    simulator.ready()
+    start = time.perf_counter()
+    for index in range(num_sources):
+        seed = replication_seed(0, index)
+        if use_sources:
+            simulator.schedule_arrivals(Poisson(0.01), seed, 0, arrival, count=num_arrivals)
+        else:
+            source = CallbackSource(simulator, seed, 0.01, num_arrivals)
+            simulator.schedule(round(source.rng.expovariate(0.01)), source.arrival)
+    simulator.run()
+    return num_sources * num_arrivals / (time.perf_counter() - start)
+
+
+def main():
+    num_sources = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    num_arrivals = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    for use_sources in [False, True]:
+        print(
+            "%s: %.0f arrivals/s"
+            % (
+                "sources" if use_sources else "callbacks",
+                max(measure(use_sources, num_sources, num_arrivals) for _ in range(3))
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Benchmark of generator-based processes compared to chains of callbacks:
+steps per second and bytes allocated per step, for many concurrent entities
+which each repeatedly wait a (pseudo-random) delay.
+
+Usage: python3 benchmarks/benchmark_process.py [num_entities] [num_steps]
+"""
+
+import sys
+import time
+import tracemalloc
+from discrevpy import Simulator
+
+
+class CallbackEntity:
+    """
+    Entity as a chain of callbacks: each step schedules the next one.
+    """
+
+    def __init__(self, simulator: Simulator, index: int, num_steps: int) -> None:
+        self.simulator = simulator
+        self.index = index
+        self.remaining = num_steps
+
+    def step(self, delay):
+        self.remaining -= 1
+        if self.remaining > 0:
+            self.simulator.schedule((delay * 31 + self.index) % 97 + 1, self.step, delay + 1)
+
+
+def process_entity(index: int, num_steps: int):
+    """
+    Entity as a process: each step yields the delay until the next one.
+    """
+    delay = 0
+    for _ in range(num_steps - 1):
+        delay += 1
+        yield (delay * 31 + index) % 97 + 1
+
+
+def measure(use_processes: bool, num_entities: int, num_steps: int, trace: bool) -> float:
+    """
+    Measure the steps per second, or the bytes allocated per step.
+
+    :param use_processes:   Whether the entities are processes instead of callback chains
+    :param num_entities:    Number of concurrent entities
+    :param num_steps:       Number of steps per entity
+    :param trace:           Whether to measure the peak bytes allocated per pending step
+
+    :return: Steps per second (or bytes per pending step)
+    """
+    simulator = Simulator()
+    simulator.ready()
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    for index in range(num_entities):
+        if use_processes:
+            simulator.process(process_entity(index, num_steps), delay=index % 97)
+        else:
+            entity = CallbackEntity(simulator, index, num_steps)
+            simulator.schedule(index % 97, entity.step, 0)
+    if trace:
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return allocated / num_entities
+    simulator.run()
+    return num_entities * num_steps / (time.perf_counter() - start)
+
+
+def main():
+    num_entities = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    num_steps = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    for use_processes in [False, True]:
+        print(
+            "%s: %.0f steps/s, %.0f bytes per entity"
+            % (
+                "processes" if use_processes else "callbacks",
+                max(measure(use_processes, num_entities, num_steps, False) for _ in range(3)),
+                measure(use_processes, num_entities, num_steps, True)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Benchmark of the event loop of Simulator.run(): events executed per second
+by the loop specialized for the default binary heap, compared to the generic
+loop used for any other event queue backend (which is what run() used to be).
+
+Usage: python3 benchmarks/benchmark_run_loop.py [num_events] [repetitions]
+"""
+
+import sys
+import time
+from discrevpy import Simulator, HeapEventQueue
+
+
+class GenericHeapEventQueue(HeapEventQueue):
+    """
+    Binary heap event queue which is run by the generic event loop
+    (run() only specializes for exactly the HeapEventQueue type).
+    """
+
+
+def callback(value):
+    pass
+
+
+def measure(event_queue_class, num_events: int, with_end_time: bool) -> float:
+    """
+    Measure the events executed per second.
+
+    :param event_queue_class:   Event queue class
+    :param num_events:          Number of events
+    :param with_end_time:       Whether an end time (after the last event) is set
+
+    :return: Events executed per second
+    """
+    sim = Simulator(event_queue_class())
+    sim.ready()
+    sim.schedule_many([(i // 4, 0, callback, (i,)) for i in range(num_events)])
+    if with_end_time:
+        sim.end(num_events)
+    start = time.perf_counter()
+    sim.run()
+    duration = time.perf_counter() - start
+    sim.reset()
+    return num_events / duration
+
+
+def main():
+    num_events = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    for with_end_time in [False, True]:
+        generic = max(measure(GenericHeapEventQueue, num_events, with_end_time) for _ in range(repetitions))
+        specialized = max(measure(HeapEventQueue, num_events, with_end_time) for _ in range(repetitions))
+        print(
+            "end_time=%s generic=%.0f events/s specialized=%.0f events/s speedup=%.2fx"
+            % (with_end_time, generic, specialized, specialized / generic)
+        )
+
+
+if __name__ == "__main__":
+    main()
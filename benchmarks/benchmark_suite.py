@@ -0,0 +1,257 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Benchmark suite of the simulator, for each event queue backend and pending event count:
+
+- schedule: events scheduled per second one by one via schedule()
+- schedule_many: events scheduled per second in a batch via schedule_many()
+- dispatch: events executed per second by run() (callbacks which do nothing)
+- hold: hold operations per second (the classic discrete event simulation benchmark:
+  each executed event schedules a new one with an exponentially distributed delay,
+  such that the number of pending events stays the same)
+- far_future: as hold, but 10% of the delays are far into the future (uniform up to 10^9)
+- bytes_per_event: bytes allocated per pending event with two integer arguments
+  (measured with tracemalloc, comparable to the analysis in the memory usage documentation)
+
+Each result is printed as a JSON object on its own line (preceded by a line with the
+environment), such that results can be compared across commits.
+
+Usage: python3 benchmarks/benchmark_suite.py [--sizes 1000,10000,...] [--backends heap,...]
+                                             [--benchmarks hold,...] [--holds 200000]
+                                             [--repetitions 3] [--output results.jsonl]
+"""
+
+import gc
+import sys
+import json
+import random
+import argparse
+import platform
+import tracemalloc
+from time import perf_counter
+from discrevpy import (
+    Simulator, HeapEventQueue, CalendarEventQueue, LadderEventQueue, ArrayEventQueue, PooledEventQueue
+)
+
+BACKENDS = {
+    "heap": HeapEventQueue,
+    "calendar": CalendarEventQueue,
+    "ladder": LadderEventQueue,
+    "array": ArrayEventQueue,
+    "pooled": PooledEventQueue,
+}
+
+
+def callback(*args):
+    pass
+
+
+def random_delays(count: int, far_future: bool, seed: int) -> list:
+    """
+    Draw integer delays: exponentially distributed (mean 1000), of which
+    10% are instead uniform in [10^6, 10^9] for the far-future workload.
+
+    :param count:       Number of delays
+    :param far_future:  Whether 10% of the delays are far into the future
+    :param seed:        Seed
+
+    :return: List of delays
+    """
+    rng = random.Random(seed)
+    if far_future:
+        return [
+            rng.randint(10 ** 6, 10 ** 9) if rng.random() < 0.1 else int(rng.expovariate(0.001))
+            for _ in range(count)
+        ]
+    return [int(rng.expovariate(0.001)) for _ in range(count)]
+
+
+def filled_simulator(backend: str, size: int) -> Simulator:
+    """
+    Create a READY simulator with the given number of pending events.
+
+    :param backend:     Backend name
+    :param size:        Number of pending events
+
+    :return: Simulator
+    """
+    simulator = Simulator(BACKENDS[backend]())
+    simulator.ready()
+    simulator.schedule_many((delay, 0, callback, ()) for delay in random_delays(size, False, 1))
+    return simulator
+
+
+def timed(function) -> float:
+    """
+    Measure the wall-clock time of a function call, with the garbage collector disabled.
+
+    :param function:    Function without arguments
+
+    :return: Seconds
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        start = perf_counter()
+        function()
+        return perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def benchmark_schedule(backend: str, size: int, holds: int) -> float:
+    delays = random_delays(size, False, 1)
+    simulator = Simulator(BACKENDS[backend]())
+    simulator.ready()
+
+    def schedule_all():
+        schedule = simulator.schedule
+        for delay in delays:
+            schedule(delay, callback)
+
+    return size / timed(schedule_all)
+
+
+def benchmark_schedule_many(backend: str, size: int, holds: int) -> float:
+    events = [(delay, 0, callback, ()) for delay in random_delays(size, False, 1)]
+    simulator = Simulator(BACKENDS[backend]())
+    simulator.ready()
+    return size / timed(lambda: simulator.schedule_many(events))
+
+
+def benchmark_dispatch(backend: str, size: int, holds: int) -> float:
+    simulator = filled_simulator(backend, size)
+    return size / timed(simulator.run)
+
+
+def hold(backend: str, size: int, holds: int, far_future: bool) -> float:
+    """
+    Measure the hold operations per second: each of the pending events schedules
+    a new one when executed, such that the number of pending events stays the same.
+
+    :param backend:     Backend name
+    :param size:        Number of pending events
+    :param holds:       Number of hold operations
+    :param far_future:  Whether 10% of the delays are far into the future
+
+    :return: Hold operations per second
+    """
+    simulator = Simulator(BACKENDS[backend]())
+    simulator.ready()
+    delays = iter(random_delays(holds, far_future, 2))
+    schedule = simulator.schedule
+    remaining = [holds]
+
+    def hold_callback():
+        remaining[0] -= 1
+        if remaining[0] == 0:
+            simulator.end()
+        schedule(next(delays), hold_callback)
+
+    simulator.schedule_many(
+        (delay, 0, hold_callback, ()) for delay in random_delays(size, far_future, 1)
+    )
+    return holds / timed(simulator.run)
+
+
+def benchmark_hold(backend: str, size: int, holds: int) -> float:
+    return hold(backend, size, holds, False)
+
+
+def benchmark_far_future(backend: str, size: int, holds: int) -> float:
+    return hold(backend, size, holds, True)
+
+
+def benchmark_bytes_per_event(backend: str, size: int, holds: int) -> float:
+    rng = random.Random(1)
+    events = [
+        (rng.randint(0, 10 ** 9), 0, callback, (rng.randint(0, 10 ** 9), rng.randint(0, 10 ** 9)))
+        for _ in range(size)
+    ]
+    simulator = Simulator(BACKENDS[backend]())
+    simulator.ready()
+    schedule = simulator.schedule
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    for delay, _, function, (v1, v2) in events:
+        schedule(delay, function, v1 + 1, v2 + 1)  # New integers as if computed by the model
+    allocated = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return allocated / size
+
+
+BENCHMARKS = {
+    "schedule": (benchmark_schedule, "events/s"),
+    "schedule_many": (benchmark_schedule_many, "events/s"),
+    "dispatch": (benchmark_dispatch, "events/s"),
+    "hold": (benchmark_hold, "holds/s"),
+    "far_future": (benchmark_far_future, "holds/s"),
+    "bytes_per_event": (benchmark_bytes_per_event, "bytes"),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite of the discrevpy simulator")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000,10000000",
+                        help="Comma-separated numbers of pending events")
+    parser.add_argument("--backends", default=",".join(BACKENDS.keys()),
+                        help="Comma-separated event queue backends")
+    parser.add_argument("--benchmarks", default=",".join(BENCHMARKS.keys()),
+                        help="Comma-separated benchmarks")
+    parser.add_argument("--holds", type=int, default=200000,
+                        help="Number of hold operations of the hold workloads")
+    parser.add_argument("--repetitions", type=int, default=3,
+                        help="Repetitions of each throughput measurement (best is reported)")
+    parser.add_argument("--output", default=None, help="File to write the results to")
+    args = parser.parse_args()
+
+    output = sys.stdout if args.output is None else open(args.output, "w")
+    print(json.dumps({
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }), file=output, flush=True)
+
+    for name in args.benchmarks.split(","):
+        function, unit = BENCHMARKS[name]
+        for backend in args.backends.split(","):
+            for size in (int(size) for size in args.sizes.split(",")):
+                repetitions = 1 if unit == "bytes" else args.repetitions
+                values = [function(backend, size, args.holds) for _ in range(repetitions)]
+                value = min(values) if unit == "bytes" else max(values)
+                print(json.dumps({
+                    "benchmark": name,
+                    "backend": backend,
+                    "size": size,
+                    "value": round(value, 1),
+                    "unit": unit,
+                }), file=output, flush=True)
+
+    if output is not sys.stdout:
+        output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -26,4 +26,20 @@ In simplest terms: it maintains an event queue of callbacks
 ordered by their scheduled discrete simulation time.
 """
 
-from .simulator import simulator
+from .simulator import Simulator, simulator
+from .handles import EventHandle, PeriodicEventHandle
+from .batched import BatchedCallback
+from .event_queue import (
+    EventQueue, HeapEventQueue, CalendarEventQueue, LadderEventQueue, ArrayEventQueue,
+    PooledEventQueue
+)
+from .replication import (
+    run_replications, run_replication, replication_seed, run_warm_started
+)
+from .sweep import run_sweep, parameter_grid, model_version
+from .trace import TraceWriter, read_trace
+from .profiler import CallbackProfiler
+from .process import Process, Condition
+from .partition import Partition, run_partitioned
+from .arrivals import ArrivalSource, Distribution, Poisson, Deterministic, Pareto, Empirical
+from .columnar import ScheduledArrays
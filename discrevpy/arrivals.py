@@ -0,0 +1,293 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Stochastic arrival sources: the interarrival times of a source are drawn in batches from a
+distribution using the source's own random number generator, and its arrivals are inserted
+into the event heap one at a time, such that each source has only a single pending event.
+"""
+
+import random
+import itertools
+from typing import Union
+from .trace import CallbackWrapper
+
+
+class Distribution:
+    """
+    Base class of an interarrival time distribution.
+    """
+
+    def draw(self, rng: random.Random, n: int) -> list:
+        """
+        Draw a batch of interarrival times.
+
+        :param rng: Random number generator
+        :param n:   Number of interarrival times
+
+        :return: List of n non-negative interarrival times
+        """
+        raise NotImplementedError
+
+
+class Poisson(Distribution):
+    """
+    Poisson arrivals: exponentially distributed interarrival times.
+    """
+
+    def __init__(self, rate: float) -> None:
+        """
+        Initializes a Poisson arrival distribution.
+
+        :param rate:    Arrival rate (mean number of arrivals per time unit)
+        """
+        if not isinstance(rate, (int, float)) or rate <= 0:
+            raise ValueError("Rate must be a positive number")
+        self.__rate = rate
+
+    def draw(self, rng: random.Random, n: int) -> list:
+        return list(map(rng.expovariate, itertools.repeat(self.__rate, n)))
+
+
+class Deterministic(Distribution):
+    """
+    Deterministic arrivals: constant interarrival time.
+    """
+
+    def __init__(self, interval: Union[int, float]) -> None:
+        """
+        Initializes a deterministic arrival distribution.
+
+        :param interval:    Interarrival time
+        """
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            raise ValueError("Interval must be a positive number")
+        self.__interval = interval
+
+    def draw(self, rng: random.Random, n: int) -> list:
+        return [self.__interval] * n
+
+
+class Pareto(Distribution):
+    """
+    Pareto (heavy-tailed) arrivals: interarrival times of at least the scale, with
+    P(X > x) = (scale / x) ^ shape.
+    """
+
+    def __init__(self, shape: float, scale: float) -> None:
+        """
+        Initializes a Pareto arrival distribution.
+
+        :param shape:   Shape (tail index; the mean is finite if it is above 1)
+        :param scale:   Scale (minimum interarrival time)
+        """
+        if not isinstance(shape, (int, float)) or shape <= 0:
+            raise ValueError("Shape must be a positive number")
+        if not isinstance(scale, (int, float)) or scale <= 0:
+            raise ValueError("Scale must be a positive number")
+        self.__shape = shape
+        self.__scale = scale
+
+    def draw(self, rng: random.Random, n: int) -> list:
+        scale = self.__scale
+        return [scale * x for x in map(rng.paretovariate, itertools.repeat(self.__shape, n))]
+
+
+class Empirical(Distribution):
+    """
+    Empirical arrivals: interarrival times sampled (with replacement) from observed ones.
+    """
+
+    def __init__(self, values, weights=None) -> None:
+        """
+        Initializes an empirical arrival distribution.
+
+        :param values:  Observed interarrival times (any iterable of non-negative numbers,
+                        e.g., a list or an array)
+        :param weights: (Optional; default: equal) Relative weight of each value
+        """
+        values = [float(value) for value in values]
+        if not values or min(values) < 0 or max(values) <= 0:
+            raise ValueError(
+                "Values must be non-negative interarrival times, of which at least one positive"
+            )
+        if weights is not None:
+            weights = [float(weight) for weight in weights]
+            if len(weights) != len(values):
+                raise ValueError("There must be as many weights as values")
+        self.__values = values
+        self.__cum_weights = None if weights is None else list(itertools.accumulate(weights))
+
+    def draw(self, rng: random.Random, n: int) -> list:
+        return rng.choices(self.__values, cum_weights=self.__cum_weights, k=n)
+
+
+class ArrivalSource(CallbackWrapper):
+    """
+    Source of stochastic arrivals (see Simulator.schedule_arrivals()), which can be used to
+    stop it.
+
+    The interarrival times are drawn in batches, from which the arrival times are computed
+    at once (rounded to integer time). A source has a single entry in the event heap: when an
+    arrival is executed, the next one is inserted before its callback is called.
+    """
+
+    __slots__ = (
+        "__simulator", "__distribution", "__rng", "__batch_size", "__priority", "__callback",
+        "__args", "__remaining", "__times", "__index", "__base", "__carry", "__time",
+        "__event_id", "__generation", "__num_arrivals", "__cancelled", "__fire", "__push_event"
+    )
+
+    def __init__(
+            self,
+            simulator,
+            distribution: Distribution,
+            seed: int,
+            priority: int,
+            callback,
+            args: tuple,
+            count: Union[int, None],
+            batch_size: int
+    ) -> None:
+        """
+        Initializes an arrival source.
+
+        :param simulator:       Simulator in which the arrivals are scheduled
+        :param distribution:    Interarrival time distribution
+        :param seed:            Seed of the random number generator of the source
+        :param priority:        Priority
+        :param callback:        Callback
+        :param args:            Positional arguments passed to the callback
+        :param count:           Number of arrivals (None: unlimited)
+        :param batch_size:      Number of interarrival times drawn at once
+        """
+        self.__simulator = simulator
+        self.__distribution = distribution
+        self.__rng = random.Random(seed)
+        self.__batch_size = batch_size
+        self.__priority = priority
+        self.__callback = callback
+        self.__args = args
+        self.__remaining = count
+        self.__times = []
+        self.__index = 0
+        self.__base = 0      # Integer time to which the cumulative interarrival times are added
+        self.__carry = 0.0   # Fractional part of the cumulative interarrival times (rounded off)
+        self.__time = 0
+        self.__event_id = 0
+        self.__generation = simulator._generation()
+        self.__num_arrivals = 0
+        self.__cancelled = False
+        # Bound once, such that they are not re-created for every arrival
+        self.__fire = self._fire
+        self.__push_event = simulator._push_event
+
+    def _start(self, time: int) -> None:
+        """
+        Insert the first arrival, following the start time (only to be called by the simulator).
+
+        :param time:    Start time
+        """
+        self.__base = time
+        self.__arm()
+
+    def __refill(self) -> None:
+        """
+        Draw the next batch of interarrival times, and compute their arrival times.
+        The cumulative sum is kept small, such that no float precision is lost over time.
+        """
+        n = self.__batch_size
+        if self.__remaining is not None:
+            n = min(n, self.__remaining)  # No more than are still to be inserted
+        offsets = list(itertools.accumulate(
+            itertools.chain((self.__carry,), self.__distribution.draw(self.__rng, n))
+        ))
+        base = self.__base
+        self.__times = [base + round(offset) for offset in offsets[1:]]
+        self.__index = 0
+        last = offsets[-1]
+        self.__base = base + round(last)
+        self.__carry = last - round(last)
+
+    def __arm(self) -> None:
+        """
+        Insert the next arrival into the event heap.
+        """
+        if self.__index == len(self.__times):
+            self.__refill()
+        self.__time = self.__times[self.__index]
+        self.__index += 1
+        self.__event_id = self.__push_event(self.__time, self.__priority, self.__fire, ())
+
+    def _fire(self) -> None:
+        """
+        Execute an arrival (only to be called from the event heap).
+        """
+        self.__num_arrivals += 1
+        if self.__remaining is not None:
+            self.__remaining -= 1
+        if self.__remaining != 0:
+            self.__arm()
+        self.__callback(*self.__args)
+
+    def _wrapped_callback(self, function):
+        return self.__callback if function is ArrivalSource._fire else None
+
+    def time(self) -> int:
+        """
+        Retrieve the simulation time of the next (or last, if stopped or finished) arrival.
+
+        :return: Arrival time
+        """
+        return self.__time
+
+    def num_arrivals(self) -> int:
+        """
+        Retrieve the number of arrivals executed so far.
+
+        :return: Number of arrivals
+        """
+        return self.__num_arrivals
+
+    def is_cancelled(self) -> bool:
+        """
+        Check whether the source has been stopped.
+
+        :return: True iff the source has been stopped
+        """
+        return self.__cancelled
+
+    def cancel(self) -> bool:
+        """
+        Stop the source: no further arrivals take place.
+        It can be called from within its own callback.
+
+        :return: True iff the source was stopped by this call
+        """
+        if self.__cancelled or self.__remaining == 0:
+            return False
+        if not self.__simulator._cancel_event(  # pylint: disable=protected-access
+                self.__time, self.__priority, self.__event_id, self.__generation
+        ):
+            return False
+        self.__cancelled = True
+        return True
@@ -0,0 +1,64 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Batched callbacks: all consecutive events scheduled for a batched callback in a time moment
+are handled at once, by a single call of its handler with their positional argument tuples.
+"""
+
+
+class BatchedCallback:
+    """
+    Callback which handles all consecutive events scheduled for it in a time moment at once
+    (see Simulator.batched()).
+    """
+
+    __slots__ = ("__simulator", "__handler")
+
+    def __init__(self, sim: "Simulator", handler) -> None:
+        """
+        Initializes a batched callback.
+
+        :param sim:         Simulator in which it is scheduled
+        :param handler:     Handler called with the list of positional argument tuples
+        """
+        self.__simulator = sim
+        self.__handler = handler
+
+    def handler(self):
+        """
+        Retrieve the handler.
+
+        :return: Handler called with the list of positional argument tuples
+        """
+        return self.__handler
+
+    def __call__(self, *args) -> None:
+        """
+        Execute the handler for this event and all events directly following it
+        in the event heap which are scheduled for this callback at the same time.
+
+        :param args:    Positional arguments of this event
+        """
+        batch = [args]
+        self.__simulator._drain(self, batch)
+        self.__handler(batch)
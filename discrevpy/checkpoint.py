@@ -0,0 +1,173 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Checkpoint files of a simulator (see Simulator.checkpoint()): a header, a table of shared
+objects, and the pending events in chunks. References to the checkpointed simulator (and to
+its run generation) are stored as persistent references, which are resolved to the restoring one.
+"""
+
+import os
+import pickle
+import itertools
+from typing import Union
+from .event_queue import callback_key
+
+# Types of values which need not keep their identity when checkpointed
+_ATOMIC_TYPES = {int, float, bool, str, bytes, type(None)}
+
+
+class _CheckpointPickler(pickle.Pickler):
+    """
+    Pickler which stores references to the checkpointed simulator (e.g., of event handles
+    and batched callbacks) as a reference instead of pickling the simulator itself.
+
+    After the table of shared objects is written (see dump_shared()), every object stored
+    in it is stored as a reference to it (its memo index in the table) instead of again.
+    """
+
+    def __init__(self, file, sim: "Simulator") -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.__simulator = sim
+        self.__generation = sim._generation()  # pylint: disable=protected-access
+        # Identity of each object stored in the shared table to (memo index, object)
+        self.__shared: dict = {}
+
+    def dump_shared(self, table: list) -> None:
+        """
+        Write the table of shared objects, after which the memo is cleared.
+
+        :param table:   Shared objects
+        """
+        self.dump(table)
+        self.__shared = self.memo.copy()
+        self.clear_memo()
+
+    def persistent_id(self, obj):  # pylint: disable=inconsistent-return-statements
+        if obj is self.__simulator:
+            return "simulator"
+        if obj is self.__generation:
+            return "generation"
+        shared = self.__shared.get(id(obj))
+        if shared is not None:
+            return shared[0]
+
+
+class _CheckpointUnpickler(pickle.Unpickler):
+    """
+    Unpickler which resolves references to the checkpointed simulator to the restoring one,
+    and references to the objects of the table of shared objects to them.
+    """
+
+    def __init__(self, file, sim: "Simulator", shared: Union[dict, None] = None) -> None:
+        super().__init__(file)
+        self.__simulator = sim
+        # Memo index to each object stored in the shared table
+        self.__shared: dict = {} if shared is None else shared
+
+    def load_shared(self) -> tuple:
+        """
+        Read the table of shared objects (see _CheckpointPickler.dump_shared()).
+        As the memo is cleared after it, what follows is to be read by new unpicklers
+        (which are given the returned references).
+
+        :return: Shared objects, and memo index to each object stored in the table
+        """
+        table = self.load()
+        return table, self.memo.copy()
+
+    def persistent_load(self, pid):
+        if pid == "simulator":
+            return self.__simulator
+        if pid == "generation":
+            return self.__simulator._generation()  # pylint: disable=protected-access
+        if pid not in self.__shared:
+            raise pickle.UnpicklingError("Unknown persistent reference: " + str(pid))
+        return self.__shared[pid]
+
+
+def write_checkpoint(path: str, sim, header: tuple, state, events, chunk_size: int) -> None:
+    """
+    Write a checkpoint file: the header, the table of shared objects (the state object, the
+    distinct callbacks and the arguments passed to more than one event), and the events in
+    chunks followed by an empty chunk. The file is written to a temporary file first, such that
+    an existing checkpoint is only replaced once the new one is complete.
+
+    :param path:        Checkpoint file path
+    :param sim:         Simulator, which is stored as a reference
+    :param header:      Header, of which the first entry is the format
+    :param state:       Model state object
+    :param events:      Pending events (iterated twice)
+    :param chunk_size:  Number of events pickled at once
+    """
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        pickler = _CheckpointPickler(file, sim)
+        pickler.dump(header)
+        callbacks = {}
+        # Arguments passed to more than one event (e.g., a shared counter) are stored
+        # in the table as well, such that they keep their identity across chunks
+        arguments = set()
+        shared_arguments = {}
+        for event in events:
+            callbacks[callback_key(event[3])] = event[3]
+            values = event[4] if len(event) == 5 else (*event[4], *event[5].values())
+            for value in values:
+                if type(value) not in _ATOMIC_TYPES:
+                    if id(value) in arguments:
+                        shared_arguments[id(value)] = value
+                    else:
+                        arguments.add(id(value))
+        del arguments
+        pickler.dump_shared([state, *callbacks.values(), *shared_arguments.values()])
+        events = iter(events)
+        chunk = list(itertools.islice(events, chunk_size))
+        while chunk:
+            pickler.dump(chunk)
+            pickler.clear_memo()
+            chunk = list(itertools.islice(events, chunk_size))
+        pickler.dump(chunk)  # Empty chunk marks the end
+    os.replace(temporary_path, path)
+
+
+def read_checkpoint(path: str, sim, checkpoint_format: str, push_many) -> tuple:
+    """
+    Read a checkpoint file (see write_checkpoint()), of which the events are inserted in chunks.
+
+    :param path:                Checkpoint file path
+    :param sim:                 Simulator to which references to the simulator are resolved
+    :param checkpoint_format:   Format of which the header must be
+    :param push_many:           Function inserting a chunk (list) of events
+
+    :return: Header and model state object
+    """
+    with open(path, "rb") as file:
+        unpickler = _CheckpointUnpickler(file, sim)
+        header = unpickler.load()
+        if not isinstance(header, tuple) or header[0] != checkpoint_format:
+            raise ValueError("Not a checkpoint file: " + str(path))
+        table, shared = unpickler.load_shared()
+        chunk = _CheckpointUnpickler(file, sim, shared).load()
+        while chunk:
+            push_many(chunk)
+            chunk = _CheckpointUnpickler(file, sim, shared).load()
+    return header, table[0]
@@ -0,0 +1,193 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Events scheduled from arrays: the delays, priorities and argument columns are kept as arrays,
+and only the next event (in execution order) is inserted into the event heap, at which time
+its arguments are taken from the columns.
+"""
+
+import bisect
+import operator
+import itertools
+from array import array
+from collections import Counter
+from typing import Union
+from .trace import CallbackWrapper
+
+
+def int64_array(values, name: str) -> array:
+    """
+    Copy a sequence of integers into a 64-bit integer array.
+
+    :param values:  Sequence of integers (e.g., a list, an array.array or a NumPy array)
+    :param name:    Name of the values (e.g., "Delay") used in the error message
+
+    :return: Array of the values
+    """
+    try:
+        return array("q", values)
+    except (TypeError, OverflowError) as e:
+        raise ValueError(name + " must be an integer (of at most 64 bits)") from e
+
+
+def execution_order(delays: array, priorities: Union[array, None]) -> Union[array, None]:
+    """
+    Determine the execution order of events scheduled from arrays:
+    by delay, then priority, then index in the arrays.
+
+    :param delays:      Delay of each event
+    :param priorities:  Priority of each event (None: all zero)
+
+    :return: Indices of the events in execution order (None: if already in execution order)
+    """
+    following_delays = itertools.islice(delays, 1, None)
+    if priorities is None:
+        if not all(map(operator.le, delays, following_delays)):
+            return array("q", sorted(range(len(delays)), key=delays.__getitem__))
+    elif not all(map(
+            operator.le,
+            zip(delays, priorities),
+            zip(following_delays, itertools.islice(priorities, 1, None))
+    )):
+        indices = sorted(range(len(delays)), key=priorities.__getitem__)
+        indices.sort(key=delays.__getitem__)  # Stable, thus ties remain by priority
+        return array("q", indices)
+    return None
+
+
+def delay_bit_lengths(delays: array, order: Union[array, None]) -> Counter:
+    """
+    Count the number of events per delay bit length
+    (if the delays are sorted, by bisecting at each power of two).
+
+    :param delays:  Delay of each event
+    :param order:   Indices of the events in execution order (None: if already sorted)
+
+    :return: Delay bit length to number of events
+    """
+    if order is not None or not delays:
+        return Counter(map(int.bit_length, delays))
+    histogram = Counter()
+    lower = 0
+    for bit_length in range(delays[-1].bit_length() + 1):
+        upper = bisect.bisect_left(delays, 1 << bit_length, lower)
+        if upper > lower:
+            histogram[bit_length] = upper - lower
+        lower = upper
+    return histogram
+
+
+class ScheduledArrays(CallbackWrapper):
+    """
+    Events scheduled from arrays (see Simulator.schedule_arrays()).
+
+    The events are executed in the order of (time, priority, index in the arrays), which is the
+    same order as if they had been scheduled one by one (their event identifiers are reserved
+    at once). Only the next of them is in the event heap: when it is executed, the one after it
+    is inserted before the callback is called with the arguments taken from the columns.
+    """
+
+    __slots__ = (
+        "__start", "__delays", "__priorities", "__order", "__callback", "__columns",
+        "__first_event_id", "__size", "__position", "__fire", "__push_event"
+    )
+
+    def __init__(
+            self,
+            simulator,
+            start: int,
+            delays: array,
+            priorities: Union[array, None],
+            order: Union[array, None],
+            callback,
+            columns: tuple,
+            first_event_id: int
+    ) -> None:
+        """
+        Initializes events scheduled from arrays.
+
+        :param simulator:       Simulator in which the events are scheduled
+        :param start:           Time from which the delays count (the time of scheduling)
+        :param delays:          Delay of each event
+        :param priorities:      Priority of each event (None: all zero)
+        :param order:           Indices of the events in execution order (None: as is)
+        :param callback:        Callback
+        :param columns:         Columns of the positional arguments of each event
+        :param first_event_id:  Event identifier of the first event (in the arrays), the others
+                                being consecutive
+        """
+        self.__start = start
+        self.__delays = delays
+        self.__priorities = priorities
+        self.__order = order
+        self.__callback = callback
+        self.__columns = columns
+        self.__first_event_id = first_event_id
+        self.__size = len(delays)
+        self.__position = 0  # Position in execution order of the event in the event heap
+        # Bound once, such that they are not re-created for every event
+        self.__fire = self._fire
+        self.__push_event = simulator._push_reserved_event
+
+    def _arm(self) -> None:
+        """
+        Insert the event at the current position into the event heap
+        (only to be called by the simulator, and by itself).
+        """
+        index = self.__position if self.__order is None else self.__order[self.__position]
+        self.__push_event(
+            self.__start + self.__delays[index],
+            0 if self.__priorities is None else self.__priorities[index],
+            self.__first_event_id + index,
+            self.__fire
+        )
+
+    def _fire(self) -> None:
+        """
+        Execute the event at the current position (only to be called from the event heap).
+        """
+        position = self.__position
+        index = position if self.__order is None else self.__order[position]
+        self.__position = position + 1
+        if position + 1 < self.__size:
+            self._arm()
+        self.__callback(*[column[index] for column in self.__columns])
+
+    def _wrapped_callback(self, function):
+        return self.__callback if function is ScheduledArrays._fire else None
+
+    def num_events(self) -> int:
+        """
+        Retrieve the number of events scheduled from the arrays.
+
+        :return: Number of events
+        """
+        return self.__size
+
+    def num_deferred(self) -> int:
+        """
+        Retrieve the number of events which are not yet executed nor in the event heap.
+
+        :return: Number of deferred events
+        """
+        return max(self.__size - self.__position - 1, 0)
@@ -0,0 +1,958 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Event queue backends for the discrete event simulator.
+
+An event queue stores the pending events of a Simulator ordered by
+(time, priority, event_id). Each event is a tuple of which the first
+three entries are these keys (followed by the callback, its arguments
+and, only if there are any, its keyword arguments). As event identifiers are unique, the
+ordering between any two events is strict.
+"""
+
+import heapq
+import bisect
+from array import array
+from types import MethodType, BuiltinMethodType
+
+
+def callback_key(callback):
+    """
+    Key identifying a callback. Bound methods are created anew on each access, as such they
+    are identified by their owner and function (or name, for built-in methods) instead of by
+    identity. The key is only valid as long as a reference to the callback is held.
+
+    :param callback:    Callback
+
+    :return: Key
+    """
+    if isinstance(callback, MethodType):
+        return id(callback.__self__), id(callback.__func__)
+    if isinstance(callback, BuiltinMethodType) and callback.__self__ is not None:
+        return id(callback.__self__), callback.__name__
+    return id(callback)
+
+
+class EventQueue:
+    """
+    Base class of an event queue backend.
+
+    A backend must return the events in ascending (time, priority, event_id)
+    order. The simulator only ever inserts events with a time equal to or
+    later than the time of the last event it has removed.
+    """
+
+    def push(self, event: tuple) -> None:
+        """
+        Insert an event.
+
+        :param event:   Event tuple (time, priority, event_id, ...)
+        """
+        raise NotImplementedError
+
+    def push_many(self, events: list) -> None:
+        """
+        Insert a batch of events.
+
+        :param events:  List of event tuples
+        """
+        for event in events:
+            self.push(event)
+
+    def pop(self) -> tuple:
+        """
+        Remove and return the first event. The queue must not be empty.
+
+        :return: First event tuple
+        """
+        raise NotImplementedError
+
+    def peek(self) -> tuple:
+        """
+        Retrieve the first event without removing it.
+
+        :return: First event tuple, or None if the queue is empty
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """
+        Remove all events.
+        """
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __iter__(self):
+        """
+        Iterate over all events in no particular order.
+        """
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class HeapEventQueue(EventQueue):
+    """
+    Binary heap event queue (default backend).
+
+    Insertion and removal are O(log n).
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty binary heap event queue.
+        """
+        self.__heap: list = []
+
+    def push(self, event: tuple) -> None:
+        heapq.heappush(self.__heap, event)
+
+    def push_many(self, events: list) -> None:
+        # Re-heapify in O(n) if that is cheaper than pushing one by one in O(k log n)
+        heap = self.__heap
+        total = len(heap) + len(events)
+        if len(events) * total.bit_length() > total:
+            heap.extend(events)
+            heapq.heapify(heap)
+        else:
+            for event in events:
+                heapq.heappush(heap, event)
+
+    def pop(self) -> tuple:
+        return heapq.heappop(self.__heap)
+
+    def peek(self) -> tuple:
+        return self.__heap[0] if self.__heap else None
+
+    def clear(self) -> None:
+        self.__heap.clear()
+
+    def heap(self) -> list:
+        """
+        Retrieve the list of the binary heap, which is the same list for the lifetime
+        of the queue. It must only be modified via the heapq module.
+
+        :return: List of the binary heap
+        """
+        return self.__heap
+
+    def __len__(self) -> int:
+        return len(self.__heap)
+
+    def __iter__(self):
+        return iter(self.__heap)
+
+
+class CalendarEventQueue(EventQueue):
+    """
+    Calendar queue (R. Brown, 1988).
+
+    Events are hashed by time into an array of buckets (the "days" of a "year"),
+    each bucket being a small sorted list. Removal walks the days in order, only
+    taking an event from the current bucket if it falls within the current year.
+    The number of buckets is doubled (halved) whenever the number of events exceeds
+    twice (drops below half) the number of buckets, at which time the bucket width is
+    re-estimated from the separation of the events at the front of the queue.
+    As the time distribution can also change while the number of events stays the same
+    (e.g., far-future events accumulating), the bucket width is re-estimated as well
+    once locating the first event has become too costly: if since the last resize more
+    days have been walked than there are buckets, and more than MAX_AVERAGE_WALK per
+    removal on average. This makes insertion and removal amortized O(1) for most time
+    distributions.
+    """
+
+    # Minimum number of buckets
+    MIN_NUM_BUCKETS = 2
+
+    # Number of events at the front of the queue sampled to estimate the bucket width
+    WIDTH_SAMPLE_SIZE = 25
+
+    # Average number of days walked per removal above which the bucket width is re-estimated
+    MAX_AVERAGE_WALK = 4
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty calendar event queue.
+        """
+        self.__size: int = 0
+        self.__width: int = 1
+        self.__buckets: list = [[] for _ in range(CalendarEventQueue.MIN_NUM_BUCKETS)]
+        self.__current: int = 0      # Index of the current bucket
+        self.__current_top: int = 1  # Exclusive upper time bound of the current bucket
+        # Cost of locating the first event since the last resize
+        self.__days_walked: int = 0
+        self.__num_removed: int = 0
+
+    def __move_to(self, time: int) -> None:
+        """
+        Move the current bucket to the one containing the time.
+
+        :param time:    Time
+        """
+        day = time // self.__width
+        self.__current = day % len(self.__buckets)
+        self.__current_top = (day + 1) * self.__width
+
+    def __locate(self) -> list:
+        """
+        Move the current bucket to the bucket containing the first event.
+        The queue must not be empty.
+
+        :return: Bucket containing the first event
+        """
+        buckets = self.__buckets
+        num_buckets = len(buckets)
+        width = self.__width
+        i = self.__current
+        top = self.__current_top
+
+        # Walk at most one year of days
+        for days in range(num_buckets):
+            bucket = buckets[i]
+            if bucket and bucket[0][0] < top:
+                self.__current = i
+                self.__current_top = top
+                self.__days_walked += days
+                break
+            i += 1
+            if i == num_buckets:
+                i = 0
+            top += width
+
+        # The next event is more than a year away: directly search the minimum
+        # (which costs about as much as walking another year)
+        else:
+            first = min(bucket[0] for bucket in buckets if bucket)
+            self.__move_to(first[0])
+            self.__days_walked += 2 * num_buckets
+
+        # Too costly on average since the last resize: the bucket width no longer fits
+        if (
+                self.__days_walked > num_buckets
+                and self.__days_walked > CalendarEventQueue.MAX_AVERAGE_WALK * self.__num_removed
+        ):
+            self.__resize(num_buckets)
+        return self.__buckets[self.__current]
+
+    def __resize(self, num_buckets: int) -> None:
+        """
+        Redistribute all events over a new number of buckets,
+        with a bucket width estimated from the events at the front.
+
+        :param num_buckets: New number of buckets
+        """
+        events = sorted(event for bucket in self.__buckets for event in bucket)
+
+        # Average separation of distinct times at the front of the queue,
+        # re-averaged without the separations exceeding twice the first average
+        # such that a few outliers do not stretch the width
+        sample = events[:CalendarEventQueue.WIDTH_SAMPLE_SIZE]
+        separations = [b[0] - a[0] for a, b in zip(sample, sample[1:]) if b[0] != a[0]]
+        if separations:
+            average = sum(separations) / len(separations)
+            separations = [s for s in separations if s <= 2 * average]
+            average = sum(separations) / len(separations)
+            self.__width = max(1, int(3 * average))
+        else:
+            self.__width = 1
+
+        # Events are sorted, so appending keeps each bucket sorted
+        buckets = [[] for _ in range(num_buckets)]
+        width = self.__width
+        for event in events:
+            buckets[(event[0] // width) % num_buckets].append(event)
+        self.__buckets = buckets
+        self.__move_to(events[0][0] if events else 0)
+        self.__days_walked = 0
+        self.__num_removed = 0
+
+    def push(self, event: tuple) -> None:
+        time = event[0]
+        bisect.insort(self.__buckets[(time // self.__width) % len(self.__buckets)], event)
+        self.__size += 1
+
+        # An event before the current bucket (possible after peek()) or into an
+        # empty queue moves the current bucket back
+        if self.__size == 1 or time < self.__current_top - self.__width:
+            self.__move_to(time)
+
+        if self.__size > 2 * len(self.__buckets):
+            self.__resize(2 * len(self.__buckets))
+
+    def pop(self) -> tuple:
+        if self.__size == 0:
+            raise IndexError("pop from empty event queue")
+        event = self.__locate().pop(0)
+        self.__size -= 1
+        self.__num_removed += 1
+        num_buckets = len(self.__buckets)
+        if self.__size < num_buckets // 2 and num_buckets > CalendarEventQueue.MIN_NUM_BUCKETS:
+            self.__resize(num_buckets // 2)
+        return event
+
+    def peek(self) -> tuple:
+        if self.__size == 0:
+            return None
+        return self.__locate()[0]
+
+    def clear(self) -> None:
+        self.__size = 0
+        self.__width = 1
+        self.__buckets = [[] for _ in range(CalendarEventQueue.MIN_NUM_BUCKETS)]
+        self.__current = 0
+        self.__current_top = 1
+        self.__days_walked = 0
+        self.__num_removed = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __iter__(self):
+        return (event for bucket in self.__buckets for event in bucket)
+
+
+class _Rung:
+    """
+    Rung of a ladder queue: consecutive buckets of equal time width
+    of which the ones before the current bucket have been consumed.
+    """
+
+    __slots__ = ("buckets", "width", "current", "current_start")
+
+    def __init__(self, start: int, width: int, num_buckets: int) -> None:
+        self.buckets: list = [[] for _ in range(num_buckets)]
+        self.width: int = width
+        self.current: int = 0
+        self.current_start: int = start
+
+
+class LadderEventQueue(EventQueue):
+    """
+    Ladder queue (W. T. Tang, R. S. M. Goh and I. L.-J. Thng, 2005).
+
+    The queue consists of three tiers:
+
+    * *Top*: an unsorted list into which all events at or beyond the top start time
+      are appended in O(1) (the far future);
+    * *Rungs*: a ladder of bucket arrays, each rung splitting one bucket of the rung
+      above into finer buckets, into which events are appended unsorted;
+    * *Bottom*: a small heap of the events which are about to be executed.
+
+    Only when the bottom runs empty is the next bucket of the lowest rung either
+    split into a new rung (if it holds more than THRESHOLD events) or moved into
+    the bottom. As such, far-in-the-future events are not sorted until their epoch
+    is reached, which makes insertion and removal amortized O(1).
+    """
+
+    # Maximum number of events in a bucket before it is split into a new rung
+    THRESHOLD = 50
+
+    # Maximum number of rungs
+    MAX_RUNGS = 8
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty ladder event queue.
+        """
+        self.__size: int = 0
+        self.__top: list = []
+        self.__top_min: int = 0
+        self.__top_max: int = 0
+        self.__top_start: int = 0
+        self.__rungs: list = []
+        self.__bottom: list = []
+
+    def __spawn_rung(self, start: int, span: int, events: list) -> None:
+        """
+        Add a new lowest rung covering [start, start + span) and distribute the events over it.
+
+        :param start:   Start time of the rung
+        :param span:    Time span of the rung
+        :param events:  Events, all within the time span of the rung
+        """
+        width = -(-span // len(events))
+        rung = _Rung(start, width, -(-span // width))
+        buckets = rung.buckets
+        for event in events:
+            buckets[(event[0] - start) // width].append(event)
+        self.__rungs.append(rung)
+
+    def __refill(self) -> None:
+        """
+        Refill the empty bottom with the next epoch of events.
+        """
+        rungs = self.__rungs
+        while True:
+
+            # Without rungs, the top is transferred
+            if not rungs:
+                top = self.__top
+                if not top:
+                    return
+                self.__top = []
+                top_min = self.__top_min
+                span = self.__top_max - top_min + 1
+                if len(top) <= LadderEventQueue.THRESHOLD or span == 1:
+                    self.__top_start = self.__top_max + 1
+                    heapq.heapify(top)
+                    self.__bottom = top
+                    return
+                self.__spawn_rung(top_min, span, top)
+                rung = rungs[0]
+                self.__top_start = rung.current_start + len(rung.buckets) * rung.width
+                continue
+
+            # Find the next non-empty bucket of the lowest rung
+            rung = rungs[-1]
+            buckets = rung.buckets
+            while rung.current < len(buckets) and not buckets[rung.current]:
+                rung.current += 1
+                rung.current_start += rung.width
+            if rung.current == len(buckets):
+                rungs.pop()
+                continue
+
+            # Consume the bucket
+            bucket = buckets[rung.current]
+            buckets[rung.current] = None
+            bucket_start = rung.current_start
+            rung.current += 1
+            rung.current_start += rung.width
+
+            # Either split it into a new rung or sort it into the bottom
+            if (
+                    len(bucket) > LadderEventQueue.THRESHOLD
+                    and len(rungs) < LadderEventQueue.MAX_RUNGS
+                    and min(bucket)[0] != max(bucket)[0]
+            ):
+                self.__spawn_rung(bucket_start, rung.width, bucket)
+            else:
+                heapq.heapify(bucket)
+                self.__bottom = bucket
+                return
+
+    def push(self, event: tuple) -> None:
+        time = event[0]
+        self.__size += 1
+
+        # Far future: top
+        if time >= self.__top_start:
+            if not self.__top:
+                self.__top_min = time
+                self.__top_max = time
+            elif time < self.__top_min:
+                self.__top_min = time
+            elif time > self.__top_max:
+                self.__top_max = time
+            self.__top.append(event)
+            return
+
+        # Coarsest rung whose remainder includes the time
+        for rung in self.__rungs:
+            if time >= rung.current_start:
+                rung.buckets[rung.current + (time - rung.current_start) // rung.width].append(event)
+                return
+
+        # Near future: bottom
+        heapq.heappush(self.__bottom, event)
+
+    def pop(self) -> tuple:
+        if not self.__bottom:
+            self.__refill()
+            if not self.__bottom:
+                raise IndexError("pop from empty event queue")
+        self.__size -= 1
+        return heapq.heappop(self.__bottom)
+
+    def peek(self) -> tuple:
+        if not self.__bottom:
+            self.__refill()
+            if not self.__bottom:
+                return None
+        return self.__bottom[0]
+
+    def clear(self) -> None:
+        self.__size = 0
+        self.__top = []
+        self.__top_min = 0
+        self.__top_max = 0
+        self.__top_start = 0
+        self.__rungs = []
+        self.__bottom = []
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __iter__(self):
+        for rung in self.__rungs:
+            for bucket in rung.buckets[rung.current:]:
+                yield from bucket
+        yield from self.__top
+        yield from self.__bottom
+
+
+class ArrayEventQueue(EventQueue):
+    """
+    Structure-of-arrays binary heap event queue.
+
+    Instead of one tuple per event, the time, priority and event id of all events
+    are stored in typed contiguous arrays (64-bit signed integers), and the
+    callbacks in an interned table referenced by index. Per pending event, only
+    its positional arguments tuple (if not empty) remains a separate object.
+    This reduces memory usage by more than half for large queues, at the cost of
+    slower insertion and removal (the heap is sifted in Python instead of C).
+
+    The time and priority must fit in a 64-bit signed integer.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty structure-of-arrays event queue.
+        """
+        self.__times: array = array("q")
+        self.__priorities: array = array("q")
+        self.__event_ids: array = array("q")
+        self.__callbacks: array = array("q")  # Index into the callback table
+        self.__args: list = []
+        self.__kwargs: dict = {}  # Event id to keyword arguments (for the few events with them)
+
+        # Interned callbacks with a count of their pending events,
+        # such that their slots are freed when they have none
+        self.__callback_table: list = []
+        self.__callback_counts: list = []
+        self.__callback_index: dict = {}
+        self.__free_callback_slots: list = []
+
+    def __intern(self, callback) -> int:
+        """
+        Retrieve the index of the callback in the callback table, adding it if not yet present.
+
+        :param callback:    Callback
+
+        :return: Index in the callback table
+        """
+        # The callback table holds the reference, such that the key stays valid
+        key = callback_key(callback)
+        index = self.__callback_index.get(key)
+        if index is None:
+            if self.__free_callback_slots:
+                index = self.__free_callback_slots.pop()
+                self.__callback_table[index] = callback
+            else:
+                index = len(self.__callback_table)
+                self.__callback_table.append(callback)
+                self.__callback_counts.append(0)
+            self.__callback_index[key] = index
+        self.__callback_counts[index] += 1
+        return index
+
+    def __release(self, index: int):
+        """
+        Release one pending event reference to a callback in the callback table.
+
+        :param index:   Index in the callback table
+
+        :return: Callback
+        """
+        callback = self.__callback_table[index]
+        self.__callback_counts[index] -= 1
+        if self.__callback_counts[index] == 0:
+            del self.__callback_index[callback_key(callback)]
+            self.__callback_table[index] = None
+            self.__free_callback_slots.append(index)
+        return callback
+
+    def __move_up(self, pos: int) -> None:
+        """
+        Move the entry at the position up towards the root until the heap property holds.
+
+        :param pos:     Position in the heap
+        """
+        times = self.__times
+        priorities = self.__priorities
+        event_ids = self.__event_ids
+        callbacks = self.__callbacks
+        args = self.__args
+        time = times[pos]
+        priority = priorities[pos]
+        event_id = event_ids[pos]
+        callback = callbacks[pos]
+        arg = args[pos]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            parent_time = times[parent]
+            if parent_time < time or (
+                    parent_time == time and (
+                        priorities[parent] < priority
+                        or (priorities[parent] == priority and event_ids[parent] < event_id)
+                    )
+            ):
+                break
+            times[pos] = parent_time
+            priorities[pos] = priorities[parent]
+            event_ids[pos] = event_ids[parent]
+            callbacks[pos] = callbacks[parent]
+            args[pos] = args[parent]
+            pos = parent
+        times[pos] = time
+        priorities[pos] = priority
+        event_ids[pos] = event_id
+        callbacks[pos] = callback
+        args[pos] = arg
+
+    def __move_down(self, pos: int) -> None:
+        """
+        Move the entry at the position down towards the leaves until the heap property holds.
+
+        :param pos:     Position in the heap
+        """
+        times = self.__times
+        priorities = self.__priorities
+        event_ids = self.__event_ids
+        callbacks = self.__callbacks
+        args = self.__args
+        size = len(times)
+        time = times[pos]
+        priority = priorities[pos]
+        event_id = event_ids[pos]
+        callback = callbacks[pos]
+        arg = args[pos]
+        child = 2 * pos + 1
+        while child < size:
+
+            # Smallest of the two children
+            right = child + 1
+            if right < size and (
+                    times[right] < times[child] or (
+                        times[right] == times[child] and (
+                            priorities[right] < priorities[child] or (
+                                priorities[right] == priorities[child]
+                                and event_ids[right] < event_ids[child]
+                            )
+                        )
+                    )
+            ):
+                child = right
+
+            # Stop if the entry is not larger than the smallest child
+            child_time = times[child]
+            if time < child_time or (
+                    time == child_time and (
+                        priority < priorities[child]
+                        or (priority == priorities[child] and event_id < event_ids[child])
+                    )
+            ):
+                break
+
+            times[pos] = child_time
+            priorities[pos] = priorities[child]
+            event_ids[pos] = event_ids[child]
+            callbacks[pos] = callbacks[child]
+            args[pos] = args[child]
+            pos = child
+            child = 2 * pos + 1
+        times[pos] = time
+        priorities[pos] = priority
+        event_ids[pos] = event_id
+        callbacks[pos] = callback
+        args[pos] = arg
+
+    def __event(self, pos: int) -> tuple:
+        """
+        Materialize the event tuple at the position.
+
+        :param pos:     Position in the heap
+
+        :return: Event tuple
+        """
+        event_id = self.__event_ids[pos]
+        event = (
+            self.__times[pos], self.__priorities[pos], event_id,
+            self.__callback_table[self.__callbacks[pos]], self.__args[pos]
+        )
+        if event_id in self.__kwargs:
+            return event + (self.__kwargs[event_id],)
+        return event
+
+    def push(self, event: tuple) -> None:
+        try:
+            self.__times.append(event[0])
+            self.__priorities.append(event[1])
+        except OverflowError as e:
+            del self.__times[len(self.__args):]
+            raise ValueError("Time and priority must fit in a 64-bit signed integer") from e
+        self.__event_ids.append(event[2])
+        self.__callbacks.append(self.__intern(event[3]))
+        self.__args.append(event[4])
+        if len(event) == 6:
+            self.__kwargs[event[2]] = event[5]
+        self.__move_up(len(self.__args) - 1)
+
+    def pop(self) -> tuple:
+        if not self.__args:
+            raise IndexError("pop from empty event queue")
+        event = self.__event(0)
+        self.__release(self.__callbacks[0])
+        if event[2] in self.__kwargs:
+            del self.__kwargs[event[2]]
+
+        # Move the last entry to the root and restore the heap property
+        last = len(self.__args) - 1
+        columns = (self.__times, self.__priorities, self.__event_ids, self.__callbacks, self.__args)
+        for values in columns:
+            values[0] = values[last]
+            del values[last]
+        if last > 0:
+            self.__move_down(0)
+        return event
+
+    def peek(self) -> tuple:
+        if not self.__args:
+            return None
+        return self.__event(0)
+
+    def clear(self) -> None:
+        for values in (self.__times, self.__priorities, self.__event_ids, self.__callbacks):
+            del values[:]
+        self.__args.clear()
+        self.__kwargs.clear()
+        self.__callback_table.clear()
+        self.__callback_counts.clear()
+        self.__callback_index.clear()
+        self.__free_callback_slots.clear()
+
+    def __len__(self) -> int:
+        return len(self.__args)
+
+    def __iter__(self):
+        return (self.__event(pos) for pos in range(len(self.__args)))
+
+
+class _EventRecord:
+    """
+    Mutable record of a pending event in the PooledEventQueue, recycled after removal.
+    """
+
+    __slots__ = ("time", "priority", "event_id", "callback", "args", "kwargs")
+
+    def __init__(self) -> None:
+        self.time = 0
+        self.priority = 0
+        self.event_id = 0
+        self.callback = None
+        self.args = None
+        self.kwargs = None
+
+
+class PooledEventQueue(EventQueue):
+    """
+    Binary heap of packed integer keys, with the events stored in pooled records.
+
+    Each pending event is stored in a mutable record, which is taken from a free list and
+    returned to it once the event is removed. The heap only holds a single integer per event,
+    which packs (time, priority, event_id, record slot) such that integer comparison orders the
+    events. In steady state (as many events being scheduled as executed), no event record
+    is allocated: the pool hits and misses counters show how many records were recycled and
+    how many had to be allocated. The simulator has a specialized event loop for this queue,
+    which takes the callback and arguments directly from the record instead of a tuple.
+
+    The priority and event id must fit in a 64-bit signed integer, and at most 2^32 events
+    can be pending.
+    """
+
+    # Bit layout of a key: time | priority (biased) | event id | slot
+    SLOT_BITS = 32
+    SLOT_MASK = (1 << SLOT_BITS) - 1
+    EVENT_ID_BITS = 64
+    PRIORITY_BITS = 64
+    PRIORITY_BIAS = 1 << (PRIORITY_BITS - 1)
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty pooled event queue.
+        """
+        self.__heap: list = []
+        self.__records: list = []      # Slot to record
+        self.__free_slots: list = []   # Slots of the records not in use
+        self.__hits: int = 0
+        self.__misses: int = 0
+
+    def __key(self, event: tuple) -> int:
+        """
+        Store the event in a free record and compute its packed key.
+
+        :param event:   Event tuple
+
+        :return: Key
+        """
+        time, priority, event_id = event[0], event[1], event[2]
+        biased_priority = priority + 0x8000000000000000  # PRIORITY_BIAS
+        if biased_priority < 0 or biased_priority >> 64:
+            raise ValueError("Priority must fit in a 64-bit signed integer")
+        free_slots = self.__free_slots
+        if free_slots:
+            slot = free_slots.pop()
+            record = self.__records[slot]
+            self.__hits += 1
+        else:
+            slot = len(self.__records)
+            if slot > PooledEventQueue.SLOT_MASK:
+                raise ValueError("Pooled event queue can hold at most 2^32 events")
+            record = _EventRecord()
+            self.__records.append(record)
+            self.__misses += 1
+        record.time = time
+        record.priority = priority
+        record.event_id = event_id
+        record.callback = event[3]
+        record.args = event[4]
+        record.kwargs = event[5] if len(event) == 6 else None
+        return (((time << 64 | biased_priority) << 64 | event_id) << 32) | slot  # Bit layout
+
+    @staticmethod
+    def unpack_key(key: int) -> tuple:
+        """
+        Unpack the time, priority and event identifier of a key (see the bit layout).
+
+        :param key:     Key
+
+        :return: (time, priority, event_id)
+        """
+        return (
+            key >> 160,
+            (key >> 96 & 0xFFFFFFFFFFFFFFFF) - PooledEventQueue.PRIORITY_BIAS,
+            key >> 32 & 0xFFFFFFFFFFFFFFFF
+        )
+
+    def __event(self, key: int) -> tuple:
+        """
+        Materialize the event tuple of a key.
+
+        :param key:     Key
+
+        :return: Event tuple
+        """
+        record = self.__records[key & PooledEventQueue.SLOT_MASK]
+        if record.kwargs is None:
+            return record.time, record.priority, record.event_id, record.callback, record.args
+        return (
+            record.time, record.priority, record.event_id, record.callback, record.args,
+            record.kwargs
+        )
+
+    def push(self, event: tuple) -> None:
+        heapq.heappush(self.__heap, self.__key(event))
+
+    def push_many(self, events: list) -> None:
+        # Re-heapify in O(n) if that is cheaper than pushing one by one in O(k log n)
+        heap = self.__heap
+        total = len(heap) + len(events)
+        if len(events) * total.bit_length() > total:
+            heap.extend([self.__key(event) for event in events])
+            heapq.heapify(heap)
+        else:
+            for event in events:
+                heapq.heappush(heap, self.__key(event))
+
+    def pop(self) -> tuple:
+        key = heapq.heappop(self.__heap)
+        event = self.__event(key)
+        self.recycle(key & PooledEventQueue.SLOT_MASK)
+        return event
+
+    def peek(self) -> tuple:
+        return self.__event(self.__heap[0]) if self.__heap else None
+
+    def clear(self) -> None:
+        # The records are kept in the pool
+        for key in self.__heap:
+            self.recycle(key & PooledEventQueue.SLOT_MASK)
+        self.__heap.clear()
+
+    def heap(self) -> list:
+        """
+        Retrieve the list of the binary heap of keys, which is the same list for the lifetime
+        of the queue. It must only be modified via the heapq module, and the record of each
+        key removed must be recycled (see recycle()).
+
+        :return: List of the binary heap of keys
+        """
+        return self.__heap
+
+    def records(self) -> list:
+        """
+        Retrieve the list of records indexed by slot (the lowest SLOT_BITS bits of a key),
+        which is the same list for the lifetime of the queue.
+
+        :return: List of records
+        """
+        return self.__records
+
+    def free_slots(self) -> list:
+        """
+        Retrieve the list of slots of the records not in use (the free list), which is the same
+        list for the lifetime of the queue. A slot must only be appended to it by recycle(), or
+        after releasing the references of its record to the callback and arguments.
+
+        :return: List of free slots
+        """
+        return self.__free_slots
+
+    def recycle(self, slot: int) -> None:
+        """
+        Return the record in a slot to the pool, once its key has been removed from the heap.
+        Its references to the callback and arguments are released.
+
+        :param slot:    Slot of the record
+        """
+        record = self.__records[slot]
+        record.callback = None
+        record.args = None
+        record.kwargs = None
+        self.__free_slots.append(slot)
+
+    def hits(self) -> int:
+        """
+        Retrieve the number of events stored in a recycled record.
+
+        :return: Number of pool hits
+        """
+        return self.__hits
+
+    def misses(self) -> int:
+        """
+        Retrieve the number of events for which a new record had to be allocated
+        (equal to the number of records in the pool).
+
+        :return: Number of pool misses
+        """
+        return self.__misses
+
+    def __len__(self) -> int:
+        return len(self.__heap)
+
+    def __iter__(self):
+        return (self.__event(key) for key in self.__heap)
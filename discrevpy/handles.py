@@ -0,0 +1,205 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Event handles: a handle to a scheduled event can be used to cancel it, and a handle to a
+periodic event to stop it. Handles refer to their event by (time, priority, event_id).
+"""
+
+from typing import Union
+from .trace import CallbackWrapper
+
+
+class EventHandle:
+    """
+    Handle to a scheduled event, which can be used to cancel it.
+
+    A handle belongs to the run in which its event was scheduled: once the simulator
+    is reset, cancelling it has no effect (even if a new event has the same identifier).
+    """
+
+    __slots__ = ("__simulator", "__time", "__priority", "__event_id", "__generation", "__cancelled")
+
+    def __init__(
+            self, sim: "Simulator", time: int, priority: int, event_id: int, generation: object
+    ) -> None:
+        """
+        Initializes an event handle.
+
+        :param sim:         Simulator in which the event is scheduled
+        :param time:        Time at which the event is scheduled
+        :param priority:    Priority of the event
+        :param event_id:    Event identifier
+        :param generation:  Generation of the run in which it is scheduled
+        """
+        self.__simulator = sim
+        self.__time = time
+        self.__priority = priority
+        self.__event_id = event_id
+        self.__generation = generation
+        self.__cancelled = False
+
+    def time(self) -> int:
+        """
+        Retrieve the simulation time at which the event is scheduled.
+
+        :return: Event time
+        """
+        return self.__time
+
+    def priority(self) -> int:
+        """
+        Retrieve the priority of the event.
+
+        :return: Priority
+        """
+        return self.__priority
+
+    def event_id(self) -> int:
+        """
+        Retrieve the unique identifier of the event.
+
+        :return: Event identifier
+        """
+        return self.__event_id
+
+    def is_cancelled(self) -> bool:
+        """
+        Check whether the event has been cancelled.
+
+        :return: True iff the event has been cancelled
+        """
+        return self.__cancelled
+
+    def cancel(self) -> bool:
+        """
+        Cancel the event (see Simulator.cancel()).
+
+        :return: True iff the event was cancelled by this call
+        """
+        if self.__cancelled:
+            return False
+        self.__cancelled = self._cancel_pending()
+        return self.__cancelled
+
+    def _cancel_pending(self) -> bool:
+        """
+        Cancel the event in the simulator (only to be called by cancel()).
+
+        :return: True iff the event was cancelled
+        """
+        return self.__simulator._cancel_event(  # pylint: disable=protected-access
+            self.__time, self.__priority, self.__event_id, self.__generation
+        )
+
+    def _move(self, time: int, event_id: int) -> None:
+        """
+        Let the handle refer to another event (only to be called by PeriodicEventHandle).
+
+        :param time:        Time at which the event is scheduled
+        :param event_id:    Event identifier
+        """
+        self.__time = time
+        self.__event_id = event_id
+
+
+class PeriodicEventHandle(EventHandle, CallbackWrapper):
+    """
+    Handle to a periodic event (see Simulator.schedule_periodic()), which can be used to stop it.
+
+    A periodic event occupies a single entry in the event heap: after each execution,
+    the same callback and arguments are re-inserted one interval later. The time and
+    event identifier of the handle are those of the next (or last, if stopped or finished)
+    execution. Cancelling it stops it, such that no further executions take place:
+    this can also be done from within its own callback.
+    """
+
+    __slots__ = (
+        "__interval", "__callback", "__args", "__remaining", "__firing", "__fire", "__push"
+    )
+
+    def __init__(
+            self,
+            sim: "Simulator",
+            interval: int,
+            priority: int,
+            callback,
+            args: tuple,
+            count: Union[int, None]
+    ) -> None:
+        """
+        Initializes a periodic event handle.
+
+        :param sim:         Simulator in which the event is scheduled
+        :param interval:    Interval between executions
+        :param priority:    Priority
+        :param callback:    Callback
+        :param args:        Positional arguments passed to the callback
+        :param count:       Number of executions (None: unlimited)
+        """
+        super().__init__(sim, 0, priority, 0, sim._generation())  # pylint: disable=protected-access
+        self.__interval = interval
+        self.__callback = callback
+        self.__args = args
+        self.__remaining = count
+        self.__firing = False
+        # Bound once, such that they are not re-created for every insertion
+        self.__fire = self._fire
+        self.__push = sim._push_event  # pylint: disable=protected-access
+
+    def _arm(self, time: int) -> None:
+        """
+        Insert the next execution into the event heap (only to be called by the simulator).
+
+        :param time:    Time of the next execution
+        """
+        self._move(time, self.__push(time, self.priority(), self.__fire, ()))
+
+    def _fire(self) -> None:
+        """
+        Execute the callback and re-arm (only to be called from the event heap).
+        """
+        if self.__remaining is not None:
+            self.__remaining -= 1
+        self.__firing = True
+        try:
+            self.__callback(*self.__args)
+        finally:
+            self.__firing = False
+        if not self.is_cancelled() and self.__remaining != 0:
+            self._arm(self.time() + self.__interval)
+
+    def _wrapped_callback(self, function):
+        return self.__callback if function is PeriodicEventHandle._fire else None
+
+    def _cancel_pending(self) -> bool:
+        """
+        Stop the periodic event (only to be called by cancel()): outside of its own execution,
+        there is a pending execution to cancel.
+
+        :return: True iff the periodic event was stopped
+        """
+        if self.__remaining == 0:
+            return False
+        if not self.__firing:
+            return super()._cancel_pending()
+        return True
@@ -0,0 +1,366 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Conservative parallel simulation of a partitioned model: the model is split into partitions
+(logical processes), each with its own Simulator, in a separate worker process. Events across
+partitions are sent as messages with a delay of at least the lookahead. The partitions are run
+in synchronized time windows (YAWNS): each window starts at the earliest pending event time of
+all partitions and messages, and spans the lookahead, such that no message sent during it can
+arrive within it. In between windows the messages are exchanged via the coordinating process.
+"""
+
+import pickle
+import traceback
+import multiprocessing
+from typing import Union, List, Tuple, Any
+from .simulator import Simulator
+
+
+class Partition:
+    """
+    Context of a partition, passed to the setup function: it registers the handlers which
+    other partitions can send events to, and sends events to other partitions.
+    """
+
+    def __init__(self, simulator: Simulator, index: int, num_partitions: int, lookahead: int):
+        """
+        Initializes a partition context.
+
+        :param simulator:       Simulator of the partition
+        :param index:           Index of the partition
+        :param num_partitions:  Number of partitions
+        :param lookahead:       Lookahead (minimum delay of events sent to other partitions)
+        """
+        self.__simulator = simulator
+        self.__index = index
+        self.__num_partitions = num_partitions
+        self.__lookahead = lookahead
+        self.__handlers = {}
+        self.__outgoing = []
+        self.__sequence = 0
+
+    def index(self) -> int:
+        """
+        Retrieve the index of this partition.
+
+        :return: Partition index
+        """
+        return self.__index
+
+    def num_partitions(self) -> int:
+        """
+        Retrieve the number of partitions.
+
+        :return: Number of partitions
+        """
+        return self.__num_partitions
+
+    def lookahead(self) -> int:
+        """
+        Retrieve the lookahead: the minimum delay of events sent to other partitions.
+
+        :return: Lookahead
+        """
+        return self.__lookahead
+
+    def register(self, name: str, handler) -> None:
+        """
+        Register a handler which events sent by other partitions can be addressed to.
+
+        :param name:    Name of the handler (unique within the partition)
+        :param handler: Callback
+        """
+        if name in self.__handlers:
+            raise ValueError("Handler name already registered: " + str(name))
+        self.__handlers[name] = handler
+
+    def send(self, target: int, delay: int, name: str, *args, priority: int = 0) -> None:
+        """
+        Send an event to a handler of another partition (or to this one).
+
+        :param target:      Index of the target partition
+        :param delay:       Delay from current simulation time (now), at least the lookahead
+        :param name:        Name of the handler in the target partition
+        :param args:        (Optional) Positional arguments passed to the handler (picklable)
+        :param priority:    (Optional; default: 0) Priority
+        """
+
+        # The target must be a partition index
+        if not isinstance(target, int) or not 0 <= target < self.__num_partitions:
+            raise ValueError("Target must be a partition index: " + str(target))
+
+        # The delay must be an integer of at least the lookahead
+        if not isinstance(delay, int):
+            raise ValueError("Delay must be an integer")
+        if delay < self.__lookahead:
+            raise ValueError(
+                "Delay of an event sent to a partition must be at least the lookahead: %d" % delay
+            )
+
+        # Sent at once as part of the messages exchanged after the window
+        self.__outgoing.append((
+            target, self.__simulator.now() + delay, priority, self.__index, self.__sequence,
+            name, args
+        ))
+        self.__sequence += 1
+
+    def _take_outgoing(self) -> list:
+        """
+        Take the messages sent since the previous call (only to be called by the runner).
+
+        :return: List of (target, time, priority, source, sequence, name, args)
+        """
+        outgoing = self.__outgoing
+        self.__outgoing = []
+        return outgoing
+
+    def _deliver(self, messages: list) -> None:
+        """
+        Schedule received messages (only to be called by the runner). They are scheduled
+        in a deterministic order, such that their event identifiers are as well.
+
+        :param messages:    List of (target, time, priority, source, sequence, name, args)
+        """
+        simulator = self.__simulator
+        now = simulator.now()
+        for _, time, priority, _, _, name, args in sorted(messages, key=lambda m: m[1:5]):
+            handler = self.__handlers.get(name)
+            if handler is None:
+                raise ValueError("Unknown handler: " + str(name))
+            simulator.schedule_with_priority(time - now, priority, handler, *args)
+
+
+class _PartitionRunner:
+    """
+    Runs a single partition window by window (in a worker process, or in the coordinator).
+    """
+
+    def __init__(
+            self, setup, index: int, num_partitions: int, lookahead: int, parameters: dict
+    ) -> None:
+        self.__simulator = Simulator()
+        self.__simulator.ready()
+        self.__partition = Partition(self.__simulator, index, num_partitions, lookahead)
+        self.__result = setup(self.__simulator, self.__partition, parameters)
+
+    def start(self) -> Tuple[list, Union[int, None]]:
+        """
+        Report the messages sent during setup and the time of the next pending event.
+
+        :return: (messages, next event time)
+        """
+        outgoing = self.__partition._take_outgoing()  # pylint: disable=protected-access
+        return outgoing, self.__simulator.next_event_time()
+
+    def window(self, messages: list, window_end: int) -> Tuple[list, Union[int, None]]:
+        """
+        Deliver the received messages and run up to the end of the window.
+
+        :param messages:    Messages received for this partition
+        :param window_end:  End of the window (exclusive)
+
+        :return: (messages sent during the window, next event time)
+        """
+        self.__partition._deliver(messages)  # pylint: disable=protected-access
+        self.__simulator.run_until(window_end)
+        outgoing = self.__partition._take_outgoing()  # pylint: disable=protected-access
+        return outgoing, self.__simulator.next_event_time()
+
+    def result(self) -> Any:
+        """
+        Retrieve the result object returned by the setup function.
+
+        :return: Result object
+        """
+        return self.__result
+
+
+def _run_partition_worker(connection, setup, index, num_partitions, lookahead, parameters):
+    """
+    Worker process of a partition: executes the commands of the coordinator.
+
+    :param connection:      Connection to the coordinator
+    :param setup:           Setup function
+    :param index:           Index of the partition
+    :param num_partitions:  Number of partitions
+    :param lookahead:       Lookahead
+    :param parameters:      Parameters
+    """
+    try:
+        runner = _PartitionRunner(setup, index, num_partitions, lookahead, parameters)
+        connection.send((True, runner.start()))
+        while True:
+            command = connection.recv()
+            if command is None:
+                connection.send((True, runner.result()))
+                break
+            connection.send((True, runner.window(*command)))
+    except BaseException as e:  # pylint: disable=broad-except
+        # The exception itself is only sent if it survives pickling
+        try:
+            error = pickle.loads(pickle.dumps(e))
+        except Exception:  # pylint: disable=broad-except
+            error = None
+        connection.send((False, (error, traceback.format_exc())))
+    finally:
+        connection.close()
+
+
+def run_partitioned(
+        setup,
+        num_partitions: int,
+        lookahead: int,
+        end_time: int,
+        parameters: Union[dict, None] = None,
+        parallel: bool = True
+) -> List[Any]:
+    """
+    Run a partitioned model with conservative synchronization, each partition in its own
+    worker process (or all in this process if not parallel, with the same result).
+
+    Each partition has its own simulator, which is readied and passed to the setup function
+    together with its Partition context and the parameters. The setup function schedules its
+    initial events, registers the handlers other partitions can send events to, and returns the
+    object in which the result of the partition is collected. Events across partitions are sent
+    via Partition.send() with a delay of at least the lookahead. The run ends at the end time.
+
+    The partitions are run in time windows: each window starts at the earliest pending event
+    time of all partitions and messages, and ends one lookahead later (or at the end time).
+    After each window, the messages are exchanged and scheduled in a deterministic order (by
+    time, priority, source partition and send order). As such, the result does not depend on
+    the timing of the worker processes: it is the same for parallel and sequential execution.
+    The larger the lookahead relative to the event density, the more events each window holds,
+    and thus the less synchronization overhead.
+
+    Compared to a single simulator running the whole model, the result differs only in ties:
+    as a message is scheduled in its target partition at the start of the window after the one
+    it was sent in, it is executed after the events of the same time and priority which the
+    target partition scheduled in between (in a single simulator, those which were scheduled
+    after it was sent would be executed after it). Messages with a priority distinct from the
+    local events of the same time have no such ties.
+
+    An exception raised in a partition (e.g., by the setup function or a handler) is raised
+    in both modes: in parallel, it is chained from a RuntimeError with the partition index
+    and the traceback of the worker process (or only the latter is raised, if the exception
+    cannot be pickled).
+
+    The setup function, parameters, message arguments and results must be picklable.
+
+    :param setup:           Setup function: setup(simulator, partition, parameters) -> result
+    :param num_partitions:  Number of partitions
+    :param lookahead:       Lookahead: minimum delay of events sent to another partition
+    :param end_time:        End time of the run
+    :param parameters:      (Optional; default: {}) Parameters passed to each setup function
+    :param parallel:        (Optional; default: True) Whether to run each partition in its
+                            own worker process (else all are run in this process)
+
+    :return: List of the result object of each partition
+    """
+
+    # The number of partitions, lookahead and end time must be positive integers
+    if not isinstance(num_partitions, int) or num_partitions <= 0:
+        raise ValueError("Number of partitions must be a positive integer")
+    if not isinstance(lookahead, int) or lookahead <= 0:
+        raise ValueError("Lookahead must be a positive integer")
+    if not isinstance(end_time, int) or end_time <= 0:
+        raise ValueError("End time must be a positive integer")
+    if parameters is None:
+        parameters = {}
+
+    # Partitions in worker processes (or in this process)
+    if parallel:
+        connections = []
+        workers = []
+        for index in range(num_partitions):
+            parent_connection, child_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(
+                target=_run_partition_worker,
+                args=(child_connection, setup, index, num_partitions, lookahead, parameters),
+                daemon=True
+            )
+            worker.start()
+            child_connection.close()
+            connections.append(parent_connection)
+            workers.append(worker)
+
+        def receive_all():
+            replies = []
+            for index, connection in enumerate(connections):
+                success, value = connection.recv()
+                if not success:
+                    error, remote_traceback = value
+                    failure = RuntimeError("Partition %d failed:\n%s" % (index, remote_traceback))
+                    if error is None:
+                        raise failure
+                    raise error from failure
+                replies.append(value)
+            return replies
+
+        def window_all(inboxes, window_end):
+            for connection, inbox in zip(connections, inboxes):
+                connection.send((inbox, window_end))
+            return receive_all()
+
+    else:
+        runners = [
+            _PartitionRunner(setup, index, num_partitions, lookahead, parameters)
+            for index in range(num_partitions)
+        ]
+
+        def window_all(inboxes, window_end):
+            return [runner.window(inbox, window_end) for runner, inbox in zip(runners, inboxes)]
+
+    try:
+
+        # Messages sent during setup, and the next event time of each partition
+        replies = receive_all() if parallel else [runner.start() for runner in runners]
+
+        # Windows until the end time
+        while True:
+            inboxes = [[] for _ in range(num_partitions)]
+            start = None
+            for messages, next_time in replies:
+                for message in messages:
+                    inboxes[message[0]].append(message)
+                    start = message[1] if start is None else min(start, message[1])
+                if next_time is not None:
+                    start = next_time if start is None else min(start, next_time)
+            if start is None or start >= end_time:
+                break
+            replies = window_all(inboxes, min(start + lookahead, end_time))
+
+        # Results
+        if parallel:
+            for connection in connections:
+                connection.send(None)
+            return receive_all()
+        return [runner.result() for runner in runners]
+
+    finally:
+        if parallel:
+            for connection in connections:
+                connection.close()
+            for worker in workers:
+                worker.join(timeout=1)
+                if worker.is_alive():
+                    worker.terminate()
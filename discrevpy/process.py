@@ -0,0 +1,254 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Generator-based processes: a process is a generator which yields a delay (integer) to be
+resumed after it, or a condition or another process to be resumed once it is triggered or
+has finished. The process is resumed directly from the event loop: each process inserts
+the same bound resume method (without arguments) into the event heap for each of its steps.
+"""
+
+from typing import Union
+from .trace import CallbackWrapper
+
+
+class Condition:
+    """
+    Condition which processes can wait for by yielding it: they are all resumed in the
+    current time moment (now) when it is triggered, with the value it was triggered with
+    as the value of their yield expression. Processes which yield it afterwards wait
+    for the next trigger.
+    """
+
+    __slots__ = ("__waiters",)
+
+    def __init__(self) -> None:
+        """
+        Initializes a condition.
+        """
+        self.__waiters = []
+
+    def trigger(self, value=None) -> int:
+        """
+        Trigger the condition: resume all processes waiting for it.
+
+        :param value:   (Optional; default: None) Value passed to the waiting processes
+
+        :return: Number of processes resumed
+        """
+        waiters = self.__waiters
+        self.__waiters = []
+        for process in waiters:
+            process._wake(value)  # pylint: disable=protected-access
+        return len(waiters)
+
+    def num_waiting(self) -> int:
+        """
+        Retrieve the number of processes waiting for the condition.
+
+        :return: Number of waiting processes
+        """
+        return len(self.__waiters)
+
+    def _add_waiter(self, process: "Process") -> None:
+        """
+        Add a process waiting for the condition (only to be called by Process).
+
+        :param process: Waiting process
+        """
+        self.__waiters.append(process)
+
+    def _remove_waiter(self, process: "Process") -> None:
+        """
+        Remove a waiting process (only to be called by Process).
+
+        :param process: Waiting process
+        """
+        self.__waiters.remove(process)
+
+
+class Process(CallbackWrapper):
+    """
+    Process executing a generator (see Simulator.process()).
+
+    The generator yields a non-negative integer delay to be resumed after it,
+    a Condition to be resumed once it is triggered (with its value), or another
+    Process to be resumed once it has finished (with its return value).
+    The process itself finishes when the generator returns.
+    """
+
+    __slots__ = (
+        "__simulator", "__generator", "__priority", "__send", "__resume", "__now",
+        "__push_event", "__value", "__time", "__event_id", "__generation", "__waiting_for",
+        "__finished", "__result", "__waiters"
+    )
+
+    def __init__(self, simulator, generator, priority: int) -> None:
+        """
+        Initializes a process (it is started by the simulator).
+
+        :param simulator:   Simulator in which it runs
+        :param generator:   Generator
+        :param priority:    Priority of its events
+        """
+        self.__simulator = simulator
+        self.__generator = generator
+        self.__priority = priority
+        # Bound once, such that they are not re-created for every step
+        self.__send = generator.send
+        self.__resume = self._resume
+        self.__now = simulator.now
+        self.__push_event = simulator._push_event
+        self.__value = None
+        self.__time = 0
+        self.__event_id = None
+        self.__generation = simulator._generation()
+        self.__waiting_for: Union[Condition, Process, None] = None
+        self.__finished = False
+        self.__result = None
+        self.__waiters = []
+
+    def _schedule(self, time: int) -> None:
+        """
+        Insert the next step into the event heap (only to be called by the simulator).
+
+        :param time:    Time of the next step
+        """
+        self.__time = time
+        self.__event_id = self.__push_event(time, self.__priority, self.__resume, ())
+
+    def _wrapped_callback(self, function):
+        return self.__generator.gi_code if function is Process._resume else None
+
+    def _wake(self, value) -> None:
+        """
+        Resume the process in the current time moment (only to be called by what it waits for).
+
+        :param value:   Value of its yield expression
+        """
+        self.__waiting_for = None
+        self.__value = value
+        self._schedule(self.__now())
+
+    def _resume(self) -> None:
+        """
+        Execute the next step of the generator (only to be called from the event heap).
+        """
+        value = self.__value
+        self.__value = None
+        self.__event_id = None
+        try:
+            target = self.__send(value)
+        except StopIteration as stop:
+            self.__finish(stop.value)
+            return
+
+        # Delay (exactly an integer in the common case)
+        if type(target) is int or (  # pylint: disable=unidiomatic-typecheck
+                isinstance(target, int) and not isinstance(target, bool)
+        ):
+            if target < 0:
+                raise ValueError("Delay must be non-negative: %d" % target)
+            self.__time = self.__now() + target
+            self.__event_id = self.__push_event(
+                self.__time, self.__priority, self.__resume, ()
+            )
+
+        # Condition or process
+        elif isinstance(target, Condition):
+            self.__waiting_for = target
+            target._add_waiter(self)  # pylint: disable=protected-access
+        elif isinstance(target, Process):
+            if target.is_finished():
+                self.__value = target.result()
+                self._schedule(self.__now())
+            else:
+                self.__waiting_for = target
+                target._add_waiter(self)  # pylint: disable=protected-access
+        else:
+            raise ValueError("Process must yield a delay (integer), a Condition or a Process")
+
+    def __finish(self, result) -> None:
+        """
+        Finish the process and resume the processes waiting for it.
+
+        :param result:  Return value of the generator
+        """
+        self.__finished = True
+        self.__result = result
+        waiters = self.__waiters
+        self.__waiters = []
+        for process in waiters:
+            process._wake(result)  # pylint: disable=protected-access
+
+    def _add_waiter(self, process: "Process") -> None:
+        """
+        Add a process waiting for this process to finish (only to be called by Process).
+
+        :param process: Waiting process
+        """
+        self.__waiters.append(process)
+
+    def _remove_waiter(self, process: "Process") -> None:
+        """
+        Remove a waiting process (only to be called by Process).
+
+        :param process: Waiting process
+        """
+        self.__waiters.remove(process)
+
+    def is_finished(self) -> bool:
+        """
+        Check whether the process has finished (or has been stopped).
+
+        :return: True iff the process has finished
+        """
+        return self.__finished
+
+    def result(self):
+        """
+        Retrieve the return value of the generator (None if it has not finished or was stopped).
+
+        :return: Return value
+        """
+        return self.__result
+
+    def stop(self) -> bool:
+        """
+        Stop the process: its pending step is cancelled, the generator is closed, and the
+        processes waiting for it are resumed (with None). It can not stop itself while running.
+
+        :return: True iff the process was stopped by this call
+        """
+        if self.__finished:
+            return False
+        if self.__event_id is not None:
+            self.__simulator._cancel_event(  # pylint: disable=protected-access
+                self.__time, self.__priority, self.__event_id, self.__generation
+            )
+            self.__event_id = None
+        if self.__waiting_for is not None:
+            self.__waiting_for._remove_waiter(self)  # pylint: disable=protected-access
+            self.__waiting_for = None
+        self.__generator.close()
+        self.__finish(None)
+        return True
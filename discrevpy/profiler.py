@@ -0,0 +1,152 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Per-callback profiling of the event loop: while profiling, the simulator reports each
+executed event to the profiler, which accumulates statistics per callback.
+"""
+
+from typing import List, Tuple
+from .trace import callback_name, callback_function
+
+
+class CallbackProfiler:
+    """
+    Profiler which accumulates for each callback (identified by its function, such that
+    bound methods of the same function are aggregated) the number of executed events,
+    their total and maximum wall-clock time, and the number of events they scheduled.
+
+    With sampling, only 1 in every N executed events is timed (the others are only counted),
+    and the total wall-clock time is estimated by scaling the timed total by the count.
+    The events of periodic events, arrival sources and events scheduled from arrays are
+    attributed to their callback, and the steps of a process to its generator function
+    (see callback_function()), instead of to the method executing them. The events of a batch
+    (see Simulator.batched()) are timed together, as such the maximum time of its
+    callback is that of a batch.
+    """
+
+    def __init__(self, sample_every: int = 1) -> None:
+        """
+        Initializes a callback profiler.
+
+        :param sample_every:    (Optional; default: 1) Time 1 in every so many events
+        """
+
+        # The sampling interval must be a positive integer
+        if not isinstance(sample_every, int) or sample_every <= 0:
+            raise ValueError("Sampling interval must be a positive integer")
+
+        self.__sample_every = sample_every
+        # Identity of the function (see callback_function()) to
+        # [function, count, timed count, timed total seconds, max seconds, scheduled]
+        self.__entries = {}
+
+    def sample_every(self) -> int:
+        """
+        Retrieve the sampling interval.
+
+        :return: 1 in every so many executed events is timed
+        """
+        return self.__sample_every
+
+    def count(self, callback, scheduled: int, num_events: int = 1) -> None:
+        """
+        Count an executed event which was not timed (called by the simulator).
+
+        :param callback:    Callback
+        :param scheduled:   Number of events scheduled during its execution
+        :param num_events:  (Optional; default: 1) Number of events executed by it
+                            (more than one for a batch, see Simulator.batched())
+        """
+        entry = self.__entry(callback)
+        entry[1] += num_events
+        entry[5] += scheduled
+
+    def record(self, callback, seconds: float, scheduled: int, num_events: int = 1) -> None:
+        """
+        Record a timed executed event (called by the simulator).
+
+        :param callback:    Callback
+        :param seconds:     Wall-clock time of its execution
+        :param scheduled:   Number of events scheduled during its execution
+        :param num_events:  (Optional; default: 1) Number of events executed by it
+                            (more than one for a batch, see Simulator.batched())
+        """
+        entry = self.__entry(callback)
+        entry[1] += num_events
+        entry[2] += num_events
+        entry[3] += seconds
+        if seconds > entry[4]:
+            entry[4] = seconds
+        entry[5] += scheduled
+
+    def __entry(self, callback) -> list:
+        """
+        Retrieve the entry of the function of a callback, creating it if not yet present.
+        The entry references the function, such that its identity is not reused.
+
+        :param callback:    Callback
+
+        :return: Entry
+        """
+        function = callback_function(callback)
+        entry = self.__entries.get(id(function))
+        if entry is None:
+            entry = self.__entries[id(function)] = [function, 0, 0, 0.0, 0.0, 0]
+        return entry
+
+    def results(self) -> List[Tuple[str, int, float, float, int]]:
+        """
+        Retrieve the statistics per callback, sorted by (estimated) total wall-clock time
+        (descending).
+
+        :return: List of (callback name, count, total seconds, max seconds, scheduled)
+        """
+        results = []
+        for function, count, timed, total, maximum, scheduled in self.__entries.values():
+            estimated_total = total * count / timed if timed else 0.0
+            results.append((callback_name(function), count, estimated_total, maximum, scheduled))
+        results.sort(key=lambda result: (-result[2], -result[1], result[0]))
+        return results
+
+    def report(self) -> str:
+        """
+        Format the statistics per callback as a table (see results()).
+
+        :return: Table
+        """
+        results = self.results()
+        width = max([len("Callback")] + [len(result[0]) for result in results])
+        lines = ["%-*s  %10s  %12s  %12s  %12s  %10s" % (
+            width, "Callback", "Count", "Total (s)", "Mean (us)", "Max (us)", "Scheduled"
+        )]
+        for name, count, total, maximum, scheduled in results:
+            lines.append("%-*s  %10d  %12.6f  %12.3f  %12.3f  %10d" % (
+                width, name, count, total, total / count * 1e6, maximum * 1e6, scheduled
+            ))
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        """
+        Clear all statistics.
+        """
+        self.__entries.clear()
@@ -0,0 +1,259 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Parallel independent replications: each replication is run on a fresh
+Simulator in a separate worker process, with deterministic per-replication seeding.
+Replications sharing a common warm-up can instead be forked from a single warmed-up
+simulator (on platforms which support os.fork()).
+"""
+
+import os
+import gc
+import sys
+import pickle
+import random
+import hashlib
+import traceback
+import multiprocessing
+from typing import Union, Iterator, Tuple, Any
+from .simulator import Simulator
+
+
+def replication_seed(base_seed: int, index: int) -> int:
+    """
+    Derive the seed of a replication deterministically from a base seed and its index.
+
+    :param base_seed:   Base seed
+    :param index:       Index of the replication
+
+    :return: Seed (64-bit non-negative integer)
+    """
+    digest = hashlib.sha256(("%d:%d" % (base_seed, index)).encode("ascii")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def run_replication(setup, parameters: dict) -> Any:
+    """
+    Run a single replication on a fresh simulator.
+
+    The global random module is seeded with parameters["seed"], after which the simulator
+    is readied and passed together with the parameters to the setup function.
+    The setup function schedules the initial events (and optionally an end time),
+    and returns the object in which the result is collected during the run.
+    The simulator is then run, and this object is returned.
+
+    :param setup:       Setup function: setup(simulator, parameters) -> result object
+    :param parameters:  Parameters of the replication (including "seed")
+
+    :return: Result object returned by the setup function (after the run)
+    """
+    random.seed(parameters["seed"])
+    simulator = Simulator()
+    simulator.ready()
+    result = setup(simulator, parameters)
+    simulator.run()
+    return result
+
+
+def _run_indexed_replication(task: tuple) -> Tuple[int, Any]:
+    """
+    Run a replication in a worker process.
+
+    :param task:    (setup, index, parameters)
+
+    :return: (index, result)
+    """
+    setup, index, parameters = task
+    return index, run_replication(setup, parameters)
+
+
+def run_replications(
+        setup,
+        replications: list,
+        num_workers: Union[int, None] = None,
+        base_seed: int = 0
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Run independent replications in parallel on a pool of worker processes.
+
+    Each replication is either a seed (integer) or a dict of parameters. A replication
+    without seed (i.e., a dict without "seed" key) gets the seed derived from the base seed
+    and its index (see replication_seed()). Each replication is run by run_replication()
+    on a fresh simulator. The results are yielded as they complete, which can be in a
+    different order than the replications: each is accompanied by its index.
+
+    The setup function and the parameters and results must be picklable
+    (e.g., the setup function must be defined at module level).
+
+    :param setup:           Setup function: setup(simulator, parameters) -> result object
+    :param replications:    List of seeds or parameter dicts
+    :param num_workers:     (Optional; default: number of CPUs)
+                            Number of worker processes (if 1, replications are run in this process)
+    :param base_seed:       (Optional; default: 0)
+                            Base seed from which missing replication seeds are derived
+
+    :return: Iterator over (index, result) in order of completion
+    """
+
+    # Each replication must be a seed or a dict of parameters
+    tasks = []
+    for index, replication in enumerate(replications):
+        if isinstance(replication, int):
+            parameters = {"seed": replication}
+        elif isinstance(replication, dict):
+            parameters = dict(replication)
+            parameters.setdefault("seed", replication_seed(base_seed, index))
+        else:
+            raise ValueError("Replication must be a seed (integer) or a dict of parameters")
+        tasks.append((setup, index, parameters))
+
+    # The number of workers must be a positive integer
+    if num_workers is None:
+        num_workers = multiprocessing.cpu_count()
+    if not isinstance(num_workers, int) or num_workers <= 0:
+        raise ValueError("Number of workers must be a positive integer")
+
+    # Sequentially in this process
+    if num_workers == 1:
+        for task in tasks:
+            yield _run_indexed_replication(task)
+        return
+
+    # Parallel in a pool of worker processes
+    with multiprocessing.Pool(min(num_workers, max(1, len(tasks)))) as pool:
+        yield from pool.imap_unordered(_run_indexed_replication, tasks)
+
+
+def _run_forked_child(simulator: Simulator, result, seed: int, reseed, write_fd: int) -> None:
+    """
+    Continue the run in a forked child process and send back its result (does not return).
+
+    :param simulator:   Warmed-up simulator
+    :param result:      Result object returned by the setup function
+    :param seed:        Seed of the replication
+    :param reseed:      Reseed function (or None)
+    :param write_fd:    File descriptor of the write end of the pipe to the parent
+    """
+    exit_code = 1
+    try:
+        try:
+            random.seed(seed)
+            if reseed is not None:
+                reseed(result, seed)
+            simulator.run()
+            message = (True, result)
+        except BaseException:  # pylint: disable=broad-except
+            message = (False, traceback.format_exc())
+        with os.fdopen(write_fd, "wb") as file:
+            pickle.dump(message, file, protocol=pickle.HIGHEST_PROTOCOL)
+        exit_code = 0
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(exit_code)  # pylint: disable=protected-access
+
+
+def run_warm_started(
+        setup,
+        warmup: int,
+        seeds: list,
+        reseed=None,
+        num_workers: Union[int, None] = None,
+        warmup_seed: int = 0
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Run replications which share a common warm-up: the warm-up is run once, after which
+    each replication is continued in a child process forked from the warmed-up simulator.
+
+    The global random module is seeded with the warm-up seed, after which the simulator
+    is readied and passed to the setup function (with parameters {"seed": warmup_seed}),
+    and run up to the warm-up time. Each child process then seeds the global random module
+    with its own seed, calls the reseed function (for any random number generators of the
+    model itself), and continues the run to its end. The children share the memory of the
+    warmed-up simulator copy-on-write: to reduce the pages copied, the objects which exist
+    at the fork are excluded from garbage collection in the children (gc.freeze()).
+
+    The results must be picklable. This requires os.fork() (i.e., it is not available on
+    Windows), and the setup function itself does not need to be picklable.
+
+    :param setup:           Setup function: setup(simulator, parameters) -> result object
+    :param warmup:          Warm-up time: the events before it are executed once
+    :param seeds:           Seeds of the replications
+    :param reseed:          (Optional) Reseed function: reseed(result, seed), called in each child
+    :param num_workers:     (Optional; default: number of CPUs)
+                            Maximum number of child processes at the same time
+    :param warmup_seed:     (Optional; default: 0) Seed of the warm-up
+
+    :return: Iterator over (index, result) in order of the seeds
+    """
+
+    # Forking must be supported
+    if not hasattr(os, "fork"):
+        raise ValueError("Forking is not supported on this platform")
+
+    # The number of workers must be a positive integer
+    if num_workers is None:
+        num_workers = multiprocessing.cpu_count()
+    if not isinstance(num_workers, int) or num_workers <= 0:
+        raise ValueError("Number of workers must be a positive integer")
+
+    # Warm-up
+    random.seed(warmup_seed)
+    simulator = Simulator()
+    simulator.ready()
+    result = setup(simulator, {"seed": warmup_seed})
+    simulator.run_until(warmup)
+    if simulator.is_finished():
+        raise ValueError("Simulation ended during the warm-up")
+
+    # Fork the children, with at most the number of workers at the same time
+    # (their results are read in order, a child waiting until its result is read)
+    children = []
+    next_index = 0
+    try:
+        while next_index < len(seeds) or children:
+            while next_index < len(seeds) and len(children) < num_workers:
+                read_fd, write_fd = os.pipe()
+                gc.freeze()
+                pid = os.fork()
+                if pid == 0:
+                    os.close(read_fd)
+                    _run_forked_child(simulator, result, seeds[next_index], reseed, write_fd)
+                gc.unfreeze()
+                os.close(write_fd)
+                children.append((next_index, pid, os.fdopen(read_fd, "rb")))
+                next_index += 1
+            index, pid, file = children.pop(0)
+            with file:
+                data = file.read()
+            os.waitpid(pid, 0)
+            if not data:
+                raise RuntimeError("Replication %d exited without result" % index)
+            success, value = pickle.loads(data)
+            if not success:
+                raise RuntimeError("Replication %d failed:\n%s" % (index, value))
+            yield index, value
+    finally:
+        for _, pid, file in children:
+            file.close()
+            os.waitpid(pid, 0)
@@ -26,10 +26,35 @@ In simplest terms: it maintains an event queue of callbacks
 ordered by their scheduled discrete simulation time.
 """
 
+# The module is the Simulator class, whose run loops share its private state
+# pylint: disable=too-many-lines
+
+import gc
+import asyncio
 import heapq
+import random
+from time import monotonic, perf_counter
 from enum import Enum
+from collections import Counter
 from typing import Union
-from types import FunctionType, MethodType, LambdaType, BuiltinFunctionType, BuiltinMethodType
+from types import (
+    FunctionType, MethodType, LambdaType, BuiltinFunctionType, BuiltinMethodType, GeneratorType
+)
+from .event_queue import EventQueue, HeapEventQueue, PooledEventQueue
+from .handles import EventHandle, PeriodicEventHandle
+from .batched import BatchedCallback
+from .checkpoint import write_checkpoint, read_checkpoint
+from .trace import TraceWriter
+from .profiler import CallbackProfiler
+from .process import Process
+from .arrivals import Distribution, ArrivalSource
+from .columnar import ScheduledArrays, int64_array, execution_order, delay_bit_lengths
+
+
+# Types of valid callbacks
+# Note: LambdaType equals FunctionType according to documentation
+# Note: BuiltinMethodType equals BuiltinFunctionType according to documentation
+_CALLBACK_TYPES = (FunctionType, MethodType, BuiltinFunctionType, BatchedCallback)
 
 
 class Simulator:
@@ -45,18 +70,91 @@ class Simulator:
         READY = 2       # Ready (initial events can be scheduled)
         RUNNING = 3     # Run is in progress (events can be scheduled during)
         FINISHED = 4    # Run has finished
+        PAUSED = 5      # Run is paused (events can be scheduled, and the run continued)
+
+    # States in which events can be scheduled
+    _SCHEDULING_STATES = (_State.READY, _State.RUNNING, _State.PAUSED)
+
+    # States from which the run can be started or continued
+    _RUNNABLE_STATES = (_State.READY, _State.PAUSED)
+
+    # The event heap is compacted (cancelled events removed) once at least this
+    # fraction of it consists of cancelled events...
+    COMPACTION_RATIO = 0.5
+
+    # ... and it has at least this many events
+    COMPACTION_MIN_SIZE = 1024
 
-    def __init__(self) -> None:
+    # Checkpoint file format identifier
+    CHECKPOINT_FORMAT = "discrevpy-checkpoint-1"
+
+    # Number of events pickled at once when writing a checkpoint
+    CHECKPOINT_CHUNK_SIZE = 4096
+
+    def __init__(self, event_queue: Union[EventQueue, None] = None, validate: bool = True) -> None:
         """
         Initializes a Simulator instance.
+
+        If validation is disabled, schedule(), schedule_with_priority() and schedule_many()
+        trust their arguments: the simulator state, the delay, the priority and the callback
+        are not checked. For valid arguments, the behavior is identical. This is intended
+        for models which have already been developed and tested with validation enabled.
+
+        :param event_queue: (Optional; default: binary heap)
+                            Empty event queue backend in which the pending events are stored
+        :param validate:    (Optional; default: True)
+                            Whether scheduling validates its arguments
         """
 
+        # The event queue must be an empty event queue backend
+        if event_queue is None:
+            event_queue = HeapEventQueue()
+        if not isinstance(event_queue, EventQueue):
+            raise ValueError("Event queue must be an EventQueue")
+        if len(event_queue) != 0:
+            raise ValueError("Event queue must be empty")
+
         self.__state: Simulator._State = Simulator._State.INIT
         self.__now: int = 0
         self.__event_id: int = 0
-        # Heap of 6-tuples: (time, priority, event_id, callback, args, kwargs)
-        self.__event_heap: list = []
+        # Queue of 5-tuples (time, priority, event_id, callback, args) if there are no
+        # keyword arguments, else of 6-tuples (time, priority, event_id, callback, args, kwargs)
+        self.__event_heap: EventQueue = event_queue
+        # Event ids of the cancelled events still in the event heap
+        self.__cancelled: set = set()
+        # Last event removed from the event heap for execution (its event tuple, or its key in
+        # the pooled event queue), and the next event id at that moment (to detect cancelling
+        # an already executed event in the current time)
+        self.__dispatched: Union[tuple, int, None] = None
+        self.__dispatched_next_id: int = 0
+        # Events executed by batched callbacks along with the first of their batch
+        self.__num_drained: int = 0
+        # Generation of the run, replaced by reset(), such that the handles of events of
+        # an earlier run no longer match (as event identifiers are then re-used)
+        self.__generation: object = object()
         self.__end_time: Union[int, None] = None
+        # End time set via end() while running up to an intermediate time (see run_until()),
+        # during which the end time of the event loop is that intermediate time
+        self.__partial_run: bool = False
+        self.__final_end_time: Union[int, None] = None
+        # Automatic checkpointing during the run: (path, every_events, every_seconds, state)
+        self.__auto_checkpoint: Union[tuple, None] = None
+        # Trace writer to which each executed event is written
+        self.__trace_writer: Union[TraceWriter, None] = None
+        # Profiler to which each executed event is reported
+        self.__profiler: Union[CallbackProfiler, None] = None
+
+        # Run statistics (see statistics())
+        self.__num_discarded: int = 0  # Cancelled events removed from the event heap
+        self.__peak_heap_size: int = 0
+        self.__wall_time: float = 0.0
+        self.__run_start: Union[float, None] = None
+        self.__delay_histogram: Counter = Counter()  # Delay bit length to number of events
+        # Events scheduled from arrays of which some are not yet in the event heap
+        self.__scheduled_arrays: list = []
+
+        # Whether scheduling validates its arguments
+        self.__validate: bool = validate
 
     def ready(self) -> None:
         """
@@ -81,7 +179,7 @@ class Simulator:
         If the delay is zero (or if no delay argument is provided)
         the current event will be the last event executed if the
         simulator is RUNNING. Zero delay is not permitted when the
-        simulator is in READY state.
+        simulator is in READY or PAUSED state.
 
         If there are multiple end() calls, the end() call resulting in
         the earliest end time will be the end time. As such, an end()
@@ -91,10 +189,10 @@ class Simulator:
                          Delay from current simulation time (now) to end the simulation
         """
 
-        # Simulator must be in either READY or RUNNING state
-        if self.__state != Simulator._State.READY and self.__state != Simulator._State.RUNNING:
+        # Simulator must be in either READY, RUNNING or PAUSED state
+        if self.__state not in Simulator._SCHEDULING_STATES:
             raise ValueError(
-                "Scheduling end can only be done when the state is READY or RUNNING "
+                "Scheduling end can only be done when the state is READY, RUNNING or PAUSED "
                 "(current: " + str(self.__state.name) + ")"
             )
 
@@ -106,9 +204,18 @@ class Simulator:
         if delay < 0:
             raise ValueError("End delay must be non-negative")
 
-        # Zero delay end in READY state is not permitted
-        if self.__state == Simulator._State.READY and delay == 0:
-            raise ValueError("Cannot schedule end with zero delay in READY state")
+        # Zero delay end in READY or PAUSED state is not permitted
+        if self.__state in Simulator._RUNNABLE_STATES and delay == 0:
+            raise ValueError(
+                "Cannot schedule end with zero delay in " + str(self.__state.name) + " state"
+            )
+
+        # While running up to an intermediate time, the end time is also remembered separately
+        if self.__partial_run:
+            if self.__final_end_time is None:
+                self.__final_end_time = self.__now + delay
+            else:
+                self.__final_end_time = min(self.__final_end_time, self.__now + delay)
 
         # Set the end time
         if self.__end_time is None:
@@ -138,7 +245,7 @@ class Simulator:
             ],
             *args,
             **kwargs
-    ) -> None:
+    ) -> EventHandle:
         """
         Schedule an event in the simulation with default priority (0).
 
@@ -146,8 +253,14 @@ class Simulator:
         :param callback:    Callback: it must be a function or method
         :param args:        (Optional) Positional arguments passed to the callback
         :param kwargs:      (Optional) Keyword arguments passed to the callback
+
+        :return: Handle to the event
         """
-        self.schedule_with_priority(delay, 0, callback, *args, **kwargs)
+
+        # Without validation, the arguments are trusted to be valid
+        if self.__validate:
+            self.__check_event(delay, 0, callback, kwargs)
+        return self.__insert_event(delay, 0, callback, args, kwargs)
 
     def schedule_with_priority(
             self,
@@ -162,7 +275,7 @@ class Simulator:
             ],
             *args,
             **kwargs
-    ) -> None:
+    ) -> EventHandle:
         """
         Schedule an event in the simulation with a certain priority.
 
@@ -175,12 +288,29 @@ class Simulator:
         :param callback:    Callback: it must be a function or method
         :param args:        (Optional) Positional arguments passed to the callback
         :param kwargs:      (Optional) Keyword arguments passed to the callback
+
+        :return: Handle to the event
+        """
+
+        # Without validation, the arguments are trusted to be valid
+        if self.__validate:
+            self.__check_event(delay, priority, callback, kwargs)
+        return self.__insert_event(delay, priority, callback, args, kwargs)
+
+    def __check_event(self, delay: int, priority: int, callback, kwargs: dict) -> None:
+        """
+        Validate the arguments of an event to be scheduled.
+
+        :param delay:       Delay from current simulation time (now)
+        :param priority:    Priority
+        :param callback:    Callback
+        :param kwargs:      Keyword arguments passed to the callback
         """
 
-        # Simulator must be in either READY or RUNNING state
-        if self.__state != Simulator._State.READY and self.__state != Simulator._State.RUNNING:
+        # Simulator must be in either READY, RUNNING or PAUSED state
+        if self.__state not in Simulator._SCHEDULING_STATES:
             raise ValueError(
-                "Scheduling can only be done when the state is READY or RUNNING "
+                "Scheduling can only be done when the state is READY, RUNNING or PAUSED "
                 "(current: " + str(self.__state.name) + ")"
             )
 
@@ -196,7 +326,8 @@ class Simulator:
                 not isinstance(callback, MethodType) and
                 not isinstance(callback, LambdaType) and
                 not isinstance(callback, BuiltinFunctionType) and
-                not isinstance(callback, BuiltinMethodType)
+                not isinstance(callback, BuiltinMethodType) and
+                not isinstance(callback, BatchedCallback)
         ):
             raise ValueError("Callback must be a function or a method")
 
@@ -208,48 +339,1211 @@ class Simulator:
         if delay < 0:
             raise ValueError("Delay must be non-negative: %d" % delay)
 
+        # Events of a batched callback are handled as positional argument tuples
+        if kwargs and isinstance(callback, BatchedCallback):
+            raise ValueError("Events of a batched callback cannot have keyword arguments")
+
+    def __insert_event(
+            self, delay: int, priority: int, callback, args: tuple, kwargs: dict
+    ) -> EventHandle:
+        """
+        Insert a (validated or trusted) event into the event heap.
+
+        :param delay:       Delay from current simulation time (now)
+        :param priority:    Priority
+        :param callback:    Callback
+        :param args:        Positional arguments passed to the callback
+        :param kwargs:      Keyword arguments passed to the callback
+
+        :return: Handle to the event
+        """
+
         # Insert into the event heap
         # (event id is incremented such that it is unique for every event)
-        heapq.heappush(
-            self.__event_heap,
-            (self.__now + delay, priority, self.__event_id, callback, args, kwargs)
+        # (the keyword arguments dict is only stored if it is not empty)
+        self.__delay_histogram[delay.bit_length()] += 1
+        time = self.__now + delay
+        event_id = self.__event_id
+        if kwargs:
+            self.__event_heap.push((time, priority, event_id, callback, args, kwargs))
+        else:
+            self.__event_heap.push((time, priority, event_id, callback, args))
+        self.__event_id += 1
+        return EventHandle(self, time, priority, event_id, self.__generation)
+
+    def schedule_periodic(
+            self,
+            interval: int,
+            priority: int,
+            callback: Union[
+                FunctionType,
+                MethodType,
+                LambdaType,
+                BuiltinFunctionType,
+                BuiltinMethodType
+            ],
+            *args,
+            start: Union[int, None] = None,
+            count: Union[int, None] = None
+    ) -> PeriodicEventHandle:
+        """
+        Schedule an event in the simulation which is executed periodically.
+
+        The event is validated once, and after each execution the same callback
+        and arguments are directly re-inserted one interval later. The order with
+        respect to other events is the same as if the callback scheduled itself again
+        at the end of its execution. It can be stopped via the returned handle.
+
+        :param interval:    Interval between executions (must be positive)
+        :param priority:    Priority
+        :param callback:    Callback: it must be a function or method
+        :param args:        (Optional) Positional arguments passed to the callback
+        :param start:       (Optional; default: interval)
+                            Delay from current simulation time (now) to the first execution
+        :param count:       (Optional; default: unlimited)
+                            Number of executions
+
+        :return: Handle to the periodic event
+        """
+
+        # Simulator must be in either READY, RUNNING or PAUSED state
+        if self.__state not in Simulator._SCHEDULING_STATES:
+            raise ValueError(
+                "Scheduling can only be done when the state is READY, RUNNING or PAUSED "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        # The interval must be a positive integer
+        if not isinstance(interval, int):
+            raise ValueError("Interval must be an integer")
+        if interval <= 0:
+            raise ValueError("Interval must be positive: %d" % interval)
+
+        # The priority must be an integer
+        if not isinstance(priority, int):
+            raise ValueError("Priority must be an integer")
+
+        # The callback must be either a function or a method
+        if not isinstance(callback, _CALLBACK_TYPES):
+            raise ValueError("Callback must be a function or a method")
+
+        # The start delay must be a non-negative integer
+        if start is None:
+            start = interval
+        if not isinstance(start, int):
+            raise ValueError("Start delay must be an integer")
+        if start < 0:
+            raise ValueError("Start delay must be non-negative: %d" % start)
+
+        # The count must be a positive integer
+        if count is not None and (not isinstance(count, int) or count <= 0):
+            raise ValueError("Count must be a positive integer")
+
+        handle = PeriodicEventHandle(self, interval, priority, callback, args, count)
+        handle._arm(self.__now + start)  # pylint: disable=protected-access
+        return handle
+
+    def schedule_arrivals(
+            self,
+            distribution: Distribution,
+            seed: int,
+            priority: int,
+            callback: Union[
+                FunctionType,
+                MethodType,
+                LambdaType,
+                BuiltinFunctionType,
+                BuiltinMethodType
+            ],
+            *args,
+            start: int = 0,
+            count: Union[int, None] = None,
+            batch_size: int = 1024
+    ) -> ArrivalSource:
+        """
+        Schedule a source of stochastic arrivals in the simulation (see ArrivalSource).
+
+        The interarrival times are drawn from the distribution (e.g., Poisson, Deterministic,
+        Pareto or Empirical) in batches, using a random number generator of the source itself
+        which is seeded with the given seed: the arrival times are thus reproducible, and
+        independent of the global random module and of other sources (for multiple sources,
+        use distinct seeds, e.g., derived via replication_seed()). The arrival times are
+        rounded to integer time. Only the next arrival of the source is in the event heap.
+        It can be stopped via the returned source.
+
+        :param distribution:    Interarrival time distribution
+        :param seed:            Seed of the random number generator of the source
+        :param priority:        Priority
+        :param callback:        Callback: it must be a function or method
+        :param args:            (Optional) Positional arguments passed to the callback
+        :param start:           (Optional; default: 0) Delay from current simulation time (now)
+                                to the start, from which the first interarrival time is counted
+        :param count:           (Optional; default: unlimited) Number of arrivals
+        :param batch_size:      (Optional; default: 1024) Number of interarrival times drawn
+                                at once
+
+        :return: Arrival source
+        """
+
+        # Simulator must be in either READY, RUNNING or PAUSED state
+        if self.__state not in Simulator._SCHEDULING_STATES:
+            raise ValueError(
+                "Scheduling can only be done when the state is READY, RUNNING or PAUSED "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        # The distribution must be a distribution, the seed and priority integers
+        if not isinstance(distribution, Distribution):
+            raise ValueError("Distribution must be a Distribution")
+        if not isinstance(seed, int):
+            raise ValueError("Seed must be an integer")
+        if not isinstance(priority, int):
+            raise ValueError("Priority must be an integer")
+
+        # The callback must be either a function or a method
+        if not isinstance(callback, _CALLBACK_TYPES):
+            raise ValueError("Callback must be a function or a method")
+
+        # The start delay must be a non-negative integer
+        if not isinstance(start, int):
+            raise ValueError("Start delay must be an integer")
+        if start < 0:
+            raise ValueError("Start delay must be non-negative: %d" % start)
+
+        # The count and batch size must be positive integers
+        if count is not None and (not isinstance(count, int) or count <= 0):
+            raise ValueError("Count must be a positive integer")
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer")
+
+        source = ArrivalSource(
+            self, distribution, seed, priority, callback, args, count, batch_size
         )
+        source._start(self.__now + start)  # pylint: disable=protected-access
+        return source
+
+    def process(self, generator, delay: int = 0, priority: int = 0) -> Process:
+        """
+        Start a process executing a generator (see Process).
+
+        The generator yields a non-negative integer delay to be resumed after it, a Condition
+        to be resumed once it is triggered, or another Process to be resumed once it has
+        finished. Each step of the process is an event in the event heap with the given
+        priority, of which the callback is the same bound method without arguments.
+
+        :param generator:   Generator (e.g., the result of calling a generator function)
+        :param delay:       (Optional; default: 0)
+                            Delay from current simulation time (now) to its first step
+        :param priority:    (Optional; default: 0) Priority of its events
+
+        :return: Process
+        """
+
+        # Simulator must be in either READY, RUNNING or PAUSED state
+        if self.__state not in Simulator._SCHEDULING_STATES:
+            raise ValueError(
+                "Scheduling can only be done when the state is READY, RUNNING or PAUSED "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        # The generator must be a generator
+        if not isinstance(generator, GeneratorType):
+            raise ValueError("Process must be a generator")
+
+        # The delay and priority must be integers, the delay non-negative
+        if not isinstance(delay, int):
+            raise ValueError("Delay must be an integer")
+        if not isinstance(priority, int):
+            raise ValueError("Priority must be an integer")
+        if delay < 0:
+            raise ValueError("Delay must be non-negative: %d" % delay)
+
+        process = Process(self, generator, priority)
+        process._schedule(self.__now + delay)  # pylint: disable=protected-access
+        return process
+
+    def batched(
+            self,
+            handler: Union[
+                FunctionType,
+                MethodType,
+                LambdaType,
+                BuiltinFunctionType,
+                BuiltinMethodType
+            ]
+    ) -> BatchedCallback:
+        """
+        Create a batched callback, which can be scheduled like any other callback.
+
+        When the first of its events is executed, all events in the event heap directly
+        following it which are scheduled at the same time for the same batched callback
+        are executed with it: the handler is called once with the list of the positional
+        argument tuples of these events (in execution order). The ordering of these events
+        relative to events of other callbacks is thereby preserved. Events of a batched
+        callback cannot have keyword arguments. Each event of a batch is recorded by the
+        trace writer and counted by the profiler, which times the batch as a whole.
+
+        :param handler:     Handler: it must be a function or method,
+                            which is called with a list of positional argument tuples
+
+        :return: Batched callback
+        """
+
+        # The handler must be either a function or a method
+        if not isinstance(handler, (FunctionType, MethodType, BuiltinFunctionType)):
+            raise ValueError("Handler must be a function or a method")
+
+        return BatchedCallback(self, handler)
+
+    def _drain(self, callback: BatchedCallback, batch: list) -> None:
+        """
+        Remove the events at the front of the event heap for the batched callback
+        in the current time moment (only to be called by BatchedCallback).
+
+        :param callback:    Batched callback
+        :param batch:       List to which their positional argument tuples are appended
+        """
+        event_heap = self.__event_heap
+        cancelled = self.__cancelled
+        now = self.__now
+        trace = None if self.__trace_writer is None else self.__trace_writer.record
+        event = event_heap.peek()
+        while event is not None and event[0] == now and len(event) == 5:
+            if cancelled and event[2] in cancelled:
+                cancelled.remove(event[2])
+                self.__num_discarded += 1
+            elif event[3] is callback:
+                batch.append(event[4])
+                self.__dispatched = event
+                self.__dispatched_next_id = self.__event_id
+                self.__num_drained += 1
+                if trace is not None:
+                    trace(event[0], event[1], event[2], callback)
+            else:
+                break
+            event_heap.pop()
+            event = event_heap.peek()
+
+    def _push_event(self, time: int, priority: int, callback, args: tuple) -> int:
+        """
+        Insert an already validated event into the event heap
+        (only to be called by the handles of this simulator).
+
+        :param time:        Time
+        :param priority:    Priority
+        :param callback:    Callback
+        :param args:        Positional arguments passed to the callback
+
+        :return: Event identifier
+        """
+        self.__delay_histogram[(time - self.__now).bit_length()] += 1
+        event_id = self.__event_id
+        self.__event_heap.push((time, priority, event_id, callback, args))
         self.__event_id += 1
+        return event_id
+
+    def _push_reserved_event(self, time: int, priority: int, event_id: int, callback) -> None:
+        """
+        Insert an already validated event without arguments with an event identifier reserved
+        when it was scheduled (only to be called by ScheduledArrays).
+
+        :param time:        Time
+        :param priority:    Priority
+        :param event_id:    Event identifier
+        :param callback:    Callback
+        """
+        self.__event_heap.push((time, priority, event_id, callback, ()))
+
+    def cancel(self, handle: EventHandle) -> bool:
+        """
+        Cancel a scheduled event such that it will not be executed.
+
+        The event is not removed from the event heap immediately: it is skipped
+        once it reaches the front. The event heap is compacted once the cancelled
+        events make up a large fraction of it (see COMPACTION_RATIO).
+
+        Cancelling an event which was already cancelled, which has already been
+        executed (including earlier in the current time moment), or which was
+        scheduled before the simulator was reset has no effect.
+
+        :param handle:  Handle to the event (as returned by schedule())
+
+        :return: True iff the event was cancelled by this call
+        """
+
+        # The handle must be an event handle
+        if not isinstance(handle, EventHandle):
+            raise ValueError("Handle must be an EventHandle")
+
+        return handle.cancel()
+
+    def _generation(self) -> object:
+        """
+        Retrieve the generation of the current run (only to be called by the handles of this
+        simulator), which is replaced by reset().
+
+        :return: Generation
+        """
+        return self.__generation
+
+    def _cancel_event(self, time: int, priority: int, event_id: int, generation: object) -> bool:
+        """
+        Mark an event as cancelled (only to be called by the handles of this simulator).
+
+        :param time:        Time at which the event is scheduled
+        :param priority:    Priority of the event
+        :param event_id:    Event identifier
+        :param generation:  Generation of the run in which it was scheduled
+
+        :return: True iff the event was cancelled
+        """
+
+        # Simulator must be in either READY, RUNNING or PAUSED state
+        if self.__state not in Simulator._SCHEDULING_STATES:
+            raise ValueError(
+                "Cancelling can only be done when the state is READY, RUNNING or PAUSED "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        # Scheduled in an earlier run (before a reset)
+        if generation is not self.__generation:
+            return False
+
+        # Already executed: before the current time moment (now), or in it up to the last
+        # executed event (which was at the front of the event heap, as such every event which
+        # then already existed and is ordered before it has been executed as well)
+        if time < self.__now:
+            return False
+        dispatched = self.__last_dispatched()
+        if (
+                dispatched is not None
+                and time == dispatched[0]
+                and event_id < self.__dispatched_next_id
+                and (priority, event_id) <= (dispatched[1], dispatched[2])
+        ):
+            return False
+
+        # Mark as cancelled, and compact if they have become too many
+        self.__cancelled.add(event_id)
+        if (
+                len(self.__event_heap) >= Simulator.COMPACTION_MIN_SIZE
+                and len(self.__cancelled) >= Simulator.COMPACTION_RATIO * len(self.__event_heap)
+        ):
+            self.compact()
+        return True
+
+    def __last_dispatched(self) -> Union[tuple, None]:
+        """
+        Retrieve the last event removed from the event heap for execution.
+
+        :return: (time, priority, event_id) of the event, None if there is none
+        """
+        dispatched = self.__dispatched
+        if dispatched is None:
+            return None
+        if isinstance(dispatched, int):
+            return PooledEventQueue.unpack_key(dispatched)
+        return dispatched[:3]
+
+    def compact(self) -> None:
+        """
+        Remove all cancelled events from the event heap.
+        This is done automatically by cancel(), so generally there is no need to call it.
+        """
+        cancelled = self.__cancelled
+        if cancelled:
+            events = [event for event in self.__event_heap if event[2] not in cancelled]
+            self.__peak_heap_size = max(self.__peak_heap_size, len(self.__event_heap))
+            self.__num_discarded += len(self.__event_heap) - len(events)
+            self.__event_heap.clear()
+            self.__event_heap.push_many(events)
+            cancelled.clear()
+
+    def schedule_many(self, events) -> None:
+        """
+        Schedule a batch of events in the simulation.
+
+        The events are validated once as a batch: if any of them is invalid, none are scheduled.
+        They receive consecutive event identifiers in the order of the batch, as such events
+        with equal time and priority are executed in the order they appear in the batch
+        (which is the same as scheduling them one by one). The batch is merged into the event
+        queue at once, which for the default binary heap is O(n) instead of O(n log n).
+
+        :param events:  Iterable of (delay, priority, callback, args) tuples, with args
+                        being the tuple of positional arguments passed to the callback
+        """
+
+        # Simulator must be in either READY, RUNNING or PAUSED state
+        if self.__state not in Simulator._SCHEDULING_STATES:
+            raise ValueError(
+                "Scheduling can only be done when the state is READY, RUNNING or PAUSED "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        events = list(events)
+        if not events:
+            return
+
+        if self.__validate:
+
+            # The delays and priorities must be integers (each distinct type is checked once)
+            if not all(issubclass(t, int) for t in {type(event[0]) for event in events}):
+                raise ValueError("Delay must be an integer")
+            if not all(issubclass(t, int) for t in {type(event[1]) for event in events}):
+                raise ValueError("Priority must be an integer")
+
+            # The callbacks must be either a function or a method (each distinct checked once,
+            # by identity: in Python 3.7 a bound method hashes its owner, e.g., list.append)
+            for callback in {id(event[2]): event[2] for event in events}.values():
+                if not isinstance(callback, _CALLBACK_TYPES):
+                    raise ValueError("Callback must be a function or a method")
+
+            # The positional arguments must be tuples
+            if not all(issubclass(t, tuple) for t in {type(event[3]) for event in events}):
+                raise ValueError("Positional arguments must be a tuple")
+
+            # Events can only be scheduled in the current time moment (now) or later
+            shortest = min(event[0] for event in events)
+            if shortest < 0:
+                raise ValueError("Delay must be non-negative: %d" % shortest)
+
+        # Event tuples (without keyword arguments) with consecutive event ids
+        # The garbage collector is paused meanwhile, as the many new tuples would
+        # otherwise trigger repeated collections while they cannot form any cycle
+        now = self.__now
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            batch = [
+                (now + delay, priority, event_id, callback, args)
+                for event_id, (delay, priority, callback, args)
+                in enumerate(events, self.__event_id)
+            ]
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        # Insert into the event heap
+        self.__delay_histogram.update(event[0].bit_length() for event in events)
+        self.__event_heap.push_many(batch)
+        self.__event_id += len(batch)
+
+    def schedule_arrays(
+            self,
+            delays,
+            callback: Union[
+                FunctionType,
+                MethodType,
+                LambdaType,
+                BuiltinFunctionType,
+                BuiltinMethodType
+            ],
+            *columns,
+            priorities=None
+    ) -> ScheduledArrays:
+        """
+        Schedule events from arrays: event i has delay delays[i], priority priorities[i],
+        and its callback is called with positional arguments (columns[0][i], columns[1][i], ...).
+
+        The delays and priorities are copied into 64-bit integer arrays (any sequence of
+        integers is accepted, e.g., a list, an array.array or a NumPy array), and their
+        execution order is determined at once (which is fastest if they are already sorted).
+        The event identifiers are reserved at once as well, such that the events are executed
+        in the same order as if they had been scheduled one by one. Only the next of them
+        (in execution order) is in the event heap, as such no per-event objects are created
+        until then: the arguments are taken from the columns when an event is executed.
+        The columns are not copied, as such they must not be modified until then.
+
+        :param delays:      Delay of each event from current simulation time (now)
+        :param callback:    Callback: it must be a function or method
+        :param columns:     (Optional) Columns of positional arguments passed to the callback,
+                            each with an entry per event (e.g., a list or an array)
+        :param priorities:  (Optional; default: all 0) Priority of each event
+
+        :return: Events scheduled from the arrays
+        """
+
+        # Simulator must be in either READY, RUNNING or PAUSED state
+        if self.__state not in Simulator._SCHEDULING_STATES:
+            raise ValueError(
+                "Scheduling can only be done when the state is READY, RUNNING or PAUSED "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        # The delays and priorities must be 64-bit integers
+        delays = int64_array(delays, "Delay")
+        if priorities is not None:
+            priorities = int64_array(priorities, "Priority")
+            if len(priorities) != len(delays):
+                raise ValueError("There must be as many priorities as delays")
+
+        # Each column must have as many entries as there are delays
+        for column in columns:
+            if len(column) != len(delays):
+                raise ValueError("Each argument column must have as many entries as delays")
+
+        if self.__validate:
+
+            # The callback must be either a function or a method
+            if not isinstance(callback, _CALLBACK_TYPES):
+                raise ValueError("Callback must be a function or a method")
+
+            # Events can only be scheduled in the current time moment (now) or later
+            if delays and min(delays) < 0:
+                raise ValueError("Delay must be non-negative: %d" % min(delays))
+
+        # Execution order, and the delay histogram
+        order = execution_order(delays, priorities)
+        self.__delay_histogram.update(delay_bit_lengths(delays, order))
+
+        # Reserve the event identifiers, and insert the first event
+        scheduled = ScheduledArrays(
+            self, self.__now, delays, priorities, order, callback, columns, self.__event_id
+        )
+        self.__event_id += len(delays)
+        if delays:
+            scheduled._arm()  # pylint: disable=protected-access
+            self.__scheduled_arrays.append(scheduled)
+        return scheduled
 
     def run(self) -> None:
         """
-        Run the simulation.
+        Run the simulation (or continue it, if it is PAUSED).
 
         If there is an end time (specified via end()), the simulation will
         end at that time moment. Else, if there is no end time specified, the
         simulation will run until there are no more events.
         """
 
-        # Simulator must be in READY state
-        if self.__state != Simulator._State.READY:
+        # Simulator must be in READY or PAUSED state
+        if self.__state not in Simulator._RUNNABLE_STATES:
             raise ValueError(
-                "Run can only be started when the state is READY "
+                "Run can only be started when the state is READY or PAUSED "
                 "(current: " + str(self.__state.name) + ")"
             )
 
         # Now it is in RUNNING state
         self.__state = Simulator._State.RUNNING
+        self.__run_loop()
+
+        # Finish
+        if self.__end_time is not None:
+            self.__now = self.__end_time
+        self.__state = Simulator._State.FINISHED
+
+    def run_until(self, time: int) -> None:
+        """
+        Run the simulation up to a time, and pause it there.
+
+        All events scheduled before the time are executed (thus excluding those at the time
+        itself, as with an end time), after which the current time (now) is that time and the
+        simulator is PAUSED. While PAUSED, events can be scheduled (and cancelled) as in READY
+        state, and the run can be continued via run_until(), step() or run(). If the end time
+        (specified via end()) is reached before the time, the simulator becomes FINISHED as
+        with run().
+
+        :param time:    Time up to which to run (exclusive), at or after the current time (now)
+        """
+
+        # Simulator must be in READY or PAUSED state
+        if self.__state not in Simulator._RUNNABLE_STATES:
+            raise ValueError(
+                "Run can only be started when the state is READY or PAUSED "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        # The time must be an integer which is not in the past
+        if not isinstance(time, int):
+            raise ValueError("Time must be an integer")
+        if time < self.__now:
+            raise ValueError("Time must be at or after the current time: %d" % time)
+
+        # If the end time comes first, it is a complete run
+        if self.__end_time is not None and self.__end_time <= time:
+            self.run()
+            return
+
+        # Run with the intermediate time as end time of the event loop
+        self.__state = Simulator._State.RUNNING
+        self.__partial_run = True
+        self.__final_end_time = self.__end_time
+        self.__end_time = time
+        self.__run_loop()
+        self.__partial_run = False
+        self.__end_time = self.__final_end_time
 
-        # Event loop
-        next_event = None if len(self.__event_heap) == 0 else self.__event_heap[0]  # Peek
+        # Finished if end() was called with an end time before the intermediate time,
+        # else paused at the intermediate time
+        if self.__end_time is not None and self.__end_time <= time:
+            self.__now = self.__end_time
+            self.__state = Simulator._State.FINISHED
+        else:
+            self.__now = time
+            self.__state = Simulator._State.PAUSED
+
+    def step(self, num_events: int = 1) -> int:
+        """
+        Execute a number of events (cancelled events not included), and pause the simulation.
+
+        The current time (now) is the time of the last executed event. If there are fewer
+        events, all are executed and the simulator is PAUSED until more are scheduled (see
+        run_until()). If the end time (specified via end()) is reached, the simulator becomes
+        FINISHED as with run().
+
+        :param num_events:  (Optional; default: 1) Number of events to execute (positive)
+
+        :return: Number of events executed
+        """
+
+        # Simulator must be in READY or PAUSED state
+        if self.__state not in Simulator._RUNNABLE_STATES:
+            raise ValueError(
+                "Run can only be started when the state is READY or PAUSED "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        # The number of events must be a positive integer
+        if not isinstance(num_events, int) or num_events <= 0:
+            raise ValueError("Number of events must be a positive integer")
+
+        # Run for at most the number of events
+        self.__state = Simulator._State.RUNNING
+        executed = self.__run_loop(num_events)
+
+        # Finished if the end time has been reached (the next event is at or beyond it,
+        # or end() was called with zero delay), else paused
+        next_event = self.__event_heap.peek()
+        if self.__end_time is not None and (
+                self.__end_time <= self.__now
+                or (next_event is not None and next_event[0] >= self.__end_time)
+        ):
+            self.__now = self.__end_time
+            self.__state = Simulator._State.FINISHED
+        else:
+            self.__state = Simulator._State.PAUSED
+        return executed
+
+    def __run_loop(self, max_events: Union[int, None] = None) -> int:
+        """
+        Execute the events up to the end time (or until there are no more events).
+
+        :param max_events:  Maximum number of events to execute (None: unlimited)
+
+        :return: Number of events executed (only counted if there is a maximum, else 0)
+        """
+
+        # Outside of the event loop the event heap only grows (compaction records the peak),
+        # so its peak size is at least its current size
+        self.__peak_heap_size = max(self.__peak_heap_size, len(self.__event_heap))
+
+        # Event loop: instrumented (with automatic checkpoints, tracing and/or profiling),
+        # or specialized for the default binary heap or the pooled queue, or else generic
+        # (a maximum number of events is supported by the instrumented and specialized ones)
+        self.__run_start = perf_counter()
+        try:
+            heap_specialized = self.__event_heap.__class__ is HeapEventQueue
+            if (
+                    self.__auto_checkpoint is not None
+                    or self.__trace_writer is not None
+                    or self.__profiler is not None
+                    or (max_events is not None and not heap_specialized)
+            ):
+                return self.__run_instrumented(max_events)
+            if max_events is not None:
+                return self.__run_heap_limited(self.__event_heap.heap(), max_events)
+            if heap_specialized:
+                self.__run_heap(self.__event_heap.heap())
+            elif self.__event_heap.__class__ is PooledEventQueue:
+                self.__run_pooled(self.__event_heap)
+            else:
+                self.__run_generic()
+            return 0
+        finally:
+            self.__wall_time += perf_counter() - self.__run_start
+            self.__run_start = None
+
+    def __run_generic(self) -> None:
+        """
+        Event loop for any event queue backend.
+        """
+        event_heap = self.__event_heap
+        cancelled = self.__cancelled
+        next_event = event_heap.peek()
         while (
                 next_event is not None
                 and (self.__end_time is None or next_event[0] < self.__end_time)
         ):
-            heapq.heappop(self.__event_heap)
-            self.__now = next_event[0]
-            next_event[3](*next_event[4], **next_event[5])
-            next_event = None if len(self.__event_heap) == 0 else self.__event_heap[0]  # Peek
+            event_heap.pop()
+            if cancelled and next_event[2] in cancelled:
+                cancelled.remove(next_event[2])
+                self.__num_discarded += 1
+            else:
+                self.__now = next_event[0]
+                self.__dispatched = next_event
+                self.__dispatched_next_id = self.__event_id
+                if len(next_event) == 5:
+                    next_event[3](*next_event[4])
+                else:
+                    next_event[3](*next_event[4], **next_event[5])
+                if len(event_heap) > self.__peak_heap_size:
+                    self.__peak_heap_size = len(event_heap)
+            next_event = event_heap.peek()
 
-        # Finish
-        if self.__end_time is not None:
-            self.__now = self.__end_time
-        self.__state = Simulator._State.FINISHED
+    def __run_heap(self, heap: list) -> None:
+        """
+        Event loop operating directly on the list of the binary heap event queue.
+
+        :param heap:    List of the binary heap
+        """
+        cancelled = self.__cancelled
+        heappop = heapq.heappop
+
+        # Without end time, there is no time to compare against
+        # (until end() is called during the run)
+        while heap and self.__end_time is None:
+            event = heappop(heap)
+            if cancelled and event[2] in cancelled:
+                cancelled.remove(event[2])
+                self.__num_discarded += 1
+                continue
+            self.__now = event[0]
+            self.__dispatched = event
+            self.__dispatched_next_id = self.__event_id
+            if len(event) == 5:
+                event[3](*event[4])
+            else:
+                event[3](*event[4], **event[5])
+            if len(heap) > self.__peak_heap_size:
+                self.__peak_heap_size = len(heap)
+
+        # With end time, the first event at or beyond it is put back
+        while heap:
+            event = heappop(heap)
+            if event[0] >= self.__end_time:
+                heapq.heappush(heap, event)
+                break
+            if cancelled and event[2] in cancelled:
+                cancelled.remove(event[2])
+                self.__num_discarded += 1
+                continue
+            self.__now = event[0]
+            self.__dispatched = event
+            self.__dispatched_next_id = self.__event_id
+            if len(event) == 5:
+                event[3](*event[4])
+            else:
+                event[3](*event[4], **event[5])
+            if len(heap) > self.__peak_heap_size:
+                self.__peak_heap_size = len(heap)
+
+    def __run_pooled(self, queue: PooledEventQueue) -> None:
+        """
+        Event loop operating directly on the heap of keys and the records of the pooled
+        event queue, without materializing event tuples.
+
+        :param queue:   Pooled event queue
+        """
+        heap = queue.heap()
+        records = queue.records()
+        free_slots = queue.free_slots()
+        recycle = queue.recycle
+        slot_mask = PooledEventQueue.SLOT_MASK
+        cancelled = self.__cancelled
+        heappop = heapq.heappop
+
+        # The record is recycled before its callback is called (which can schedule events)
+        while heap:
+            key = heappop(heap)
+            slot = key & slot_mask
+            record = records[slot]
+            if self.__end_time is not None and record.time >= self.__end_time:
+                heapq.heappush(heap, key)
+                break
+            if cancelled and record.event_id in cancelled:
+                cancelled.remove(record.event_id)
+                self.__num_discarded += 1
+                recycle(slot)
+                continue
+            self.__now = record.time
+            self.__dispatched = key
+            self.__dispatched_next_id = self.__event_id
+            callback = record.callback
+            args = record.args
+            kwargs = record.kwargs
+            record.callback = record.args = record.kwargs = None
+            free_slots.append(slot)
+            if kwargs is None:
+                callback(*args)
+            else:
+                callback(*args, **kwargs)
+            if len(heap) > self.__peak_heap_size:
+                self.__peak_heap_size = len(heap)
+
+    def __run_instrumented(self, max_events: Union[int, None]) -> int:
+        """
+        Event loop for any event queue backend which writes each executed event to the trace,
+        reports each executed event to the profiler, writes a checkpoint every so many
+        executed events and/or wall-clock seconds, and/or stops after a number of events.
+
+        :param max_events:  Maximum number of events to execute (None: unlimited)
+
+        :return: Number of events executed (only counted if there is a maximum, else 0)
+        """
+        if self.__auto_checkpoint is not None:
+            path, every_events, every_seconds, state = self.__auto_checkpoint
+            checkpointing = True
+        else:
+            path, every_events, every_seconds, state = None, None, None, None
+            checkpointing = False
+        trace = None if self.__trace_writer is None else self.__trace_writer.record
+        profiling = self.__profiler is not None
+        if profiling:
+            profile_count = self.__profiler.count
+            profile_record = self.__profiler.record
+            sample_every = self.__profiler.sample_every()
+            countdown = sample_every
+        start = None
+        num_executed = 0
+        event_heap = self.__event_heap
+        cancelled = self.__cancelled
+        executed = 0
+        deadline = None if every_seconds is None else monotonic() + every_seconds
+        next_event = event_heap.peek()
+        while (
+                next_event is not None
+                and (self.__end_time is None or next_event[0] < self.__end_time)
+        ):
+            event_heap.pop()
+            if cancelled and next_event[2] in cancelled:
+                cancelled.remove(next_event[2])
+                self.__num_discarded += 1
+            else:
+                self.__now = next_event[0]
+                self.__dispatched = next_event
+                self.__dispatched_next_id = self.__event_id
+                if trace is not None:
+                    trace(next_event[0], next_event[1], next_event[2], next_event[3])
+                if profiling:
+                    event_id = self.__event_id
+                    num_drained = self.__num_drained
+                    countdown -= 1
+                    if countdown == 0:
+                        countdown = sample_every
+                        start = perf_counter()
+                if len(next_event) == 5:
+                    next_event[3](*next_event[4])
+                else:
+                    next_event[3](*next_event[4], **next_event[5])
+                if len(event_heap) > self.__peak_heap_size:
+                    self.__peak_heap_size = len(event_heap)
+                if profiling:
+                    num_events = 1 + self.__num_drained - num_drained
+                    if start is None:
+                        profile_count(next_event[3], self.__event_id - event_id, num_events)
+                    else:
+                        profile_record(
+                            next_event[3], perf_counter() - start, self.__event_id - event_id,
+                            num_events
+                        )
+                        start = None
+                if checkpointing:
+                    executed += 1
+                    if (
+                            executed == every_events
+                            or (deadline is not None and monotonic() >= deadline)
+                    ):
+                        self.__write_checkpoint(path, state)
+                        executed = 0
+                        if deadline is not None:
+                            deadline = monotonic() + every_seconds
+                if max_events is not None:
+                    num_executed += 1
+                    if num_executed == max_events:
+                        break
+            next_event = event_heap.peek()
+        return num_executed
+
+    def trace(self, writer: Union[TraceWriter, None]) -> None:
+        """
+        Write a record (time, priority, event_id, callback id) of each executed event
+        to a trace writer during the run (see TraceWriter and read_trace()).
+        The writer is not closed by the simulator. Calling it with None disables tracing.
+
+        :param writer:  Trace writer (None: disable)
+        """
+
+        # Simulator must be in READY or PAUSED state
+        if self.__state not in Simulator._RUNNABLE_STATES:
+            raise ValueError(
+                "Tracing can only be configured when the state is READY or PAUSED "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        # The writer must be a trace writer
+        if writer is not None and not isinstance(writer, TraceWriter):
+            raise ValueError("Writer must be a TraceWriter")
+
+        self.__trace_writer = writer
+
+    def profile(self, profiler: Union[CallbackProfiler, None]) -> None:
+        """
+        Report each executed event to a callback profiler during the run
+        (see CallbackProfiler). Calling it with None disables profiling.
+
+        :param profiler:    Callback profiler (None: disable)
+        """
+
+        # Simulator must be in READY or PAUSED state
+        if self.__state not in Simulator._RUNNABLE_STATES:
+            raise ValueError(
+                "Profiling can only be configured when the state is READY or PAUSED "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        # The profiler must be a callback profiler
+        if profiler is not None and not isinstance(profiler, CallbackProfiler):
+            raise ValueError("Profiler must be a CallbackProfiler")
+
+        self.__profiler = profiler
+
+    def checkpoint(self, path: str, state=None) -> None:
+        """
+        Write the simulator to a checkpoint file, from which it can be restored (see restore()).
+
+        The checkpoint contains the current time (now), the event identifier counter, the end
+        time, the pending events (including the cancelled ones) and the state of the global
+        random number generator. The callbacks and arguments of the pending events are pickled,
+        as such they must be picklable: functions defined at module level, and methods of
+        picklable objects. References to this simulator (e.g., in event handles) are restored
+        as references to the restoring simulator. Any other model state, which is not reachable
+        from the pending events (e.g., collected results), is to be passed as the state object.
+
+        The state object and the distinct callbacks of the events (with their owners) are
+        written first as a table of shared objects, after which the events are written in
+        chunks (see CHECKPOINT_CHUNK_SIZE) instead of as a single list. The table also holds
+        the arguments which are passed to more than one event. Any object stored in the table
+        (e.g., a callback, an argument, or an object of the model state) is only stored once,
+        to which the events refer. Any other object is only shared by the events of a chunk:
+        an object nested within the arguments of events in different chunks is restored as a
+        copy per chunk, unless it is reachable from the state or from one of the above.
+        The file is written to a temporary file first, such that an existing checkpoint
+        is only replaced once the new one is complete.
+
+        :param path:    Checkpoint file path
+        :param state:   (Optional) Model state object (must be picklable)
+        """
+
+        # Simulator must be in READY or PAUSED state
+        if self.__state not in Simulator._RUNNABLE_STATES:
+            raise ValueError(
+                "Checkpointing can only be done when the state is READY or PAUSED "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        self.__write_checkpoint(path, state)
+
+    def auto_checkpoint(
+            self,
+            path: Union[str, None],
+            every_events: Union[int, None] = None,
+            every_seconds: Union[float, None] = None,
+            state=None
+    ) -> None:
+        """
+        Write a checkpoint (see checkpoint()) periodically during the run, in between events,
+        every so many executed events and/or every so many seconds of wall-clock time
+        (whichever comes first). Each checkpoint replaces the previous one. Restoring it and
+        continuing the run results in the same execution as if the run had not been interrupted.
+        Calling it with path None disables automatic checkpoints.
+
+        :param path:            Checkpoint file path (None: disable)
+        :param every_events:    (Optional) Number of executed events between checkpoints
+        :param every_seconds:   (Optional) Wall-clock seconds between checkpoints
+        :param state:           (Optional) Model state object (must be picklable)
+        """
+
+        # Simulator must be in READY or PAUSED state
+        if self.__state not in Simulator._RUNNABLE_STATES:
+            raise ValueError(
+                "Checkpointing can only be configured when the state is READY or PAUSED "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        # Disable
+        if path is None:
+            self.__auto_checkpoint = None
+            return
+
+        # At least one positive interval
+        if every_events is None and every_seconds is None:
+            raise ValueError("Checkpoint interval must be specified in events and/or seconds")
+        if every_events is not None and (not isinstance(every_events, int) or every_events <= 0):
+            raise ValueError("Checkpoint event interval must be a positive integer")
+        if every_seconds is not None and (
+                not isinstance(every_seconds, (int, float)) or every_seconds <= 0
+        ):
+            raise ValueError("Checkpoint wall-clock interval must be a positive number")
+
+        self.__auto_checkpoint = (path, every_events, every_seconds, state)
+
+    def __write_checkpoint(self, path: str, state) -> None:
+        """
+        Write the checkpoint file (see checkpoint()).
+
+        :param path:    Checkpoint file path
+        :param state:   Model state object
+        """
+        header = (
+            Simulator.CHECKPOINT_FORMAT,
+            self.__now,
+            self.__event_id,
+            self.__final_end_time if self.__partial_run else self.__end_time,
+            self.__cancelled,
+            self.__last_dispatched(),
+            self.__dispatched_next_id,
+            self.__num_discarded,
+            random.getstate()
+        )
+        write_checkpoint(
+            path, self, header, state, self.__event_heap, Simulator.CHECKPOINT_CHUNK_SIZE
+        )
+
+    def restore(self, path: str):
+        """
+        Restore the simulator from a checkpoint file (see checkpoint()).
+
+        The simulator must be INIT, and becomes READY: calling run() continues the simulation
+        from the checkpoint. The state of the global random number generator is restored as well.
+        The event queue backend and validation setting are those of this simulator.
+
+        :param path:    Checkpoint file path
+
+        :return: Model state object passed when the checkpoint was written
+        """
+
+        # Simulator must be in INIT state
+        if self.__state != Simulator._State.INIT:
+            raise ValueError(
+                "Restoring can only be done when the state is INIT "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        try:
+            header, state = read_checkpoint(
+                path, self, Simulator.CHECKPOINT_FORMAT, self.__event_heap.push_many
+            )
+        except BaseException:
+            self.__event_heap.clear()
+            raise
+        (
+            _, now, event_id, end_time, cancelled, dispatched, dispatched_next_id,
+            num_discarded, random_state
+        ) = header
+
+        self.__now = now
+        self.__event_id = event_id
+        self.__end_time = end_time
+        self.__cancelled = cancelled
+        self.__dispatched = dispatched
+        self.__dispatched_next_id = dispatched_next_id
+        self.__scheduled_arrays = [
+            event[3].__self__ for event in self.__event_heap
+            if isinstance(getattr(event[3], "__self__", None), ScheduledArrays)
+        ]
+        self.__num_discarded = num_discarded
+        random.setstate(random_state)
+        self.__state = Simulator._State.READY
+        return state
+
+    def __run_heap_limited(self, heap: list, max_events: int) -> int:
+        """
+        Event loop operating directly on the list of the binary heap event queue,
+        which stops after a number of events.
+
+        :param heap:        List of the binary heap
+        :param max_events:  Maximum number of events to execute
+
+        :return: Number of events executed
+        """
+        cancelled = self.__cancelled
+        heappop = heapq.heappop
+        num_executed = 0
+        while heap and num_executed < max_events:
+            event = heappop(heap)
+            if self.__end_time is not None and event[0] >= self.__end_time:
+                heapq.heappush(heap, event)
+                break
+            if cancelled and event[2] in cancelled:
+                cancelled.remove(event[2])
+                self.__num_discarded += 1
+                continue
+            self.__now = event[0]
+            self.__dispatched = event
+            self.__dispatched_next_id = self.__event_id
+            if len(event) == 5:
+                event[3](*event[4])
+            else:
+                event[3](*event[4], **event[5])
+            if len(heap) > self.__peak_heap_size:
+                self.__peak_heap_size = len(heap)
+            num_executed += 1
+        return num_executed
+
+    async def run_async(
+            self,
+            chunk_events: int = 1000,
+            chunk_seconds: Union[float, None] = None
+    ) -> None:
+        """
+        Run the simulation (or continue it, if it is PAUSED) as a coroutine, which executes
+        the events in chunks and yields to the asyncio event loop in between.
+
+        A chunk is a number of events, or if a number of wall-clock seconds is given,
+        as many chunks of that number of events as fit in them. In between chunks the simulator
+        is PAUSED: other coroutines can schedule (and cancel) events, which are relative to the
+        current time (now). The run ends as with run(), once the end time is reached or there
+        are no more events. If the task is cancelled, the simulator remains PAUSED, such that
+        the run can be continued later. Other coroutines must not run the simulator meanwhile.
+
+        :param chunk_events:    (Optional; default: 1000) Number of events per chunk
+        :param chunk_seconds:   (Optional) Wall-clock seconds per chunk
+        """
+
+        # Simulator must be in READY or PAUSED state
+        if self.__state not in Simulator._RUNNABLE_STATES:
+            raise ValueError(
+                "Run can only be started when the state is READY or PAUSED "
+                "(current: " + str(self.__state.name) + ")"
+            )
+
+        # The chunk must be a positive number of events and optionally of seconds
+        if not isinstance(chunk_events, int) or chunk_events <= 0:
+            raise ValueError("Number of events per chunk must be a positive integer")
+        if chunk_seconds is not None and (
+                not isinstance(chunk_seconds, (int, float)) or chunk_seconds <= 0
+        ):
+            raise ValueError("Seconds per chunk must be a positive number")
+
+        while True:
+
+            # Chunk of events (with seconds, repeated until they have passed)
+            deadline = None if chunk_seconds is None else monotonic() + chunk_seconds
+            executed = self.step(chunk_events)
+            while (
+                    deadline is not None and executed == chunk_events
+                    and self.is_paused() and monotonic() < deadline
+            ):
+                executed = self.step(chunk_events)
+
+            # The run ends once the end time is reached or there are no more events
+            if self.is_finished():
+                return
+            if executed < chunk_events:
+                self.run()
+                return
+
+            # Yield to the event loop
+            await asyncio.sleep(0)
 
     def reset(self) -> None:
         """
@@ -269,9 +1563,22 @@ class Simulator:
         self.__state = Simulator._State.INIT
         self.__now = 0
         self.__event_id = 0
-        # Heap of 6-tuples: (time, priority, event_id, callback, args, kwargs)
-        self.__event_heap = []
+        self.__event_heap.clear()
+        self.__cancelled.clear()
+        self.__generation = object()
+        self.__dispatched = None
+        self.__dispatched_next_id = 0
         self.__end_time = None
+        self.__partial_run = False
+        self.__final_end_time = None
+        self.__auto_checkpoint = None
+        self.__trace_writer = None
+        self.__profiler = None
+        self.__num_discarded = 0
+        self.__peak_heap_size = 0
+        self.__wall_time = 0.0
+        self.__delay_histogram.clear()
+        self.__scheduled_arrays.clear()
 
     def now(self) -> int:
         """
@@ -303,6 +1610,16 @@ class Simulator:
         """
         return self.__state == Simulator._State.READY
 
+    def is_paused(self) -> bool:
+        """
+        Check whether the simulator is in PAUSED state (see run_until() and step()).
+        When the simulator is PAUSED, it is possible to schedule events.
+        The run can be continued by calling run_until(), step() or run().
+
+        :return: True iff the simulator is PAUSED
+        """
+        return self.__state == Simulator._State.PAUSED
+
     def is_running(self) -> bool:
         """
         Check whether the simulator is in RUNNING state.
@@ -336,6 +1653,75 @@ class Simulator:
         """
         return len(self.__event_heap)
 
+    def event_heap_live_size(self) -> int:
+        """
+        Retrieve the number of events in the event heap which have not been cancelled.
+
+        :return: Number of live events in the event heap
+        """
+        return len(self.__event_heap) - len(self.__cancelled)
+
+    def event_heap_cancelled_size(self) -> int:
+        """
+        Retrieve the number of cancelled events still in the event heap
+        (i.e., not yet skipped or removed by compaction).
+
+        :return: Number of cancelled events in the event heap
+        """
+        return len(self.__cancelled)
+
+    def next_event_time(self) -> Union[int, None]:
+        """
+        Retrieve the time of the next event in the event heap. This can be a cancelled event
+        which has not yet been skipped, thus it is a lower bound of the next live event time.
+
+        :return: Time of the next event, or None if the event heap is empty
+        """
+        next_event = self.__event_heap.peek()
+        return None if next_event is None else next_event[0]
+
+    def statistics(self) -> dict:
+        """
+        Retrieve the run statistics, which can be queried at any time (including during
+        the run, e.g., from within a callback). They are cleared by reset().
+
+        - events_scheduled: number of events scheduled
+        - events_executed: number of events executed
+        - events_discarded: number of cancelled events removed from the event heap
+        - peak_heap_size: largest size of the event heap (including cancelled events)
+        - wall_time: wall-clock seconds spent running
+        - events_per_second: events executed per wall-clock second spent running
+        - delay_histogram: list of the number of events scheduled per delay range, with index 0
+          for a delay of 0 and index i > 0 for a delay in [2^(i - 1), 2^i)
+
+        The delay histogram is a histogram of how far ahead events are scheduled, e.g.,
+        to choose an event queue backend. For restored simulators (see restore()),
+        only the event counts include those before the checkpoint.
+
+        :return: Dict of the statistics
+        """
+        event_heap_size = len(self.__event_heap)
+        self.__scheduled_arrays = [
+            scheduled for scheduled in self.__scheduled_arrays if scheduled.num_deferred() > 0
+        ]
+        num_deferred = sum(scheduled.num_deferred() for scheduled in self.__scheduled_arrays)
+        num_executed = self.__event_id - event_heap_size - num_deferred - self.__num_discarded
+        wall_time = self.__wall_time
+        if self.__run_start is not None:
+            wall_time += perf_counter() - self.__run_start
+        histogram = self.__delay_histogram
+        return {
+            "events_scheduled": self.__event_id,
+            "events_executed": num_executed,
+            "events_discarded": self.__num_discarded,
+            "peak_heap_size": max(self.__peak_heap_size, event_heap_size),
+            "wall_time": wall_time,
+            "events_per_second": num_executed / wall_time if wall_time > 0 else 0.0,
+            "delay_histogram": [
+                histogram[i] for i in range(max(histogram) + 1 if histogram else 0)
+            ]
+        }
+
 
 # Single global simulator
 simulator: Simulator = Simulator()
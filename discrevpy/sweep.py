@@ -0,0 +1,195 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Parameter sweeps with an on-disk result cache: each point of a parameter grid is run
+as an independent replication, and its result is cached under a key combining its
+parameters, its seed and a hash of the model code. Re-running a sweep thereby only
+runs the points which have changed.
+"""
+
+import os
+import json
+import pickle
+import inspect
+import hashlib
+import itertools
+from typing import Union, List, Tuple, Any
+from .replication import run_replications
+
+
+def parameter_grid(grid: dict) -> List[dict]:
+    """
+    Enumerate all combinations of the values of a parameter grid.
+
+    :param grid:    Parameter name to list of its values
+
+    :return: List of parameter dicts (the last parameter varying fastest)
+    """
+    names = list(grid.keys())
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+def model_version(setup) -> str:
+    """
+    Hash of the source code of the module in which the setup function is defined
+    (or of the setup function itself if the module source is not available).
+
+    :param setup:   Setup function
+
+    :return: Hexadecimal SHA-256 hash
+    """
+    try:
+        source = inspect.getsource(inspect.getmodule(setup))
+    except (TypeError, OSError):
+        try:
+            source = inspect.getsource(setup)
+        except (TypeError, OSError):
+            source = repr(setup.__code__.co_code)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def _json_value(value, encode):
+    """
+    Convert a parameter value into a JSON value, which is only done by the encode function
+    for values which are not JSON values themselves.
+
+    :param value:   Parameter value
+    :param encode:  Encode function (or None)
+
+    :return: JSON value
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    value_type = type(value)
+    if value_type is list:
+        return [_json_value(item, encode) for item in value]
+    if value_type is dict and all(isinstance(key, str) for key in value):
+        return {key: _json_value(item, encode) for key, item in value.items()}
+    if encode is None:
+        raise ValueError(
+            "Parameter value is not a JSON value (pass an encode function): " + repr(value)
+        )
+
+    # Tagged with its type, such that it is distinct from any JSON value
+    return {
+        "type": type(value).__module__ + "." + type(value).__qualname__,
+        "encoded": _json_value(encode(value), None)
+    }
+
+
+def cache_key(parameters: dict, version: str, encode=None) -> str:
+    """
+    Cache key of the result of a point.
+
+    The parameter values must be JSON values (None, booleans, numbers, strings, and lists
+    and dicts with string keys of these), such that distinct values have distinct keys which
+    are the same in every run. Any other value (e.g., a tuple, which JSON does not distinguish
+    from a list) is converted by the encode function into a JSON value identifying it.
+
+    :param parameters:  Parameters of the point (including "seed")
+    :param version:     Model version
+    :param encode:      (Optional) Encode function: encode(value) -> JSON value
+                        (if not given, a value which is not a JSON value is rejected)
+
+    :return: Hexadecimal SHA-256 hash
+    """
+    encoded = json.dumps([_json_value(parameters, encode), version], sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def run_sweep(
+        setup,
+        grid: dict,
+        cache_dir: str,
+        seeds: Union[list, None] = None,
+        num_workers: Union[int, None] = None,
+        version: Union[str, None] = None,
+        encode=None
+) -> List[Tuple[dict, Any]]:
+    """
+    Run a parameter sweep, serving unchanged points from the cache.
+
+    Every combination of the grid is run once for each seed, as a replication with the
+    parameters of the combination and the seed (see run_replications()). The result of each
+    point is stored in the cache directory as soon as it completes, such that an interrupted
+    sweep is resumed where it left off. By default the model version is the hash of the module
+    source of the setup function (see model_version()): if the model spans multiple modules,
+    pass an explicit version which changes whenever the model does.
+
+    :param setup:           Setup function: setup(simulator, parameters) -> result object
+    :param grid:            Parameter name to list of its values
+    :param cache_dir:       Directory in which results are cached (created if it does not exist)
+    :param seeds:           (Optional; default: [0]) Seeds with which each combination is run
+    :param num_workers:     (Optional; default: number of CPUs) Number of worker processes
+    :param version:         (Optional; default: model_version(setup)) Model version
+    :param encode:          (Optional) Encode function of the parameter values which are
+                            not JSON values (see cache_key())
+
+    :return: List of (parameters, result) in grid order (for each combination, in seed order)
+    """
+
+    # The grid must map parameter names to lists of values, not including the seed
+    if not isinstance(grid, dict):
+        raise ValueError("Grid must be a dict of parameter name to list of values")
+    if "seed" in grid:
+        raise ValueError("Grid cannot contain the seed: pass it via seeds instead")
+    if seeds is None:
+        seeds = [0]
+    if version is None:
+        version = model_version(setup)
+
+    # All points with their cache file
+    points = [
+        dict(parameters, seed=seed)
+        for parameters in parameter_grid(grid)
+        for seed in seeds
+    ]
+    paths = [
+        os.path.join(cache_dir, cache_key(point, version, encode) + ".pickle") for point in points
+    ]
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Cached results
+    results = [None] * len(points)
+    missing = []
+    for index, path in enumerate(paths):
+        if os.path.isfile(path):
+            with open(path, "rb") as file:
+                results[index] = pickle.load(file)
+        else:
+            missing.append(index)
+
+    # Run the missing points, caching each result as it completes
+    # (written to a temporary file first such that the cache never holds a partial result)
+    for missing_index, result in run_replications(setup, [points[i] for i in missing], num_workers):
+        index = missing[missing_index]
+        results[index] = result
+        temporary_path = paths[index] + ".tmp"
+        with open(temporary_path, "wb") as file:
+            pickle.dump(result, file)
+        os.replace(temporary_path, paths[index])
+
+    return list(zip(points, results))
@@ -0,0 +1,272 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Binary event trace: while tracing, the simulator writes a fixed-size record
+(time, priority, event_id, callback id) for each executed event into a
+memory-mapped ring buffer file, which can be decoded into arrays afterwards.
+"""
+
+import sys
+import mmap
+import json
+import struct
+from array import array
+from types import ModuleType, CodeType
+
+
+class CallbackWrapper:
+    """
+    Base class of the objects of which a method inserted into the event heap executes a
+    callback of the model (e.g., a periodic event handle, or a process). For reporting,
+    the events of such a method are attributed to that callback (see callback_function()).
+    """
+
+    __slots__ = ()
+
+    def _wrapped_callback(self, function):
+        """
+        Retrieve the callback of the model which a method executes (only to be called by
+        callback_function()).
+
+        :param function:    Function of the method
+
+        :return: Callback (or, for a process, the code of its generator),
+                 None if the method does not execute one
+        """
+        raise NotImplementedError
+
+
+def callback_name(function) -> str:
+    """
+    Name of a callback function (or other callable) for reporting.
+
+    :param function:    Function (or other callable)
+
+    :return: Qualified name including module if available, else its representation
+    """
+    name = getattr(function, "__qualname__", None)
+    if name is None:
+        if isinstance(function, CodeType):
+            return getattr(function, "co_qualname", function.co_name)
+        return repr(function)
+    module = getattr(function, "__module__", None)
+    return name if module is None else module + "." + name
+
+
+def callback_function(callback):
+    """
+    Function of a callback for reporting: bound methods of the same function share it.
+    For a method of a built-in type (e.g., list.append) this is the method of the type.
+    For a method which executes a callback of the model (see CallbackWrapper) this is
+    the function of that callback, or the code of the generator of a process.
+
+    :param callback:    Callback
+
+    :return: Function (or other callable)
+    """
+    function = getattr(callback, "__func__", None)
+    if function is not None:
+        owner = callback.__self__
+        if isinstance(owner, CallbackWrapper):
+            wrapped = owner._wrapped_callback(function)  # pylint: disable=protected-access
+            if wrapped is not None:
+                return callback_function(wrapped)
+        return function
+    owner = getattr(callback, "__self__", None)
+    if owner is not None and not isinstance(owner, ModuleType):
+        function = getattr(type(owner), getattr(callback, "__name__", ""), None)
+        if function is not None:
+            return function
+    return callback
+
+
+class TraceWriter:
+    """
+    Writer of a binary event trace into a memory-mapped file holding a ring buffer
+    of fixed-size records: once it is full, the oldest records are overwritten.
+
+    The file consists of a header, followed by the ring buffer of records, followed
+    (once closed) by the names of the callbacks as JSON. Records are written directly
+    into the memory map: the header (with the number of records written) and the
+    callback names are only written on flush() and close().
+    """
+
+    # File format identifier
+    MAGIC = b"DRVTRACE"
+
+    # Header: magic, record size, capacity (number of records), number of records written
+    HEADER = struct.Struct("<8sqqq")
+
+    # Record: time, priority, event identifier, callback identifier
+    RECORD = struct.Struct("<qqqq")
+
+    def __init__(self, path: str, capacity: int = 1 << 20) -> None:
+        """
+        Initializes a trace writer, creating (or overwriting) the trace file.
+
+        :param path:        Trace file path
+        :param capacity:    (Optional; default: 2^20) Number of records in the ring buffer
+        """
+
+        # The capacity must be a positive integer
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("Capacity must be a positive integer")
+
+        self.__capacity = capacity
+        self.__count = 0
+        self.__callback_ids = {}  # Identity of the function to callback identifier
+        self.__callback_functions = []
+        self.__callback_names = []
+        self.__file = open(path, "w+b")  # pylint: disable=consider-using-with
+        self.__file.truncate(TraceWriter.HEADER.size + capacity * TraceWriter.RECORD.size)
+        self.__map = mmap.mmap(self.__file.fileno(), 0)
+        self.__pack_into = TraceWriter.RECORD.pack_into
+        self.__end = TraceWriter.HEADER.size + capacity * TraceWriter.RECORD.size
+        self.__offset = TraceWriter.HEADER.size
+        self.flush()
+
+    def record(self, time: int, priority: int, event_id: int, callback) -> None:
+        """
+        Write the record of an executed event (called by the simulator).
+
+        :param time:        Time
+        :param priority:    Priority
+        :param event_id:    Event identifier
+        :param callback:    Callback
+        """
+
+        # Callbacks are identified by their function (bound methods of the same function share it)
+        function = callback_function(callback)
+        callback_id = self.__callback_ids.get(id(function))
+        if callback_id is None:
+            callback_id = self.__register(function)
+
+        try:
+            self.__pack_into(self.__map, self.__offset, time, priority, event_id, callback_id)
+        except struct.error:
+            raise ValueError(  # pylint: disable=raise-missing-from
+                "Time and priority must fit in a 64-bit signed integer"
+            )
+        self.__offset += TraceWriter.RECORD.size
+        if self.__offset == self.__end:
+            self.__offset = TraceWriter.HEADER.size
+        self.__count += 1
+
+    def __register(self, function) -> int:
+        """
+        Assign the next callback identifier to a function.
+
+        :param function:    Function (or other callable)
+
+        :return: Callback identifier
+        """
+        callback_id = len(self.__callback_names)
+        self.__callback_ids[id(function)] = callback_id
+        self.__callback_functions.append(function)  # Such that its identity is not reused
+        self.__callback_names.append(callback_name(function))
+        return callback_id
+
+    def count(self) -> int:
+        """
+        Retrieve the number of records written (including those which have been overwritten).
+
+        :return: Number of records written
+        """
+        return self.__count
+
+    def flush(self) -> None:
+        """
+        Write the header and flush the memory map to the file.
+        """
+        TraceWriter.HEADER.pack_into(
+            self.__map, 0, TraceWriter.MAGIC, TraceWriter.RECORD.size, self.__capacity, self.__count
+        )
+        self.__map.flush()
+
+    def close(self) -> None:
+        """
+        Flush and close the trace file, appending the callback names.
+        """
+        if self.__map.closed:
+            return
+        self.flush()
+        self.__map.close()
+        self.__file.seek(self.__end)
+        self.__file.write(json.dumps(self.__callback_names).encode("utf-8"))
+        self.__file.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+        self.close()
+
+
+def read_trace(path: str) -> dict:
+    """
+    Decode a trace file (see TraceWriter) into arrays, in the order the events were executed.
+    If the ring buffer wrapped around, only the most recent records are present.
+
+    The arrays are of type array.array("q"), which can be converted without copying into
+    other array types supporting the buffer protocol (e.g., numpy.frombuffer(a, dtype="int64")).
+
+    :param path:    Trace file path
+
+    :return: Dict with "time", "priority", "event_id" and "callback_id" arrays,
+             "callbacks" (list of callback names, indexed by callback identifier)
+             and "count" (number of records written, including overwritten ones)
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    # Header
+    if len(data) < TraceWriter.HEADER.size:
+        raise ValueError("Not a trace file: " + str(path))
+    magic, record_size, capacity, count = TraceWriter.HEADER.unpack_from(data, 0)
+    if magic != TraceWriter.MAGIC or record_size != TraceWriter.RECORD.size:
+        raise ValueError("Not a trace file: " + str(path))
+
+    # Callback names (only present once closed)
+    end = TraceWriter.HEADER.size + capacity * record_size
+    callbacks = json.loads(data[end:].decode("utf-8")) if len(data) > end else []
+
+    # Records, rotated such that the oldest comes first
+    start = TraceWriter.HEADER.size
+    values = array("q")
+    if count <= capacity:
+        values.frombytes(data[start:start + count * record_size])
+    else:
+        split = start + (count % capacity) * record_size
+        values.frombytes(data[split:end])
+        values.frombytes(data[start:split])
+    if sys.byteorder != "little":
+        values.byteswap()
+
+    return {
+        "time": values[0::4],
+        "priority": values[1::4],
+        "event_id": values[2::4],
+        "callback_id": values[3::4],
+        "callbacks": callbacks,
+        "count": count
+    }
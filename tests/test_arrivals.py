@@ -0,0 +1,135 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+import random
+from discrevpy import (
+    simulator, Simulator, Poisson, Deterministic, Pareto, Empirical, replication_seed
+)
+
+
+def arrival_times(distribution, seed, count, batch_size=1024, start=0):
+    times = []
+    sim = Simulator()
+    sim.ready()
+    sim.schedule_arrivals(
+        distribution, seed, 0, lambda: times.append(sim.now()),
+        start=start, count=count, batch_size=batch_size
+    )
+    sim.run()
+    return times
+
+
+class TestArrivals(unittest.TestCase):
+
+    def test_deterministic(self):
+        self.assertEqual(arrival_times(Deterministic(10), 0, 5, start=3), [13, 23, 33, 43, 53])
+        self.assertEqual(arrival_times(Deterministic(2.5), 0, 4), [2, 5, 8, 10])
+
+    def test_reproducible(self):
+        for distribution in (Poisson(0.01), Pareto(1.5, 20), Empirical([3, 50, 7])):
+            times = arrival_times(distribution, 42, 3000)
+            self.assertEqual(len(times), 3000)
+            self.assertEqual(times, sorted(times))
+            self.assertEqual(arrival_times(distribution, 42, 3000), times)
+            self.assertEqual(arrival_times(distribution, 42, 3000, batch_size=7), times)
+            self.assertNotEqual(arrival_times(distribution, replication_seed(42, 1), 3000), times)
+
+    def test_distributions(self):
+        times = arrival_times(Poisson(0.01), 1, 20000)
+        self.assertAlmostEqual(times[-1] / 20000, 100, delta=3)
+        times = arrival_times(Pareto(2.5, 100), 2, 5000)
+        gaps = [b - a for a, b in zip([0] + times, times)]
+        self.assertGreaterEqual(min(gaps), 100)
+        self.assertAlmostEqual(sum(gaps) / len(gaps), 2.5 * 100 / 1.5, delta=10)
+        times = arrival_times(Empirical([5, 20], weights=[3, 1]), 3, 4000)
+        gaps = [b - a for a, b in zip([0] + times, times)]
+        self.assertEqual(set(gaps), {5, 20})
+        self.assertAlmostEqual(gaps.count(5) / len(gaps), 0.75, delta=0.03)
+
+    def test_single_pending_event(self):
+        heap_sizes = []
+        state = random.getstate()
+
+        def arrival(name):
+            heap_sizes.append(simulator.event_heap_size())
+
+        simulator.ready()
+        first = simulator.schedule_arrivals(Poisson(0.1), 1, 0, arrival, "a")
+        second = simulator.schedule_arrivals(Poisson(0.2), 2, 0, arrival, "b", count=10)
+        simulator.end(10000)
+        simulator.run()
+        self.assertTrue(all(size <= 2 for size in heap_sizes))
+        self.assertEqual(second.num_arrivals(), 10)
+        self.assertAlmostEqual(first.num_arrivals(), 1000, delta=120)
+        self.assertGreaterEqual(first.time(), 10000)
+        self.assertEqual(random.getstate(), state)  # Global random module is not used
+        simulator.reset()
+
+    def test_cancel(self):
+        times = []
+
+        def arrival():
+            times.append(simulator.now())
+            if len(times) == 3:
+                self.assertTrue(source.cancel())
+                self.assertFalse(source.cancel())
+
+        simulator.ready()
+        source = simulator.schedule_arrivals(Deterministic(7), 0, 0, arrival)
+        simulator.run()
+        self.assertEqual(times, [7, 14, 21])
+        self.assertTrue(source.is_cancelled())
+        self.assertEqual(simulator.event_heap_size(), 0)
+        simulator.reset()
+
+        simulator.ready()
+        source = simulator.schedule_arrivals(Deterministic(7), 0, 0, arrival, count=2)
+        simulator.run()
+        self.assertFalse(source.cancel())
+        self.assertFalse(source.is_cancelled())
+        simulator.reset()
+
+    def test_invalid(self):
+        for create in (
+                lambda: Poisson(0), lambda: Deterministic(-1), lambda: Pareto(0, 1),
+                lambda: Pareto(1, 0), lambda: Empirical([]), lambda: Empirical([0, 0]),
+                lambda: Empirical([1, 2], weights=[1])
+        ):
+            with self.assertRaises(ValueError):
+                create()
+        sim = Simulator()
+        with self.assertRaises(ValueError):
+            sim.schedule_arrivals(Poisson(1), 0, 0, print)
+        sim.ready()
+        for args, kwargs in (
+                ((1, 0, 0, print), {}),
+                ((Poisson(1), 0.5, 0, print), {}),
+                ((Poisson(1), 0, 0.5, print), {}),
+                ((Poisson(1), 0, 0, 5), {}),
+                ((Poisson(1), 0, 0, print), {"start": -1}),
+                ((Poisson(1), 0, 0, print), {"count": 0}),
+                ((Poisson(1), 0, 0, print), {"batch_size": 0}),
+        ):
+            with self.assertRaises(ValueError):
+                sim.schedule_arrivals(*args, **kwargs)
+        self.assertEqual(sim.event_heap_size(), 0)
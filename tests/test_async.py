@@ -0,0 +1,129 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import unittest
+from discrevpy import Simulator, LadderEventQueue
+
+
+def chain_model(simulator, result, n):
+
+    def tick(i):
+        result.append((simulator.now(), i))
+        if i < n:
+            simulator.schedule(1, tick, i + 1)
+
+    simulator.schedule(0, tick, 0)
+
+
+class TestAsync(unittest.TestCase):
+
+    def test_run_async(self):
+        for event_queue in [None, LadderEventQueue()]:
+            expected = []
+            simulator = Simulator()
+            simulator.ready()
+            chain_model(simulator, expected, 5000)
+            simulator.run()
+
+            simulator = Simulator(event_queue)
+            result = []
+            simulator.ready()
+            chain_model(simulator, result, 5000)
+            yields = []
+
+            async def other():
+                while not simulator.is_finished():
+                    yields.append(simulator.now())
+                    await asyncio.sleep(0)
+
+            async def main():
+                await asyncio.gather(simulator.run_async(chunk_events=100), other())
+
+            asyncio.run(main())
+            self.assertTrue(simulator.is_finished())
+            self.assertEqual(result, expected)
+            self.assertGreaterEqual(len(yields), 50)
+            self.assertEqual(yields[:2], [99, 199])
+
+    def test_concurrent_scheduling(self):
+        simulator = Simulator()
+        result = []
+        simulator.ready()
+        chain_model(simulator, result, 1000)
+        simulator.end(2000)
+
+        async def feeder():
+            for _ in range(5):
+                if simulator.is_paused():
+                    simulator.schedule(0, result.append, ("fed", simulator.now()))
+                await asyncio.sleep(0)
+
+        async def main():
+            await asyncio.gather(simulator.run_async(chunk_events=50), feeder())
+
+        asyncio.run(main())
+        self.assertTrue(simulator.is_finished())
+        self.assertEqual(simulator.now(), 2000)
+        fed = [entry for entry in result if entry[0] == "fed"]
+        self.assertEqual(len(fed), 5)
+        self.assertEqual(fed[0], ("fed", 49))
+        self.assertEqual(result[result.index(fed[0]) - 1], (49, 49))
+        self.assertEqual(result[result.index(fed[0]) + 1], (50, 50))
+
+    def test_chunk_seconds(self):
+        simulator = Simulator()
+        result = []
+        simulator.ready()
+        chain_model(simulator, result, 3000)
+        asyncio.run(simulator.run_async(chunk_events=10, chunk_seconds=0.001))
+        self.assertEqual(len(result), 3001)
+
+    def test_cancel(self):
+        simulator = Simulator()
+        result = []
+        simulator.ready()
+        chain_model(simulator, result, 10000)
+
+        async def main():
+            task = asyncio.ensure_future(simulator.run_async(chunk_events=100))
+            for _ in range(3):
+                await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        self.assertTrue(simulator.is_paused())
+        self.assertTrue(0 < len(result) < 10001)
+        simulator.run()
+        self.assertEqual([i for _, i in result], list(range(10001)))
+
+    def test_invalid(self):
+        simulator = Simulator()
+        with self.assertRaises(ValueError):
+            asyncio.run(simulator.run_async())
+        simulator.ready()
+        with self.assertRaises(ValueError):
+            asyncio.run(simulator.run_async(chunk_events=0))
+        with self.assertRaises(ValueError):
+            asyncio.run(simulator.run_async(chunk_seconds=0))
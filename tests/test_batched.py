@@ -0,0 +1,134 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import unittest
+import tempfile
+from discrevpy import simulator, BatchedCallback, TraceWriter, read_trace, CallbackProfiler
+
+
+class TestBatched(unittest.TestCase):
+
+    def test_batched(self):
+        result = []
+
+        def update(batch):
+            result.append((simulator.now(), "update", batch))
+
+        def other(value):
+            result.append((simulator.now(), "other", value))
+
+        batched_update = simulator.batched(update)
+        self.assertIsInstance(batched_update, BatchedCallback)
+        self.assertIs(batched_update.handler(), update)
+        simulator.ready()
+        for flow in range(4):
+            simulator.schedule(10, batched_update, flow, flow * 2)
+        simulator.schedule(10, other, "a")
+        simulator.schedule(10, batched_update, 4, 8)
+        simulator.schedule_with_priority(10, -1, other, "b")
+        simulator.schedule_with_priority(10, 1, batched_update, 5, 10)
+        simulator.schedule(20, batched_update, 6, 12)
+        simulator.run()
+        simulator.reset()
+        self.assertEqual(result, [
+            (10, "other", "b"),
+            (10, "update", [(0, 0), (1, 2), (2, 4), (3, 6)]),
+            (10, "other", "a"),
+            (10, "update", [(4, 8), (5, 10)]),
+            (20, "update", [(6, 12)]),
+        ])
+
+    def test_batched_skips_cancelled(self):
+        result = []
+        simulator.ready()
+        batched_append = simulator.batched(result.append)
+        simulator.schedule(5, batched_append, 1)
+        simulator.schedule(5, print, "cancelled").cancel()
+        simulator.schedule(5, batched_append, 2)
+        simulator.schedule(5, batched_append, 3).cancel()
+        simulator.schedule_many([(5, 0, batched_append, (4,))])
+        simulator.schedule(5, len, "")
+        simulator.schedule(5, batched_append, 5)
+        simulator.run()
+        self.assertEqual(simulator.event_heap_cancelled_size(), 0)
+        simulator.reset()
+        self.assertEqual(result, [[(1,), (2,), (4,)], [(5,)]])
+
+    def test_batched_scheduling_during_batch(self):
+        result = []
+
+        def handler(batch):
+            result.append((simulator.now(), batch))
+            if len(result) == 1:
+                # Scheduled after the batch was drained, so is part of a new batch
+                simulator.schedule(0, batched_handler, "later")
+
+        batched_handler = simulator.batched(handler)
+        simulator.ready()
+        simulator.schedule(0, batched_handler, "a")
+        simulator.schedule(0, batched_handler, "b")
+        simulator.run()
+        simulator.reset()
+        self.assertEqual(result, [(0, [("a",), ("b",)]), (0, [("later",)])])
+
+    def test_batched_traced_and_profiled(self):
+        result = []
+        batched_append = simulator.batched(result.append)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "batched.trace")
+            profiler = CallbackProfiler()
+            simulator.ready()
+            with TraceWriter(path, 100) as writer:
+                simulator.trace(writer)
+                simulator.profile(profiler)
+                for i in range(3):
+                    simulator.schedule(1, batched_append, i)
+                simulator.schedule(1, len, "")
+                simulator.schedule(1, batched_append, 3)
+                simulator.run()
+                self.assertEqual(writer.count(), 5)
+            simulator.reset()
+            trace = read_trace(path)
+        self.assertEqual(result, [[(0,), (1,), (2,)], [(3,)]])
+        self.assertEqual(list(trace["event_id"]), [0, 1, 2, 3, 4])
+        self.assertEqual(list(trace["callback_id"]), [0, 0, 0, 1, 0])
+        counts = sorted(result[1] for result in profiler.results())
+        self.assertEqual(counts, [1, 4])
+
+    def test_invalid(self):
+        try:
+            simulator.batched(5)
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Handler must be a function or a method")
+        simulator.ready()
+        try:
+            simulator.schedule(1, simulator.batched(print), 1, end="")
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(
+                str(e), "Events of a batched callback cannot have keyword arguments"
+            )
+        self.assertEqual(simulator.event_heap_size(), 0)
+        simulator.run()
+        simulator.reset()
@@ -0,0 +1,219 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+from discrevpy import (
+    simulator, Simulator, EventHandle, CalendarEventQueue, LadderEventQueue, ArrayEventQueue,
+    PooledEventQueue, Deterministic
+)
+
+
+class TestCancel(unittest.TestCase):
+
+    def test_cancel_before_run(self):
+        result = []
+        simulator.ready()
+        handle_a = simulator.schedule(10, result.append, "a")
+        handle_b = simulator.schedule_with_priority(20, -5, result.append, "b")
+        simulator.schedule(30, result.append, "c")
+        self.assertIsInstance(handle_a, EventHandle)
+        self.assertEqual(handle_b.time(), 20)
+        self.assertEqual(handle_b.event_id(), 1)
+        self.assertTrue(handle_b.cancel())
+        self.assertFalse(handle_b.cancel())
+        self.assertFalse(simulator.cancel(handle_b))
+        self.assertEqual(simulator.event_heap_size(), 3)
+        self.assertEqual(simulator.event_heap_live_size(), 2)
+        self.assertEqual(simulator.event_heap_cancelled_size(), 1)
+        simulator.run()
+        self.assertEqual(result, ["a", "c"])
+        self.assertEqual(simulator.event_heap_size(), 0)
+        self.assertEqual(simulator.event_heap_cancelled_size(), 0)
+        simulator.reset()
+
+    def test_cancel_in_event(self):
+        result = []
+        handles = {}
+
+        def timeout(name):
+            result.append((simulator.now(), "timeout", name))
+
+        def ack(name):
+            result.append((simulator.now(), "ack", name))
+            self.assertTrue(handles[name].cancel())
+
+        def executed_already():
+            self.assertFalse(handles["a"].cancel())
+            self.assertFalse(handles["a"].is_cancelled())
+
+        simulator.ready()
+        handles["a"] = simulator.schedule(100, timeout, "a")
+        handles["b"] = simulator.schedule(100, timeout, "b")
+        simulator.schedule(50, ack, "b")
+        simulator.schedule(150, executed_already)
+        simulator.end(1000)
+        simulator.run()
+        self.assertEqual(result, [(50, "ack", "b"), (100, "timeout", "a")])
+        simulator.reset()
+
+    def test_cancel_in_same_time_moment(self):
+        for event_queue in [
+            None, CalendarEventQueue(), LadderEventQueue(), ArrayEventQueue(), PooledEventQueue()
+        ]:
+            sim = Simulator(event_queue)
+            result = []
+            handles = {}
+
+            def timeout(name):
+                result.append((sim.now(), "timeout", name))
+
+            def ack(name):
+                result.append((sim.now(), "ack", name))
+
+                # The timer already executed in this time moment: nothing is left to cancel
+                self.assertFalse(handles[name].cancel())
+                self.assertFalse(handles[name].is_cancelled())
+
+                # Still pending in this time moment: scheduled after it (even if ordered
+                # before it), or ordered after it
+                self.assertTrue(sim.schedule_with_priority(0, -1, timeout, "new").cancel())
+                self.assertTrue(handles["last"].cancel())
+
+            sim.ready()
+            handles["a"] = sim.schedule(100, timeout, "a")
+            sim.schedule(100, ack, "a")
+            handles["last"] = sim.schedule_with_priority(100, 1, timeout, "last")
+            sim.end(1000)
+            sim.run()
+            self.assertEqual(result, [(100, "timeout", "a"), (100, "ack", "a")])
+            self.assertEqual(sim.event_heap_size(), 0)
+            self.assertEqual(sim.event_heap_cancelled_size(), 0)
+            self.assertEqual(sim.statistics()["events_executed"], 2)
+
+            # Also when paused in between (after a single step of the event loop)
+            sim.reset()
+            sim.ready()
+            handle = sim.schedule(100, timeout, "a")
+            pending = sim.schedule(100, timeout, "b")
+            sim.step()
+            self.assertFalse(handle.cancel())
+            self.assertTrue(pending.cancel())
+            sim.end(1000)
+            sim.run()
+            self.assertEqual(sim.event_heap_live_size(), 0)
+            self.assertEqual(sim.event_heap_cancelled_size(), 0)
+            sim.reset()
+
+    def test_cancelled_after_end(self):
+        simulator.ready()
+        simulator.schedule(50, print, "not executed")
+        handle = simulator.schedule(60, print, "not executed")
+        handle.cancel()
+        simulator.end(10)
+        simulator.run()
+        self.assertEqual(simulator.event_heap_size(), 2)
+        self.assertEqual(simulator.event_heap_live_size(), 1)
+        self.assertEqual(simulator.event_heap_cancelled_size(), 1)
+        simulator.reset()
+        self.assertEqual(simulator.event_heap_size(), 0)
+        self.assertEqual(simulator.event_heap_cancelled_size(), 0)
+
+    def test_cancel_after_reset(self):
+        result = []
+        simulator.ready()
+        handle = simulator.schedule(5, result.append, "first run")
+        periodic = simulator.schedule_periodic(10, 0, result.append, "periodic")
+        source = simulator.schedule_arrivals(Deterministic(10), 1, 0, result.append, "arrival")
+        simulator.end(1)
+        simulator.run()
+        simulator.reset()
+
+        # The handles of the earlier run refer to the same (time, priority, event_id)
+        # as the new events, yet do not cancel them
+        simulator.ready()
+        simulator.schedule(5, result.append, "a")
+        simulator.schedule(10, result.append, "b")
+        simulator.schedule(10, result.append, "c")
+        self.assertFalse(handle.cancel())
+        self.assertFalse(handle.is_cancelled())
+        self.assertFalse(periodic.cancel())
+        self.assertFalse(source.cancel())
+        self.assertEqual(simulator.event_heap_cancelled_size(), 0)
+        simulator.run()
+        simulator.reset()
+        self.assertEqual(result, ["a", "b", "c"])
+
+    def test_compaction(self):
+        for event_queue in [None, CalendarEventQueue(), LadderEventQueue(), ArrayEventQueue()]:
+            sim = Simulator(event_queue)
+            result = []
+            sim.ready()
+            handles = [sim.schedule(i % 100, result.append, i) for i in range(2000)]
+
+            # Cancel just below the compaction ratio
+            for i in range(999):
+                self.assertTrue(handles[2 * i].cancel())
+            self.assertEqual(sim.event_heap_size(), 2000)
+            self.assertEqual(sim.event_heap_cancelled_size(), 999)
+
+            # Reaching the compaction ratio removes all cancelled events
+            self.assertTrue(handles[1998].cancel())
+            self.assertEqual(sim.event_heap_size(), 1000)
+            self.assertEqual(sim.event_heap_cancelled_size(), 0)
+            self.assertEqual(sim.event_heap_live_size(), 1000)
+
+            # A compacted event is still known as cancelled
+            self.assertTrue(handles[1998].is_cancelled())
+            self.assertFalse(handles[1998].cancel())
+            self.assertEqual(sim.event_heap_cancelled_size(), 0)
+            self.assertFalse(handles[1].is_cancelled())
+            sim.run()
+            self.assertEqual(result, sorted(range(1, 2000, 2), key=lambda i: (i % 100, i)))
+            sim.reset()
+
+    def test_compact_manually(self):
+        simulator.ready()
+        handle = simulator.schedule(5, print, "not executed")
+        simulator.schedule(6, len, "")
+        handle.cancel()
+        simulator.compact()
+        self.assertEqual(simulator.event_heap_size(), 1)
+        self.assertEqual(simulator.event_heap_cancelled_size(), 0)
+        simulator.run()
+        simulator.reset()
+
+    def test_invalid(self):
+        simulator.ready()
+        handle = simulator.schedule(5, print, "not executed")
+        try:
+            simulator.cancel(5)
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Handle must be an EventHandle")
+        simulator.end(1)
+        simulator.run()
+        try:
+            handle.cancel()
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Cancelling can only be done when the state is READY, RUNNING or PAUSED (current: FINISHED)")
+        simulator.reset()
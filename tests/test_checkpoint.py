@@ -0,0 +1,264 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import pickle
+import random
+import unittest
+import tempfile
+from discrevpy import Simulator, LadderEventQueue, ArrayEventQueue
+
+
+class Crash(Exception):
+    pass
+
+
+class QueueModel:
+
+    def __init__(self, simulator, seed, crash_after=None):
+        self.simulator = simulator
+        self.rng = random.Random(seed)
+        self.trace = []
+        self.crash_after = crash_after
+        self.timeout = None
+
+    def start(self):
+        self.simulator.schedule(0, self.arrival, 0)
+        self.simulator.schedule_periodic(1000, -1, self.sample)
+
+    def arrival(self, customer):
+        self.trace.append(("arrival", self.simulator.now(), customer))
+        if self.crash_after is not None and len(self.trace) >= self.crash_after:
+            raise Crash()
+        self.simulator.schedule(self.rng.randint(1, 100), self.arrival, customer + 1)
+        self.simulator.schedule_with_priority(
+            random.randint(1, 150), 2, self.departure, customer, note=random.random()
+        )
+        if self.timeout is not None:
+            self.timeout.cancel()
+        self.timeout = self.simulator.schedule(120, self.departure, -1, note=0.0)
+
+    def departure(self, customer, note):
+        self.trace.append(("departure", self.simulator.now(), customer, note))
+
+    def sample(self):
+        self.trace.append(("sample", self.simulator.now(), self.simulator.event_heap_size()))
+
+
+class Collector:
+
+    def __init__(self):
+        self.items = []
+        self.payload = list(range(1000000))
+
+    def collect(self, item):
+        self.items.append(item)
+
+
+def increment(counter):
+    counter[0] += 1
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def uninterrupted_trace(self):
+        random.seed(77)
+        simulator = Simulator()
+        model = QueueModel(simulator, 123)
+        simulator.ready()
+        model.start()
+        simulator.end(50000)
+        simulator.run()
+        return model.trace
+
+    def test_resume_after_crash(self):
+        expected = self.uninterrupted_trace()
+
+        for event_queue in [None, LadderEventQueue(), ArrayEventQueue()]:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "run.checkpoint")
+
+                # Crashes after about half of the events, with a checkpoint every 100 events
+                random.seed(77)
+                simulator = Simulator()
+                model = QueueModel(simulator, 123, crash_after=len(expected) // 2)
+                simulator.ready()
+                model.start()
+                simulator.end(50000)
+                simulator.auto_checkpoint(path, every_events=100, state=model)
+                with self.assertRaises(Crash):
+                    simulator.run()
+                self.assertFalse(os.path.exists(path + ".tmp"))
+
+                # Restore into a fresh simulator and continue
+                random.seed(999)  # Restored from the checkpoint
+                resumed = Simulator(event_queue)
+                model = resumed.restore(path)
+                self.assertTrue(resumed.is_ready())
+                self.assertIs(model.simulator, resumed)
+                self.assertLess(len(model.trace), len(expected) // 2)
+                self.assertGreater(resumed.now(), 0)
+                model.crash_after = None
+                resumed.run()
+                self.assertEqual(resumed.now(), 50000)
+                self.assertEqual(model.trace, expected)
+
+    def test_auto_checkpoint_during_run_until(self):
+        expected = self.uninterrupted_trace()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.checkpoint")
+
+            # The last checkpoint is written while running up to the intermediate time
+            random.seed(77)
+            simulator = Simulator()
+            model = QueueModel(simulator, 123)
+            simulator.ready()
+            model.start()
+            simulator.end(50000)
+            simulator.auto_checkpoint(path, every_events=5, state=model)
+            simulator.run_until(20000)
+
+            # The end time in the checkpoint is the final one, not the intermediate one
+            resumed = Simulator()
+            model = resumed.restore(path)
+            self.assertLess(resumed.now(), 20000)
+            resumed.run()
+            self.assertEqual(resumed.now(), 50000)
+            self.assertEqual(model.trace, expected)
+
+    def test_checkpoint_when_ready(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ready.checkpoint")
+            random.seed(77)
+            simulator = Simulator()
+            model = QueueModel(simulator, 123)
+            simulator.ready()
+            model.start()
+            cancelled = simulator.schedule(10, model.departure, 5, note=1.0)
+            simulator.cancel(cancelled)
+            simulator.end(50000)
+            simulator.checkpoint(path, model)
+
+            resumed = Simulator()
+            restored = resumed.restore(path)
+            self.assertEqual(resumed.event_heap_size(), 3)
+            self.assertEqual(resumed.event_heap_cancelled_size(), 1)
+            resumed.run()
+            self.assertEqual(restored.trace, self.uninterrupted_trace()[:len(restored.trace)])
+            self.assertNotIn(("departure", 10, 5, 1.0), restored.trace)
+
+    def test_many_events(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "many.checkpoint")
+            simulator = Simulator()
+            simulator.ready()
+            result = []
+            simulator.schedule_many((i % 1000, -i, result.append, (i,)) for i in range(10000))
+            simulator.checkpoint(path, result)
+            resumed = Simulator()
+            restored = resumed.restore(path)
+            self.assertEqual(resumed.event_heap_size(), 10000)
+            resumed.run()
+            simulator.run()
+            self.assertEqual(restored, result)
+
+    def test_shared_objects(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "shared.checkpoint")
+            simulator = Simulator()
+            simulator.ready()
+            collector = Collector()
+            entities = [[i] for i in range(10)]
+            num_events = 3 * Simulator.CHECKPOINT_CHUNK_SIZE
+            for i in range(num_events):
+                simulator.schedule(i, collector.collect, entities[i % 10])
+            simulator.checkpoint(path, {"collector": collector, "entities": entities})
+
+            # The owner of the callback is stored once, instead of once per chunk
+            self.assertLess(os.path.getsize(path), 2 * len(pickle.dumps(collector.payload)))
+
+            # Objects reachable from the state keep their identity across the chunks
+            resumed = Simulator()
+            restored = resumed.restore(path)
+            resumed.run()
+            items = restored["collector"].items
+            self.assertEqual(len(items), num_events)
+            for i, item in enumerate(items):
+                self.assertIs(item, restored["entities"][i % 10])
+
+    def test_shared_arguments(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "arguments.checkpoint")
+            simulator = Simulator()
+            simulator.ready()
+            counter = [0]
+            final = []
+            num_events = Simulator.CHECKPOINT_CHUNK_SIZE + 1000
+            for i in range(num_events):
+                simulator.schedule(i, increment, counter)
+            simulator.schedule(num_events, final.append, counter)
+            simulator.checkpoint(path, final)
+
+            # The counter is neither reachable from the state nor from a callback owner,
+            # yet the events of all chunks increment the same one
+            resumed = Simulator()
+            restored = resumed.restore(path)
+            resumed.run()
+            self.assertEqual(restored, [[num_events]])
+
+    def test_every_seconds(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "seconds.checkpoint")
+            simulator = Simulator()
+            simulator.ready()
+            result = []
+            for i in range(10):
+                simulator.schedule(i, result.append, i)
+            simulator.auto_checkpoint(path, every_seconds=1e-9, state=result)
+            simulator.run()
+            resumed = Simulator()
+            self.assertEqual(resumed.restore(path), list(range(10)))
+            self.assertEqual(resumed.now(), 9)
+            self.assertEqual(resumed.event_heap_size(), 0)
+
+    def test_invalid(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "invalid.checkpoint")
+            simulator = Simulator()
+            with self.assertRaises(ValueError):
+                simulator.checkpoint(path)
+            with self.assertRaises(ValueError):
+                simulator.auto_checkpoint(path, every_events=10)
+            simulator.ready()
+            with self.assertRaises(ValueError):
+                simulator.auto_checkpoint(path)
+            with self.assertRaises(ValueError):
+                simulator.auto_checkpoint(path, every_events=0)
+            with self.assertRaises(ValueError):
+                simulator.auto_checkpoint(path, every_seconds=-1.0)
+            simulator.checkpoint(path)
+            with self.assertRaises(ValueError):
+                simulator.restore(path)
+            with open(path, "wb") as file:
+                file.write(b"\x80\x04N.")
+            with self.assertRaises(ValueError):
+                Simulator().restore(path)
@@ -0,0 +1,342 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+import random
+import heapq
+from discrevpy import (
+    Simulator, EventQueue, HeapEventQueue, CalendarEventQueue, LadderEventQueue, ArrayEventQueue,
+    PooledEventQueue
+)
+
+
+def event_queue_factories():
+    return [HeapEventQueue, CalendarEventQueue, LadderEventQueue, ArrayEventQueue, PooledEventQueue]
+
+
+class TestEventQueue(unittest.TestCase):
+
+    def test_empty(self):
+        for factory in event_queue_factories():
+            queue = factory()
+            self.assertEqual(len(queue), 0)
+            self.assertIsNone(queue.peek())
+            try:
+                queue.pop()
+                self.fail()
+            except IndexError:
+                pass
+
+    def test_hold_model(self):
+        # Classic hold model: pop the first event, push a new one a random amount later
+        for factory in event_queue_factories():
+            for max_increment in [0, 1, 10, 1000, 1000000]:
+                rng = random.Random(max_increment)
+                queue = factory()
+                reference = []
+                event_id = 0
+                for _ in range(500):
+                    event = (rng.randint(0, max_increment), rng.randint(-2, 2), event_id, print, ())
+                    queue.push(event)
+                    reference.append(event)
+                    event_id += 1
+                heapq.heapify(reference)
+                for _ in range(3000):
+                    self.assertEqual(queue.peek(), reference[0])
+                    self.assertEqual(queue.pop(), heapq.heappop(reference))
+                    for _ in range(rng.randint(0, 2)):
+                        time = reference[0][0] if reference else 0
+                        event = (time + rng.randint(0, max_increment), rng.randint(-2, 2), event_id, print, ())
+                        queue.push(event)
+                        heapq.heappush(reference, event)
+                        event_id += 1
+                    self.assertEqual(len(queue), len(reference))
+                reference.sort()
+                self.assertEqual([queue.pop() for _ in range(len(queue))], reference)
+                self.assertEqual(len(queue), 0)
+
+    def test_far_future(self):
+        # Many events far in the future, with near-future events scheduled in between
+        for factory in event_queue_factories():
+            queue = factory()
+            rng = random.Random(5)
+            pending = []
+            for i in range(2000):
+                pending.append((100000 + rng.randint(0, 3), rng.randint(0, 1), i, print, ()))
+            pending.append((0, 0, 2000, print, ()))
+            for event in pending:
+                queue.push(event)
+            heapq.heapify(pending)
+            event_id = 2001
+            while len(queue) > 0:
+                event = queue.pop()
+                self.assertEqual(event, heapq.heappop(pending))
+                if event[0] < 100000:
+                    event = (event[0] + rng.randint(0, 5000), 0, event_id, print, ())
+                elif event_id < 3000:
+                    event = (event[0] + rng.randint(0, 1), rng.randint(-1, 1), event_id, print, (event_id,))
+                else:
+                    continue
+                queue.push(event)
+                heapq.heappush(pending, event)
+                event_id += 1
+            self.assertEqual(len(pending), 0)
+
+    def test_changing_time_distribution(self):
+        # Hold model at a constant size of which the increments shrink by orders of magnitude,
+        # after which far-future events accumulate
+        for factory in event_queue_factories():
+            rng = random.Random(8)
+            queue = factory()
+            reference = []
+            for event_id in range(1000):
+                event = (rng.randint(0, 10 ** 6), 0, event_id, print, ())
+                queue.push(event)
+                reference.append(event)
+            heapq.heapify(reference)
+            for event_id in range(1000, 21000):
+                self.assertEqual(queue.pop(), heapq.heappop(reference))
+                if event_id < 11000:
+                    increment = rng.randint(0, 10 ** (6 - (event_id - 1000) // 2000))
+                else:
+                    increment = rng.randint(10 ** 6, 10 ** 9) if rng.random() < 0.1 else rng.randint(0, 10)
+                event = (reference[0][0] + increment, 0, event_id, print, ())
+                queue.push(event)
+                heapq.heappush(reference, event)
+            reference.sort()
+            self.assertEqual([queue.pop() for _ in range(len(queue))], reference)
+
+    def test_clear(self):
+        for factory in event_queue_factories():
+            queue = factory()
+            for i in range(100):
+                queue.push((i * 7, 0, i, print, ()))
+            queue.clear()
+            self.assertEqual(len(queue), 0)
+            self.assertIsNone(queue.peek())
+            queue.push((5, 0, 0, print, ()))
+            self.assertEqual(queue.pop(), (5, 0, 0, print, ()))
+
+    def test_iter_and_repr(self):
+        for factory in event_queue_factories():
+            queue = factory()
+            for i in range(50):
+                queue.push((i % 7, 0, i, len, (i,)))
+            self.assertEqual(sorted(queue), sorted((i % 7, 0, i, len, (i,)) for i in range(50)))
+            self.assertEqual(repr(queue).count("("), 100)
+
+    def test_simulator_events_generating_events(self):
+        results = []
+        for factory in event_queue_factories():
+            sim = Simulator(factory())
+            rng = random.Random(77)
+            result = []
+
+            def x(val):
+                result.append((sim.now(), val))
+                if val > 0:
+                    sim.schedule_with_priority(rng.randint(0, 500), rng.randint(-3, 3), x, val - 1)
+                    sim.schedule(rng.choice([0, 1, 100000]), x, val - 1)
+
+            sim.ready()
+            for i in range(10):
+                sim.schedule(rng.randint(0, 1000), x, 10)
+            sim.end(50000)
+            sim.run()
+            sim.reset()
+            results.append(result)
+        for result in results[1:]:
+            self.assertEqual(result, results[0])
+
+    def test_array_callback_interning(self):
+        queue = ArrayEventQueue()
+
+        def x():
+            pass
+
+        def y():
+            pass
+
+        queue.push((3, 0, 0, x, ()))
+        queue.push((1, 0, 1, y, (1, 2), {"a": 3}))
+        queue.push((2, 0, 2, x, ()))
+        self.assertEqual(len(queue._ArrayEventQueue__callback_table), 2)
+        self.assertEqual(queue.pop(), (1, 0, 1, y, (1, 2), {"a": 3}))
+        self.assertEqual(queue.pop(), (2, 0, 2, x, ()))
+
+        # Callback y is no longer referenced, so its slot is re-used
+        queue.push((5, 0, 3, print, ("abc",)))
+        self.assertEqual(len(queue._ArrayEventQueue__callback_table), 2)
+        self.assertEqual(queue.pop(), (3, 0, 0, x, ()))
+        self.assertEqual(queue.pop(), (5, 0, 3, print, ("abc",)))
+        self.assertEqual(queue._ArrayEventQueue__callback_index, {})
+
+    def test_array_method_callbacks(self):
+        # Bound methods are created anew on each access, yet share a callback table entry
+        class Entity:
+            def first(self):
+                pass
+
+            def second(self):
+                pass
+
+        entities = [Entity(), Entity()]
+        lists = [[], []]
+        queue = ArrayEventQueue()
+        for i in range(100):
+            entity = entities[i % 2]
+            queue.push((i, 0, 3 * i, entity.first if i % 3 else entity.second, ()))
+            queue.push((i, 1, 3 * i + 1, lists[i % 2].append, (i,)))
+            queue.push((i, 2, 3 * i + 2, lists[i % 2].extend, ((i,),)))
+        self.assertEqual(len(queue._ArrayEventQueue__callback_table), 8)
+        for i in range(100):
+            entity = entities[i % 2]
+            callback = queue.pop()[3]
+            self.assertEqual(callback, entity.first if i % 3 else entity.second)
+            self.assertIs(callback.__self__, entity)
+            self.assertEqual(queue.pop()[3], lists[i % 2].append)
+            self.assertEqual(queue.pop()[3], lists[i % 2].extend)
+        self.assertEqual(queue._ArrayEventQueue__callback_index, {})
+
+    def test_array_unhashable_callback_owner(self):
+        # Methods bound to an unhashable object (a list)
+        result = []
+        sim = Simulator(ArrayEventQueue())
+        sim.ready()
+        sim.schedule(2, result.append, 2)
+        sim.schedule(1, result.append, 1)
+        sim.run()
+        self.assertEqual(result, [1, 2])
+
+    def test_array_out_of_range(self):
+        queue = ArrayEventQueue()
+        try:
+            queue.push((2 ** 63, 0, 0, print, ()))
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Time and priority must fit in a 64-bit signed integer")
+        try:
+            queue.push((0, -2 ** 63 - 1, 0, print, ()))
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Time and priority must fit in a 64-bit signed integer")
+        self.assertEqual(len(queue), 0)
+        queue.push((7, 0, 0, print, ()))
+        self.assertEqual(list(queue), [(7, 0, 0, print, ())])
+
+    def test_pooled_recycling(self):
+        queue = PooledEventQueue()
+        for i in range(10):
+            queue.push((i, 0, i, print, (i,)))
+        self.assertEqual((queue.hits(), queue.misses()), (0, 10))
+
+        # Steady state: each pushed event takes the record of the one popped before it
+        for i in range(10, 1000):
+            self.assertEqual(queue.pop()[2], i - 10)
+            queue.push((i, -1, i, print, (i,), {"a": i}))
+        self.assertEqual((queue.hits(), queue.misses()), (990, 10))
+        self.assertEqual(len(queue.records()), 10)
+
+        # Recycled records release their references
+        queue.clear()
+        self.assertEqual(len(queue.free_slots()), 10)
+        self.assertTrue(all(record.args is None for record in queue.records()))
+        queue.push((5, 0, 0, print, ()))
+        self.assertEqual((queue.hits(), queue.misses()), (991, 10))
+        self.assertEqual(queue.pop(), (5, 0, 0, print, ()))
+
+    def test_pooled_unpack_key(self):
+        queue = PooledEventQueue()
+        events = [(0, 0, 0), (7, -2 ** 63, 2 ** 64 - 1), (2 ** 70, 2 ** 63 - 1, 12), (3, -1, 5)]
+        for time, priority, event_id in events:
+            queue.push((time, priority, event_id, print, ()))
+        keys = sorted(queue.heap())
+        self.assertEqual(
+            [PooledEventQueue.unpack_key(key) for key in keys],
+            sorted(events)
+        )
+
+    def test_pooled_simulator(self):
+        sim = Simulator(PooledEventQueue())
+        result = []
+
+        def x(val, extra=None):
+            result.append((sim.now(), val, extra))
+            if val < 2000:
+                sim.schedule(val % 7, x, val + 1)
+
+        sim.ready()
+        sim.schedule(0, x, 0)
+        sim.schedule_with_priority(3, -1, x, 5000, extra="kw")
+        handle = sim.schedule(4, x, 6000)
+        handle.cancel()
+        sim.end(5000)
+        sim.run()
+        self.assertEqual(result[:4], [(0, 0, None), (0, 1, None), (1, 2, None), (3, 5000, "kw")])
+        self.assertEqual(result[4], (3, 3, None))
+        self.assertNotIn(6000, [r[1] for r in result])
+        self.assertEqual(sim.statistics()["events_discarded"], 1)
+        self.assertEqual(sim.event_heap_size(), 1)
+        self.assertGreaterEqual(sim.next_event_time(), 5000)
+
+        # Nearly all records are recycled
+        queue = sim._Simulator__event_heap
+        self.assertLessEqual(queue.misses(), 3)
+        sim.reset()
+
+    def test_pooled_out_of_range(self):
+        queue = PooledEventQueue()
+        for priority in (2 ** 63, -2 ** 63 - 1):
+            try:
+                queue.push((0, priority, 0, print, ()))
+                self.fail()
+            except ValueError as e:
+                self.assertEqual(str(e), "Priority must fit in a 64-bit signed integer")
+        self.assertEqual(len(queue), 0)
+        queue.push((2 ** 70, 2 ** 63 - 1, 0, print, ()))
+        queue.push((2 ** 70, -2 ** 63, 1, print, ()))
+        self.assertEqual(queue.pop(), (2 ** 70, -2 ** 63, 1, print, ()))
+
+    def test_invalid_event_queue(self):
+        try:
+            Simulator([])
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Event queue must be an EventQueue")
+        queue = HeapEventQueue()
+        queue.push((0, 0, 0))
+        try:
+            Simulator(queue)
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Event queue must be empty")
+
+    def test_base_not_implemented(self):
+        queue = EventQueue()
+        for f in [
+            lambda: queue.push((0, 0, 0)), queue.pop, queue.peek, queue.clear, lambda: len(queue), queue.__iter__
+        ]:
+            try:
+                f()
+                self.fail()
+            except NotImplementedError:
+                pass
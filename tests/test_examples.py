@@ -198,6 +198,23 @@ class TestExamples(unittest.TestCase):
         simulator.run()
         simulator.reset()
 
+    def test_cancel_an_event(self):
+        print("")
+
+        def timeout(value):
+            print("t=" + str(simulator.now()) + ": timeout() with value: " + str(value))
+
+        def acknowledge(handle):
+            print("t=" + str(simulator.now()) + ": acknowledge() cancels the timeout")
+            handle.cancel()
+
+        simulator.ready()
+        handle = simulator.schedule(100, timeout, "ABC")  # Scheduling returns a handle to the event
+        simulator.schedule(50, acknowledge, handle)
+        simulator.schedule(200, timeout, "DEF")
+        simulator.run()
+        simulator.reset()
+
     def test_inspecting_the_event_heap(self):
         print("")
 
@@ -0,0 +1,172 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+import random
+from discrevpy import Simulator, run_partitioned
+
+
+LOOKAHEAD = 10
+
+
+def ring_setup(simulator, partition, parameters):
+    received = []
+    rng = random.Random(parameters["seed"] * 1000 + partition.index())
+    target = (partition.index() + 1) % partition.num_partitions()
+
+    def token(value):
+        received.append((simulator.now(), value))
+        partition.send(target, partition.lookahead() + rng.randint(0, 5), "token", value + 1)
+
+    def local(count):
+        received.append((simulator.now(), -count))
+        simulator.schedule(rng.randint(1, 20), local, count + 1)
+
+    partition.register("token", token)
+    if partition.index() == 0:
+        partition.send(0, LOOKAHEAD, "token", 0)
+    simulator.schedule(rng.randint(0, 5), local, 1)
+    return received
+
+
+def failing_setup(simulator, partition, parameters):
+    def token():
+        partition.send(0, partition.lookahead() - 1, "token")
+
+    partition.register("token", token)
+    simulator.schedule(5, token)
+    return None
+
+
+class TestPartition(unittest.TestCase):
+
+    def test_parallel_equals_sequential(self):
+        for seed in range(3):
+            sequential = run_partitioned(ring_setup, 3, LOOKAHEAD, 1000, {"seed": seed}, False)
+            parallel = run_partitioned(ring_setup, 3, LOOKAHEAD, 1000, {"seed": seed})
+            self.assertEqual(sequential, parallel)
+            self.assertTrue(all(len(received) > 50 for received in parallel))
+
+    def test_token_ring(self):
+        def setup(simulator, partition, parameters):
+            received = []
+
+            def token(value):
+                received.append((simulator.now(), value))
+                target = (partition.index() + 1) % partition.num_partitions()
+                partition.send(target, partition.lookahead(), "token", value + 1)
+
+            partition.register("token", token)
+            if partition.index() == 0:
+                simulator.schedule(0, token, 0)
+            return received
+
+        results = run_partitioned(setup, 4, 25, 300, parallel=False)
+        self.assertEqual(results, [
+            [(0, 0), (100, 4), (200, 8)],
+            [(25, 1), (125, 5), (225, 9)],
+            [(50, 2), (150, 6), (250, 10)],
+            [(75, 3), (175, 7), (275, 11)],
+        ])
+
+    def test_same_time_order(self):
+        # Messages arriving at the same time are ordered by priority, then source
+        def setup(simulator, partition, parameters):
+            received = []
+            partition.register("receive", received.append)
+            if partition.index() != 0:
+                partition.send(0, 10, "receive", partition.index())
+                partition.send(0, 10, "receive", -partition.index(), priority=-1)
+            return received
+
+        for parallel in (False, True):
+            results = run_partitioned(setup, 4, 10, 100, parallel=parallel)
+            self.assertEqual(results[0], [-1, -2, -3, 1, 2, 3])
+
+    def test_tie_with_local_event(self):
+        # A message is executed after a local event of the same time and priority
+        # which was scheduled after the message was sent (but before it was delivered),
+        # whereas in a single simulator it would be executed before it
+        def setup(simulator, partition, parameters):
+            executed = []
+            partition.register("receive", executed.append)
+            if partition.index() == 0:
+                simulator.schedule(2, partition.send, 1, 10, "receive", "message")
+            else:
+                simulator.schedule(5, simulator.schedule, 7, executed.append, "local")
+            return executed
+
+        for parallel in (False, True):
+            results = run_partitioned(setup, 2, 10, 100, parallel=parallel)
+            self.assertEqual(results[1], ["local", "message"])
+
+    def test_matches_single_simulator(self):
+        # Without ties, the partitioned run is identical to a run of the whole model
+        received = []
+
+        def token(index, value):
+            received.append((index, simulator.now(), value))
+            simulator.schedule(LOOKAHEAD + value % 3, token, (index + 1) % 3, value + 1)
+
+        simulator = Simulator()
+        simulator.ready()
+        simulator.schedule(0, token, 0, 0)
+        simulator.end(500)
+        simulator.run()
+
+        def setup(partition_simulator, partition, parameters):
+            partition_received = []
+
+            def partition_token(value):
+                partition_received.append((partition.index(), partition_simulator.now(), value))
+                target = (partition.index() + 1) % 3
+                partition.send(target, LOOKAHEAD + value % 3, "token", value + 1)
+
+            partition.register("token", partition_token)
+            if partition.index() == 0:
+                partition_simulator.schedule(0, partition_token, 0)
+            return partition_received
+
+        results = run_partitioned(setup, 3, LOOKAHEAD, 500)
+        self.assertEqual(sorted(sum(results, []), key=lambda r: r[1]), received)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            run_partitioned(ring_setup, 0, LOOKAHEAD, 100)
+        with self.assertRaises(ValueError):
+            run_partitioned(ring_setup, 2, 0, 100)
+        with self.assertRaises(ValueError):
+            run_partitioned(ring_setup, 2, LOOKAHEAD, 0)
+        with self.assertRaises(ValueError):
+            run_partitioned(failing_setup, 2, LOOKAHEAD, 100, parallel=False)
+        with self.assertRaises(ValueError) as context:
+            run_partitioned(failing_setup, 2, LOOKAHEAD, 100)
+        self.assertIsInstance(context.exception.__cause__, RuntimeError)
+        self.assertIn("Partition 0 failed", str(context.exception.__cause__))
+
+    def test_unknown_handler(self):
+        def setup(simulator, partition, parameters):
+            partition.send(1 - partition.index(), 10, "unknown")
+
+        for parallel in (False, True):
+            with self.assertRaises(ValueError):
+                run_partitioned(setup, 2, 10, 100, parallel=parallel)
@@ -0,0 +1,153 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+from discrevpy import simulator, PeriodicEventHandle
+
+
+class TestPeriodic(unittest.TestCase):
+
+    def test_periodic(self):
+        result = []
+
+        def tick(name, value):
+            result.append((simulator.now(), name, value))
+
+        simulator.ready()
+        handle = simulator.schedule_periodic(10, 0, tick, "a", 1)
+        simulator.schedule_periodic(25, -1, tick, "b", 2, start=0)
+        self.assertIsInstance(handle, PeriodicEventHandle)
+        self.assertEqual(handle.time(), 10)
+        simulator.end(51)
+        simulator.run()
+        self.assertEqual(result, [
+            (0, "b", 2),
+            (10, "a", 1),
+            (20, "a", 1),
+            (25, "b", 2),
+            (30, "a", 1),
+            (40, "a", 1),
+            (50, "b", 2),
+            (50, "a", 1),
+        ])
+        self.assertEqual(handle.time(), 60)
+        self.assertEqual(simulator.event_heap_size(), 2)
+        simulator.reset()
+
+    def test_same_order_as_self_scheduling(self):
+        results = []
+        for periodic in [False, True]:
+            result = []
+
+            def other(value):
+                result.append((simulator.now(), "other", value))
+
+            def tick():
+                result.append((simulator.now(), "tick"))
+                simulator.schedule(0, other, 1)
+                if not periodic:
+                    simulator.schedule(5, tick)
+
+            simulator.ready()
+            if periodic:
+                simulator.schedule_periodic(5, 0, tick, start=3)
+            else:
+                simulator.schedule(3, tick)
+            for t in range(0, 30, 2):
+                simulator.schedule(t, other, t)
+            simulator.end(30)
+            simulator.run()
+            simulator.reset()
+            results.append(result)
+        self.assertEqual(results[0], results[1])
+
+    def test_count(self):
+        result = []
+        simulator.ready()
+        handle = simulator.schedule_periodic(7, 0, result.append, "x", start=1, count=3)
+        simulator.run()
+        self.assertEqual(result, ["x", "x", "x"])
+        self.assertEqual(simulator.now(), 15)
+        self.assertFalse(handle.cancel())
+        simulator.reset()
+
+    def test_cancel(self):
+        result = []
+        handles = []
+
+        def tick(value):
+            result.append((simulator.now(), value))
+            if simulator.now() == 30 and value == "a":
+                self.assertTrue(handles[0].cancel())
+                self.assertFalse(handles[0].cancel())
+
+        def stop_other():
+            self.assertTrue(handles[1].cancel())
+            self.assertTrue(handles[1].is_cancelled())
+
+        simulator.ready()
+        handles.append(simulator.schedule_periodic(10, 0, tick, "a"))
+        handles.append(simulator.schedule_periodic(15, 0, tick, "b"))
+        simulator.schedule(31, stop_other)
+        simulator.run()
+        self.assertEqual(result, [(10, "a"), (15, "b"), (20, "a"), (30, "b"), (30, "a")])
+        self.assertEqual(simulator.event_heap_cancelled_size(), 0)
+        simulator.reset()
+
+    def test_cancel_before_run(self):
+        simulator.ready()
+        handle = simulator.schedule_periodic(10, 0, print, "never")
+        self.assertTrue(simulator.cancel(handle))
+        self.assertEqual(simulator.event_heap_live_size(), 0)
+        simulator.run()
+        self.assertEqual(simulator.now(), 0)
+        simulator.reset()
+
+    def test_invalid(self):
+        def x():
+            pass
+
+        simulator.ready()
+        for args, kwargs, message in [
+            ((1.5, 0, x), {}, "Interval must be an integer"),
+            ((0, 0, x), {}, "Interval must be positive: 0"),
+            ((1, "a", x), {}, "Priority must be an integer"),
+            ((1, 0, 5), {}, "Callback must be a function or a method"),
+            ((1, 0, x), {"start": 0.5}, "Start delay must be an integer"),
+            ((1, 0, x), {"start": -1}, "Start delay must be non-negative: -1"),
+            ((1, 0, x), {"count": 0}, "Count must be a positive integer"),
+            ((1, 0, x), {"count": "a"}, "Count must be a positive integer"),
+        ]:
+            try:
+                simulator.schedule_periodic(*args, **kwargs)
+                self.fail()
+            except ValueError as e:
+                self.assertEqual(str(e), message)
+        self.assertEqual(simulator.event_heap_size(), 0)
+        simulator.run()
+        simulator.reset()
+
+        try:
+            simulator.schedule_periodic(1, 0, x)
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Scheduling can only be done when the state is READY, RUNNING or PAUSED (current: INIT)")
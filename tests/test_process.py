@@ -0,0 +1,199 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+from discrevpy import simulator, Simulator, ArrayEventQueue, Process, Condition
+
+
+class TestProcess(unittest.TestCase):
+
+    def test_delays(self):
+        result = []
+
+        def entity(name, delays):
+            for delay in delays:
+                yield delay
+                result.append((simulator.now(), name))
+            return name + " done"
+
+        simulator.ready()
+        a = simulator.process(entity("a", [5, 0, 10]))
+        b = simulator.process(entity("b", [3, 7]), delay=2)
+        self.assertIsInstance(a, Process)
+        self.assertEqual(simulator.event_heap_size(), 2)
+        simulator.run()
+        simulator.reset()
+        # A zero delay goes behind the events already scheduled in the time moment
+        self.assertEqual(result, [(5, "a"), (5, "b"), (5, "a"), (12, "b"), (15, "a")])
+        self.assertTrue(a.is_finished())
+        self.assertEqual(a.result(), "a done")
+        self.assertEqual(b.result(), "b done")
+
+    def test_same_order_as_callbacks(self):
+
+        def process_model(sim, result):
+            def entity(i):
+                for step in range(20):
+                    yield (i * 7 + step * 3) % 11
+                    result.append((sim.now(), i, step))
+
+            for i in range(100):
+                sim.process(entity(i), delay=i % 5, priority=i % 3)
+
+        def callback_model(sim, result):
+            def entity(i, step):
+                if step > 0:
+                    result.append((sim.now(), i, step - 1))
+                if step < 20:
+                    sim.schedule_with_priority((i * 7 + step * 3) % 11, i % 3, entity, i, step + 1)
+
+            for i in range(100):
+                sim.schedule_with_priority(i % 5, i % 3, entity, i, 0)
+
+        for event_queue in [None, ArrayEventQueue()]:
+            expected = []
+            reference = Simulator()
+            reference.ready()
+            callback_model(reference, expected)
+            reference.run()
+
+            result = []
+            sim = Simulator(event_queue)
+            sim.ready()
+            process_model(sim, result)
+            sim.run()
+            self.assertEqual(result, expected)
+            self.assertEqual(sim.now(), reference.now())
+
+    def test_condition(self):
+        result = []
+        condition = Condition()
+
+        def waiter(name):
+            value = yield condition
+            result.append((simulator.now(), name, value))
+            value = yield condition
+            result.append((simulator.now(), name, value))
+
+        def trigger():
+            yield 10
+            self.assertEqual(condition.num_waiting(), 2)
+            self.assertEqual(condition.trigger("first"), 2)
+            yield 5
+            condition.trigger("second")
+
+        simulator.ready()
+        simulator.process(waiter("x"))
+        simulator.process(waiter("y"))
+        simulator.process(trigger(), delay=1)
+        simulator.run()
+        simulator.reset()
+        self.assertEqual(result, [
+            (11, "x", "first"), (11, "y", "first"), (16, "x", "second"), (16, "y", "second")
+        ])
+        self.assertEqual(condition.num_waiting(), 0)
+
+    def test_wait_for_process(self):
+        result = []
+
+        def child(duration):
+            yield duration
+            return duration * 2
+
+        def parent():
+            first = simulator.process(child(10))
+            second = simulator.process(child(3))
+            value = yield first
+            result.append((simulator.now(), value))
+            value = yield second  # Already finished
+            result.append((simulator.now(), value))
+
+        simulator.ready()
+        simulator.process(parent())
+        simulator.run()
+        simulator.reset()
+        self.assertEqual(result, [(10, 20), (10, 6)])
+
+    def test_stop(self):
+        result = []
+        condition = Condition()
+
+        def ticker():
+            while True:
+                yield 1
+                result.append(simulator.now())
+
+        def waiter():
+            yield condition
+            result.append("woken")
+
+        def observer(process):
+            value = yield process
+            result.append(("stopped", simulator.now(), value))
+
+        simulator.ready()
+        ticking = simulator.process(ticker())
+        waiting = simulator.process(waiter())
+        simulator.process(observer(ticking))
+        simulator.schedule(3, ticking.stop)
+        simulator.schedule(4, waiting.stop)
+        simulator.schedule(5, condition.trigger)
+        simulator.run()
+        simulator.reset()
+        self.assertEqual(result, [1, 2, ("stopped", 3, None)])
+        self.assertTrue(ticking.is_finished())
+        self.assertFalse(ticking.stop())
+        self.assertEqual(condition.num_waiting(), 0)
+
+    def test_invalid(self):
+        def entity(value):
+            yield value
+
+        simulator.ready()
+        with self.assertRaises(ValueError):
+            simulator.process(lambda: 5)
+        with self.assertRaises(ValueError):
+            simulator.process(entity(1), delay=-1)
+        with self.assertRaises(ValueError):
+            simulator.process(entity(1), delay=1.5)
+        with self.assertRaises(ValueError):
+            simulator.process(entity(1), priority=None)
+        simulator.run()
+        simulator.reset()
+
+        sim = Simulator()
+        sim.ready()
+        sim.process(entity(-5))
+        try:
+            sim.run()
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Delay must be non-negative: -5")
+
+        sim = Simulator()
+        sim.ready()
+        sim.process(entity("abc"))
+        try:
+            sim.run()
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Process must yield a delay (integer), a Condition or a Process")
@@ -0,0 +1,144 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+import unittest
+from discrevpy import Simulator, LadderEventQueue, CallbackProfiler, Deterministic
+
+
+class Model:
+
+    def __init__(self, simulator):
+        self.simulator = simulator
+
+    def spawn(self, n):
+        for _ in range(n):
+            self.simulator.schedule(1, self.idle)
+
+    def idle(self):
+        pass
+
+    def slow(self):
+        time.sleep(0.002)
+
+
+def customer(simulator, service):
+    yield service
+    yield simulator.process(server(service))
+
+
+def server(service):
+    yield service
+    yield service
+
+
+class TestProfiler(unittest.TestCase):
+
+    def run_profiled(self, profiler, event_queue=None):
+        simulator = Simulator(event_queue)
+        models = [Model(simulator), Model(simulator)]
+        simulator.ready()
+        simulator.profile(profiler)
+        for i in range(10):
+            simulator.schedule(i, models[i % 2].spawn, 3)
+        simulator.schedule(5, models[0].slow)
+        simulator.schedule(6, models[1].slow)
+        simulator.cancel(simulator.schedule(7, models[1].slow))
+        simulator.run()
+
+    def test_profile(self):
+        for event_queue in [None, LadderEventQueue()]:
+            profiler = CallbackProfiler()
+            self.run_profiled(profiler, event_queue)
+            results = profiler.results()
+            self.assertEqual([result[0] for result in results], [
+                Model.slow.__module__ + ".Model.slow",
+                Model.spawn.__module__ + ".Model.spawn",
+                Model.idle.__module__ + ".Model.idle",
+            ])
+            slow, spawn, idle = results
+            self.assertEqual(slow[1], 2)
+            self.assertGreaterEqual(slow[2], 0.004)
+            self.assertGreaterEqual(slow[3], 0.002)
+            self.assertEqual(slow[4], 0)
+            self.assertEqual(spawn[1], 10)
+            self.assertEqual(spawn[4], 30)
+            self.assertEqual(idle[1], 30)
+            self.assertEqual(idle[4], 0)
+            report = profiler.report().split("\n")
+            self.assertEqual(len(report), 4)
+            self.assertTrue(report[0].startswith("Callback"))
+            self.assertTrue(report[1].startswith(slow[0]))
+
+    def test_sampling(self):
+        profiler = CallbackProfiler(sample_every=4)
+        self.run_profiled(profiler)
+        counts = {result[0].split(".")[-1]: result[1] for result in profiler.results()}
+        self.assertEqual(counts, {"slow": 2, "spawn": 10, "idle": 30})
+        self.assertEqual(profiler.sample_every(), 4)
+        profiler.clear()
+        self.assertEqual(profiler.results(), [])
+
+    def test_builtin_callbacks(self):
+        # Built-in methods share the method of their type
+        for sample_every in (1, 2):
+            profiler = CallbackProfiler(sample_every)
+            simulator = Simulator()
+            simulator.ready()
+            simulator.profile(profiler)
+            for i in range(5):
+                simulator.schedule(i, [].append, i)
+            simulator.run()
+            self.assertEqual([result[:2] for result in profiler.results()], [("list.append", 5)])
+
+    def test_wrapped_callbacks(self):
+        # Events executed via an internal method are attributed to the callback of the model
+        profiler = CallbackProfiler()
+        simulator = Simulator()
+        model = Model(simulator)
+        simulator.ready()
+        simulator.profile(profiler)
+        for i in range(3):
+            simulator.process(customer(simulator, i + 1))
+        simulator.schedule_periodic(10, 0, model.idle, count=4)
+        simulator.schedule_arrivals(Deterministic(5), 1, 0, model.slow, count=2)
+        simulator.schedule_arrays([1, 2, 3], model.spawn, [0, 0, 0])
+        simulator.run()
+        counts = {result[0]: result[1] for result in profiler.results()}
+        self.assertEqual(counts, {
+            Model.idle.__module__ + ".Model.idle": 4,
+            Model.slow.__module__ + ".Model.slow": 2,
+            Model.spawn.__module__ + ".Model.spawn": 3,
+            "customer": 9,
+            "server": 9,
+        })
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            CallbackProfiler(0)
+        simulator = Simulator()
+        with self.assertRaises(ValueError):
+            simulator.profile(CallbackProfiler())
+        simulator.ready()
+        with self.assertRaises(ValueError):
+            simulator.profile("profiler")
+        simulator.profile(None)
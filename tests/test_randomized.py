@@ -21,12 +21,15 @@
 # SOFTWARE.
 
 import unittest
-from discrevpy import simulator
+from discrevpy import (
+    simulator, Simulator, CalendarEventQueue, LadderEventQueue, ArrayEventQueue, PooledEventQueue
+)
 import random
 
 
 def random_schedule_test(
         test_instance,
+        simulator,
         seed,
         max_time,
         num_events,
@@ -58,18 +61,33 @@ def random_schedule_test(
 class TestRandomized(unittest.TestCase):
 
     def test_randomized(self):
+        self.randomized_test(simulator)
+
+    def test_randomized_calendar_queue(self):
+        self.randomized_test(Simulator(CalendarEventQueue()))
+
+    def test_randomized_ladder_queue(self):
+        self.randomized_test(Simulator(LadderEventQueue()))
+
+    def test_randomized_array_queue(self):
+        self.randomized_test(Simulator(ArrayEventQueue()))
+
+    def test_randomized_pooled_queue(self):
+        self.randomized_test(Simulator(PooledEventQueue()))
+
+    def randomized_test(self, simulator):
         random.seed(8849866351611827)
         seeds = []
         for i in range(5):
             seeds.append(random.randint(-1000000, 1000000))
         for seed in seeds:
-            random_schedule_test(self, seed, 0, 1000, 0, 0)       # One time moment, all the same priority (0)
-            random_schedule_test(self, seed, 0, 1000, -10, 10)    # One time moment, varying priority [-10, 10]
-            random_schedule_test(self, seed, 1, 1000, 0, 0)       # Two time moments, all the same priority (0)
-            random_schedule_test(self, seed, 1, 1000, -100, -10)  # Two time moments, varying priority [-100, -10]
-            random_schedule_test(self, seed, 2, 1000, 0, 0)       # Three time moments, all the same priority (0)
-            random_schedule_test(self, seed, 2, 1000, 65, 3662)   # Three time moments, varying priority [65, 3662]
-            random_schedule_test(self, seed, 5, 1000, 66, 66)     # Six time moments, all the same priority (66)
-            random_schedule_test(self, seed, 5, 1000, -10, 66)    # Six time moments, varying priority [-10, 66]
-            random_schedule_test(self, seed, 100, 1000, -7, -7)   # 101 time moments, all the same priority (-7)
-            random_schedule_test(self, seed, 100, 1000, 0, 10)    # 101 time moments, varying priority [0, 10]
+            random_schedule_test(self, simulator, seed, 0, 1000, 0, 0)       # One time moment, all the same priority (0)
+            random_schedule_test(self, simulator, seed, 0, 1000, -10, 10)    # One time moment, varying priority [-10, 10]
+            random_schedule_test(self, simulator, seed, 1, 1000, 0, 0)       # Two time moments, all the same priority (0)
+            random_schedule_test(self, simulator, seed, 1, 1000, -100, -10)  # Two time moments, varying priority [-100, -10]
+            random_schedule_test(self, simulator, seed, 2, 1000, 0, 0)       # Three time moments, all the same priority (0)
+            random_schedule_test(self, simulator, seed, 2, 1000, 65, 3662)   # Three time moments, varying priority [65, 3662]
+            random_schedule_test(self, simulator, seed, 5, 1000, 66, 66)     # Six time moments, all the same priority (66)
+            random_schedule_test(self, simulator, seed, 5, 1000, -10, 66)    # Six time moments, varying priority [-10, 66]
+            random_schedule_test(self, simulator, seed, 100, 1000, -7, -7)   # 101 time moments, all the same priority (-7)
+            random_schedule_test(self, simulator, seed, 100, 1000, 0, 10)    # 101 time moments, varying priority [0, 10]
@@ -0,0 +1,145 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+import random
+from discrevpy import Simulator, run_replications, run_replication, replication_seed, run_warm_started
+
+
+def queue_model(simulator, parameters):
+    result = {"seed": parameters["seed"], "served": 0, "arrivals": []}
+    rng = random.Random(parameters["seed"])
+
+    def arrival():
+        result["arrivals"].append(simulator.now())
+        simulator.schedule(rng.randint(1, parameters.get("service", 10)), departure)
+        simulator.schedule(rng.randint(1, 20), arrival)
+
+    def departure():
+        result["served"] += 1
+
+    simulator.schedule(0, arrival)
+    simulator.end(parameters.get("duration", 1000))
+    return result
+
+
+def global_random_model(simulator, parameters):
+    result = []
+    simulator.schedule(random.randint(0, 100), lambda: result.append(simulator.now()))
+    return result
+
+
+def warm_model(simulator, parameters):
+    result = {"rng": random.Random(parameters["seed"]), "events": []}
+
+    def tick():
+        result["events"].append((simulator.now(), random.randint(0, 1000), result["rng"].random()))
+        simulator.schedule(random.randint(1, 10), tick)
+
+    simulator.schedule(0, tick)
+    simulator.end(300)
+    return result
+
+
+def warm_reseed(result, seed):
+    result["rng"].seed(seed + 1)
+
+
+def warm_reference(warmup, seed):
+    random.seed(0)
+    simulator = Simulator()
+    simulator.ready()
+    result = warm_model(simulator, {"seed": 0})
+    simulator.run_until(warmup)
+    random.seed(seed)
+    warm_reseed(result, seed)
+    simulator.run()
+    return result["events"]
+
+
+class TestReplication(unittest.TestCase):
+
+    def test_parallel_equals_sequential(self):
+        replications = [1, 2, {"seed": 3, "service": 5}, {"duration": 500}, {"service": 2}]
+        sequential = dict(run_replications(queue_model, replications, num_workers=1, base_seed=7))
+        parallel = dict(run_replications(queue_model, replications, num_workers=3, base_seed=7))
+        self.assertEqual(sequential, parallel)
+        self.assertEqual(sorted(sequential.keys()), [0, 1, 2, 3, 4])
+        self.assertEqual(sequential[0]["seed"], 1)
+        self.assertEqual(sequential[2]["seed"], 3)
+        self.assertEqual(sequential[3]["seed"], replication_seed(7, 3))
+        self.assertEqual(sequential[0], run_replication(queue_model, {"seed": 1}))
+        self.assertNotEqual(sequential[0]["arrivals"], sequential[1]["arrivals"])
+        self.assertTrue(max(sequential[3]["arrivals"]) < 500)
+
+    def test_global_random_seeded(self):
+        first = dict(run_replications(global_random_model, [5, 5, 6], num_workers=2))
+        self.assertEqual(first[0], first[1])
+        self.assertEqual(first, dict(run_replications(global_random_model, [5, 5, 6], num_workers=1)))
+
+    def test_replication_seed(self):
+        self.assertEqual(replication_seed(0, 1), replication_seed(0, 1))
+        self.assertNotEqual(replication_seed(0, 1), replication_seed(0, 2))
+        self.assertNotEqual(replication_seed(0, 1), replication_seed(1, 1))
+        self.assertTrue(0 <= replication_seed(3, 4) < 2 ** 64)
+
+    def test_empty(self):
+        self.assertEqual(list(run_replications(queue_model, [], num_workers=2)), [])
+
+    def test_invalid(self):
+        try:
+            list(run_replications(queue_model, [1.5]))
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Replication must be a seed (integer) or a dict of parameters")
+        try:
+            list(run_replications(queue_model, [1], num_workers=0))
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Number of workers must be a positive integer")
+
+    def test_warm_started(self):
+        seeds = [11, 12, 13, 11, 14]
+        results = list(run_warm_started(warm_model, 100, seeds, warm_reseed, num_workers=2))
+        self.assertEqual([index for index, _ in results], [0, 1, 2, 3, 4])
+        events = [result["events"] for _, result in results]
+        for seed, result_events in zip(seeds, events):
+            self.assertEqual(result_events, warm_reference(100, seed))
+
+        # Identical warm-up, different continuations (except for equal seeds)
+        warmup_events = [event for event in events[0] if event[0] < 100]
+        for result_events in events:
+            self.assertEqual([event for event in result_events if event[0] < 100], warmup_events)
+            self.assertTrue(max(event[0] for event in result_events) < 300)
+        self.assertNotEqual(events[0], events[1])
+        self.assertEqual(events[0], events[3])
+
+    def test_warm_started_failure(self):
+        def failing_reseed(result, seed):
+            raise KeyError(seed)
+
+        with self.assertRaises(RuntimeError):
+            list(run_warm_started(warm_model, 100, [1, 2], failing_reseed, num_workers=1))
+        with self.assertRaises(ValueError):
+            list(run_warm_started(warm_model, 1000, [1, 2]))
+        with self.assertRaises(ValueError):
+            list(run_warm_started(warm_model, 100, [1], num_workers=0))
@@ -0,0 +1,188 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import random
+import unittest
+from discrevpy import Simulator, LadderEventQueue, TraceWriter, CallbackProfiler
+
+
+class TestRunUntil(unittest.TestCase):
+
+    def test_run_until(self):
+        for event_queue in [None, LadderEventQueue()]:
+            simulator = Simulator(event_queue)
+            result = []
+            simulator.ready()
+            for t in [5, 10, 15, 20]:
+                simulator.schedule(t, result.append, t)
+            simulator.end(18)
+            simulator.run_until(10)
+            self.assertTrue(simulator.is_paused())
+            self.assertEqual(simulator.now(), 10)
+            self.assertEqual(result, [5])
+            self.assertEqual(simulator.event_heap_size(), 3)
+
+            # Scheduling while paused, relative to the paused time
+            simulator.schedule(1, result.append, 11)
+            simulator.run_until(10)
+            self.assertEqual(result, [5])
+            simulator.run_until(12)
+            self.assertEqual(result, [5, 10, 11])
+
+            # End time before the next intermediate time
+            simulator.schedule(2, simulator.end)
+            simulator.run_until(16)
+            self.assertTrue(simulator.is_finished())
+            self.assertEqual(simulator.now(), 14)
+            self.assertEqual(result, [5, 10, 11])
+
+    def test_run_until_end_time(self):
+        simulator = Simulator()
+        result = []
+        simulator.ready()
+        for t in [5, 10, 15, 20]:
+            simulator.schedule(t, result.append, t)
+        simulator.end(15)
+        simulator.run_until(15)
+        self.assertTrue(simulator.is_finished())
+        self.assertEqual(simulator.now(), 15)
+        self.assertEqual(result, [5, 10])
+
+    def test_run_until_empty(self):
+        simulator = Simulator()
+        result = []
+        simulator.ready()
+        simulator.run_until(100)
+        self.assertTrue(simulator.is_paused())
+        self.assertEqual(simulator.now(), 100)
+        simulator.schedule(0, result.append, "a")
+        simulator.schedule(50, result.append, "b")
+        simulator.end(40)
+        simulator.run()
+        self.assertTrue(simulator.is_finished())
+        self.assertEqual(simulator.now(), 140)
+        self.assertEqual(result, ["a"])
+
+    def test_slices_equal_full_run(self):
+
+        def model(simulator, result):
+            rng = random.Random(5)
+
+            def arrival(i):
+                result.append((simulator.now(), i))
+                simulator.schedule(rng.randint(0, 30), arrival, i + 1)
+                if i % 3 == 0:
+                    handle = simulator.schedule(rng.randint(0, 30), result.append, -i)
+                    if i % 2 == 0:
+                        handle.cancel()
+
+            simulator.schedule(0, arrival, 0)
+            simulator.end(10000)
+
+        full = Simulator()
+        expected = []
+        full.ready()
+        model(full, expected)
+        full.run()
+
+        sliced = Simulator()
+        result = []
+        sliced.ready()
+        model(sliced, result)
+        t = 0
+        while not sliced.is_finished():
+            t += 777
+            sliced.run_until(t)
+            if not sliced.is_finished():
+                sliced.step(3)
+        self.assertEqual(result, expected)
+        self.assertEqual(sliced.now(), 10000)
+
+    def test_step(self):
+        simulator = Simulator()
+        result = []
+        simulator.ready()
+        for t in [5, 5, 10, 15, 20]:
+            simulator.schedule(t, result.append, t)
+        simulator.cancel(simulator.schedule(7, result.append, 7))
+        self.assertEqual(simulator.step(), 1)
+        self.assertTrue(simulator.is_paused())
+        self.assertEqual(simulator.now(), 5)
+        self.assertEqual(simulator.step(2), 2)
+        self.assertEqual(simulator.now(), 10)
+        self.assertEqual(result, [5, 5, 10])
+        simulator.end(8)
+        self.assertEqual(simulator.step(5), 1)
+        self.assertTrue(simulator.is_finished())
+        self.assertEqual(simulator.now(), 18)
+        self.assertEqual(result, [5, 5, 10, 15])
+
+    def test_step_empty(self):
+        simulator = Simulator()
+        simulator.ready()
+        self.assertEqual(simulator.step(10), 0)
+        self.assertTrue(simulator.is_paused())
+        simulator.schedule(3, simulator.end)
+        self.assertEqual(simulator.step(10), 1)
+        self.assertTrue(simulator.is_finished())
+        self.assertEqual(simulator.now(), 3)
+
+    def test_step_instrumented(self):
+        simulator = Simulator()
+        profiler = CallbackProfiler()
+        result = []
+        simulator.ready()
+        simulator.profile(profiler)
+        for t in range(10):
+            simulator.schedule(t, result.append, t)
+        self.assertEqual(simulator.step(4), 4)
+        simulator.profile(None)
+        simulator.run()
+        self.assertEqual(result, list(range(10)))
+        self.assertEqual(profiler.results()[0][1], 4)
+        self.assertEqual(simulator.statistics()["events_executed"], 10)
+
+    def test_invalid(self):
+        simulator = Simulator()
+        with self.assertRaises(ValueError):
+            simulator.run_until(10)
+        with self.assertRaises(ValueError):
+            simulator.step()
+        simulator.ready()
+        simulator.run_until(10)
+        with self.assertRaises(ValueError):
+            simulator.run_until(9)
+        with self.assertRaises(ValueError):
+            simulator.run_until(11.0)
+        with self.assertRaises(ValueError):
+            simulator.step(0)
+        try:
+            simulator.end(0)
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Cannot schedule end with zero delay in PAUSED state")
+        simulator.run()
+        try:
+            simulator.run_until(20)
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Run can only be started when the state is READY or PAUSED (current: FINISHED)")
@@ -0,0 +1,164 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import random
+import tempfile
+import unittest
+from array import array
+from discrevpy import simulator, Simulator, ScheduledArrays
+
+
+RECORDED = []
+
+
+def record(*args):
+    RECORDED.append(args)
+
+
+class TestScheduleArrays(unittest.TestCase):
+
+    def same_as_one_by_one(self, delays, priorities, columns):
+        results = []
+        for use_arrays in (False, True):
+            result = []
+            sim = Simulator()
+
+            def x(*args):
+                result.append((sim.now(), args))
+                if args and args[0] % 3 == 0:
+                    sim.schedule(args[0] % 2, y, args[0])
+
+            def y(value):
+                result.append((sim.now(), "y", value))
+
+            sim.ready()
+            sim.schedule(0, y, -1)
+            if use_arrays:
+                scheduled = sim.schedule_arrays(delays, x, *columns, priorities=priorities)
+                self.assertEqual(scheduled.num_events(), len(delays))
+            else:
+                for i, delay in enumerate(delays):
+                    priority = 0 if priorities is None else priorities[i]
+                    sim.schedule_with_priority(delay, priority, x, *[c[i] for c in columns])
+            sim.schedule(5, y, -2)
+            sim.run()
+            statistics = sim.statistics()
+            del statistics["wall_time"], statistics["events_per_second"]
+            del statistics["peak_heap_size"]  # Lower with arrays, as they are deferred
+            results.append((result, statistics))
+        self.assertEqual(results[0], results[1])
+
+    def test_same_as_one_by_one(self):
+        rng = random.Random(123)
+        for n in (0, 1, 2, 10, 500):
+            delays = [rng.randint(0, 20) for _ in range(n)]
+            priorities = [rng.randint(-2, 2) for _ in range(n)]
+            values = list(range(n))
+            self.same_as_one_by_one(delays, None, [])
+            self.same_as_one_by_one(delays, None, [values])
+            self.same_as_one_by_one(delays, priorities, [values, array("d", delays)])
+            self.same_as_one_by_one(sorted(delays), None, [values])
+            self.same_as_one_by_one(sorted(delays), [0] * n, [values])
+
+    def test_columns(self):
+        result = []
+        simulator.ready()
+        simulator.schedule_arrays(
+            array("q", [30, 10, 20]), lambda a, b: result.append((simulator.now(), a, b)),
+            array("d", [0.5, 1.5, 2.5]), ["x", "y", "z"]
+        )
+        simulator.run()
+        simulator.reset()
+        self.assertEqual(result, [(10, 1.5, "y"), (20, 2.5, "z"), (30, 0.5, "x")])
+
+    def test_deferred(self):
+        counts = []
+
+        def x(i):
+            statistics = simulator.statistics()
+            counts.append((simulator.event_heap_size(), statistics["events_executed"]))
+
+        simulator.ready()
+        scheduled = simulator.schedule_arrays(range(1000), x, range(1000))
+        self.assertEqual(simulator.event_heap_size(), 1)
+        self.assertEqual(scheduled.num_deferred(), 999)
+        self.assertEqual(simulator.statistics()["events_scheduled"], 1000)
+        self.assertEqual(simulator.statistics()["events_executed"], 0)
+        simulator.run()
+        self.assertEqual(counts[0], (1, 1))
+        self.assertEqual(counts[500], (1, 501))
+        self.assertEqual(counts[999], (0, 1000))
+        self.assertEqual(scheduled.num_deferred(), 0)
+        statistics = simulator.statistics()
+        self.assertEqual((statistics["events_scheduled"], statistics["events_executed"]), (1000, 1000))
+        self.assertEqual(statistics["delay_histogram"][:4], [1, 1, 2, 4])
+        simulator.reset()
+
+    def test_checkpoint(self):
+        rng = random.Random(5)
+        delays = [rng.randint(0, 1000) for _ in range(3000)]
+        priorities = [rng.randint(0, 3) for _ in range(3000)]
+
+        del RECORDED[:]
+        sim = Simulator()
+        sim.ready()
+        sim.schedule_arrays(delays, record, list(range(3000)), priorities=priorities)
+        sim.run()
+        expected = list(RECORDED)
+
+        del RECORDED[:]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "checkpoint")
+            sim = Simulator()
+            sim.ready()
+            sim.schedule_arrays(delays, record, list(range(3000)), priorities=priorities)
+            sim.run_until(500)
+            sim.checkpoint(path)
+            restored = Simulator()
+            restored.restore(path)
+            self.assertEqual(
+                restored.statistics()["events_executed"], sim.statistics()["events_executed"]
+            )
+            restored.run()
+        self.assertEqual(RECORDED, expected)
+        self.assertEqual(restored.statistics()["events_executed"], 3000)
+
+    def test_invalid(self):
+        sim = Simulator()
+        with self.assertRaises(ValueError):
+            sim.schedule_arrays([1], print)
+        sim.ready()
+        for args, kwargs in (
+                (([1, 2.5], print), {}),
+                (([1, 2 ** 63], print), {}),
+                (([1, -1], print), {}),
+                (([1, 2], 5), {}),
+                (([1, 2], print, [1]), {}),
+                (([1, 2], print), {"priorities": [1]}),
+                (([1, 2], print), {"priorities": [1, 0.5]}),
+        ):
+            with self.assertRaises(ValueError):
+                sim.schedule_arrays(*args, **kwargs)
+        self.assertEqual(sim.event_heap_size(), 0)
+        self.assertEqual(sim.statistics()["events_scheduled"], 0)
+        self.assertIsInstance(sim.schedule_arrays([], print), ScheduledArrays)
@@ -0,0 +1,113 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+import random
+from discrevpy import simulator, Simulator, CalendarEventQueue, LadderEventQueue
+
+
+class TestScheduleMany(unittest.TestCase):
+
+    def test_equal_to_one_by_one(self):
+        results = []
+        for use_batch in [False, True]:
+            result = []
+
+            def x(val, other):
+                result.append((simulator.now(), val, other))
+
+            random.seed(4773)
+            events = [
+                (random.randint(0, 100), random.randint(-3, 3), x, (i, random.randint(0, 9)))
+                for i in range(5000)
+            ]
+            simulator.ready()
+            if use_batch:
+                simulator.schedule_many(events[:10])
+                simulator.schedule(50, x, -1, -1)
+                simulator.schedule_many(iter(events[10:]))
+            else:
+                for (delay, priority, callback, args) in events[:10]:
+                    simulator.schedule_with_priority(delay, priority, callback, *args)
+                simulator.schedule(50, x, -1, -1)
+                for (delay, priority, callback, args) in events[10:]:
+                    simulator.schedule_with_priority(delay, priority, callback, *args)
+            self.assertEqual(simulator.event_heap_size(), 5001)
+            simulator.run()
+            simulator.reset()
+            results.append(result)
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(len(results[0]), 5001)
+
+    def test_fifo_in_batch(self):
+        result = []
+        simulator.ready()
+        simulator.schedule_many([(10, 0, result.append, (i,)) for i in range(100)])
+        simulator.run()
+        simulator.reset()
+        self.assertEqual(result, list(range(100)))
+
+    def test_in_event_and_other_queues(self):
+        for event_queue in [CalendarEventQueue(), LadderEventQueue()]:
+            sim = Simulator(event_queue)
+            result = []
+
+            def x(val):
+                result.append((sim.now(), val))
+                if val < 3:
+                    sim.schedule_many([(0, 1, x, (val + 1,)), (7, 0, x, (val + 1,)), (0, -1, x, (val + 1,))])
+
+            sim.ready()
+            sim.schedule_many([(5, 0, x, (0,))])
+            sim.schedule_many([])
+            sim.run()
+            sim.reset()
+            self.assertEqual(result[:4], [(5, 0), (5, 1), (5, 2), (5, 3)])
+            self.assertEqual(len(result), 1 + 3 + 9 + 27)
+
+    def test_invalid(self):
+        def x():
+            pass
+
+        for events, message in [
+            ([(1, 0, x, ()), ("a", 0, x, ())], "Delay must be an integer"),
+            ([(1, 0, x, ()), (1, 0.5, x, ())], "Priority must be an integer"),
+            ([(1, 0, x, ()), (1, 0, 5, ())], "Callback must be a function or a method"),
+            ([(1, 0, x, ()), (1, 0, x, [])], "Positional arguments must be a tuple"),
+            ([(1, 0, x, ()), (-4, 0, x, ())], "Delay must be non-negative: -4"),
+        ]:
+            simulator.ready()
+            try:
+                simulator.schedule_many(events)
+                self.fail()
+            except ValueError as e:
+                self.assertEqual(str(e), message)
+            # Nothing was scheduled
+            self.assertEqual(simulator.event_heap_size(), 0)
+            simulator.run()
+            simulator.reset()
+
+        try:
+            simulator.schedule_many([(1, 0, x, ())])
+            self.fail()
+        except ValueError as e:
+            self.assertEqual(str(e), "Scheduling can only be done when the state is READY, RUNNING or PAUSED (current: INIT)")
@@ -21,7 +21,7 @@
 # SOFTWARE.
 
 import unittest
-from discrevpy import simulator
+from discrevpy import simulator, Simulator, EventHandle
 
 
 class TestSimulator(unittest.TestCase):
@@ -267,7 +267,7 @@ class TestSimulator(unittest.TestCase):
             simulator.run()
             self.fail()
         except ValueError as e:
-            self.assertEqual(str(e), "Run can only be started when the state is READY (current: INIT)")
+            self.assertEqual(str(e), "Run can only be started when the state is READY or PAUSED (current: INIT)")
             simulator.ready()
             simulator.run()
             simulator.reset()
@@ -282,14 +282,14 @@ class TestSimulator(unittest.TestCase):
             simulator.run()
             simulator.reset()
 
-        # Invalid schedule (not in READY or RUNNING state)
+        # Invalid schedule (not in READY, RUNNING or PAUSED state)
         try:
             def x():
                 pass
             simulator.schedule(10, x)
             self.fail()
         except ValueError as e:
-            self.assertEqual(str(e), "Scheduling can only be done when the state is READY or RUNNING (current: INIT)")
+            self.assertEqual(str(e), "Scheduling can only be done when the state is READY, RUNNING or PAUSED (current: INIT)")
 
         # Invalid end() in INIT state
         try:
@@ -298,7 +298,7 @@ class TestSimulator(unittest.TestCase):
         except ValueError as e:
             self.assertEqual(
                 str(e),
-                "Scheduling end can only be done when the state is READY or RUNNING (current: INIT)"
+                "Scheduling end can only be done when the state is READY, RUNNING or PAUSED (current: INIT)"
             )
 
         # Invalid end() in FINISHED state
@@ -310,7 +310,7 @@ class TestSimulator(unittest.TestCase):
         except ValueError as e:
             self.assertEqual(
                 str(e),
-                "Scheduling end can only be done when the state is READY or RUNNING (current: FINISHED)"
+                "Scheduling end can only be done when the state is READY, RUNNING or PAUSED (current: FINISHED)"
             )
             simulator.reset()
 
@@ -404,3 +404,33 @@ class TestSimulator(unittest.TestCase):
             self.assertEqual(str(e), "Cannot schedule end with zero delay in READY state")
             simulator.run()
             simulator.reset()
+
+    def test_no_validation(self):
+        results = []
+        for validate in [True, False]:
+            sim = Simulator(validate=validate)
+            result = []
+
+            def x(val, extra=0):
+                result.append((sim.now(), val, extra))
+                if val > 0:
+                    sim.schedule(3, x, val - 1)
+                    sim.schedule_with_priority(3, -1, x, val - 1, extra=val)
+
+            sim.ready()
+            handle = sim.schedule(0, x, 5)
+            self.assertIsInstance(handle, EventHandle)
+            sim.schedule_with_priority(1, 2, x, 0, extra=7)
+            sim.schedule_many([(2, 0, x, (0,))])
+            sim.schedule(4, x, 100).cancel()
+            sim.run()
+            sim.reset()
+            results.append(result)
+        self.assertEqual(results[0], results[1])
+
+        # Invalid arguments are not detected
+        sim = Simulator(validate=False)
+        sim.ready()
+        sim.schedule(10, 25)
+        sim.schedule_many([(10, 0, 25, [])])
+        self.assertEqual(sim.event_heap_size(), 2)
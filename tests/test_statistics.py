@@ -0,0 +1,93 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+import unittest
+from discrevpy import Simulator, CalendarEventQueue, ArrayEventQueue
+
+
+class TestStatistics(unittest.TestCase):
+
+    def test_statistics(self):
+        for event_queue in [None, CalendarEventQueue(), ArrayEventQueue()]:
+            simulator = Simulator(event_queue)
+            self.assertEqual(simulator.statistics()["events_scheduled"], 0)
+            simulator.ready()
+            during = []
+
+            def spawn(n):
+                for i in range(n):
+                    simulator.schedule(i, time.sleep, 0.0001)
+                during.append(simulator.statistics())
+
+            simulator.schedule(0, spawn, 10)
+            simulator.schedule(3, spawn, 2)
+            simulator.schedule_many([(5, 0, spawn, (1,)), (1000, 0, spawn, (1,))])
+            simulator.cancel(simulator.schedule(4, spawn, 100))
+            simulator.schedule_periodic(7, 0, spawn, 0, count=3)
+            simulator.end(500)
+            simulator.run()
+
+            statistics = simulator.statistics()
+            self.assertEqual(statistics["events_scheduled"], 6 + 10 + 2 + 1 + 2)
+            self.assertEqual(statistics["events_discarded"], 1)
+            self.assertEqual(statistics["events_executed"], 3 + 3 + 10 + 2 + 1)
+            self.assertEqual(statistics["peak_heap_size"], 15)
+            self.assertGreater(statistics["wall_time"], 0.0)
+            self.assertAlmostEqual(
+                statistics["events_per_second"], 19 / statistics["wall_time"], places=6
+            )
+            # Delays: 0, 3, 5, 1000, 4, 7 (start), 7, 7 (re-arm) and the spawned 0-9, 0-1 and 0
+            self.assertEqual(statistics["delay_histogram"], [
+                4, 2, 3, 9, 2, 0, 0, 0, 0, 0, 1
+            ])
+            self.assertEqual(sum(statistics["delay_histogram"]), statistics["events_scheduled"])
+
+            # Queried during the run
+            self.assertEqual(during[0]["events_scheduled"], 16)
+            self.assertEqual(during[0]["events_executed"], 1)
+            self.assertEqual(during[0]["peak_heap_size"], 15)
+            self.assertGreaterEqual(during[1]["wall_time"], during[0]["wall_time"])
+
+            # Cleared by reset
+            simulator.reset()
+            self.assertEqual(simulator.statistics(), {
+                "events_scheduled": 0,
+                "events_executed": 0,
+                "events_discarded": 0,
+                "peak_heap_size": 0,
+                "wall_time": 0.0,
+                "events_per_second": 0.0,
+                "delay_histogram": []
+            })
+
+    def test_compaction(self):
+        simulator = Simulator()
+        simulator.ready()
+        handles = [simulator.schedule(i, time.time) for i in range(2000)]
+        for handle in handles[:1500]:
+            simulator.cancel(handle)
+        simulator.run()
+        statistics = simulator.statistics()
+        self.assertEqual(statistics["events_discarded"], 1500)
+        self.assertEqual(statistics["events_executed"], 500)
+        self.assertEqual(statistics["peak_heap_size"], 2000)
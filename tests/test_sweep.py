@@ -0,0 +1,109 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import unittest
+import tempfile
+from discrevpy import run_sweep, parameter_grid, model_version
+from discrevpy.sweep import cache_key
+
+
+def counting_model(simulator, parameters):
+    result = {"events": 0}
+
+    def tick():
+        result["events"] += 1
+        if result["events"] < parameters["n"]:
+            simulator.schedule(parameters["gap"], tick)
+
+    simulator.schedule(0, tick)
+    simulator.end(parameters["horizon"])
+    return result
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_parameter_grid(self):
+        self.assertEqual(parameter_grid({"a": [1, 2], "b": ["x", "y"]}), [
+            {"a": 1, "b": "x"}, {"a": 1, "b": "y"}, {"a": 2, "b": "x"}, {"a": 2, "b": "y"}
+        ])
+        self.assertEqual(parameter_grid({}), [{}])
+        self.assertEqual(parameter_grid({"a": []}), [])
+
+    def test_cache_key(self):
+        version = model_version(counting_model)
+        self.assertEqual(cache_key({"a": 1, "b": 2}, version), cache_key({"b": 2, "a": 1}, version))
+        self.assertNotEqual(cache_key({"a": 1}, version), cache_key({"a": 2}, version))
+        self.assertNotEqual(cache_key({"a": 1}, version), cache_key({"a": 1}, "other"))
+        self.assertEqual(cache_key({"a": [1, {"b": None}]}, version), cache_key({"a": [1, {"b": None}]}, version))
+
+        # Values which are not JSON values are rejected, unless an encode function is given
+        with self.assertRaises(ValueError):
+            cache_key({"a": (1, 2)}, version)
+        with self.assertRaises(ValueError):
+            cache_key({"a": [object()]}, version)
+        with self.assertRaises(ValueError):
+            cache_key({"a": {1: 2}}, version)
+        self.assertNotEqual(cache_key({"a": (1, 2)}, version, list), cache_key({"a": [1, 2]}, version))
+        self.assertEqual(cache_key({"a": (1, 2)}, version, list), cache_key({"a": (1, 2)}, version, list))
+        self.assertNotEqual(cache_key({"a": (1, 2)}, version, list), cache_key({"a": (2, 1)}, version, list))
+
+    def test_sweep_and_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            grid = {"n": [3, 10], "gap": [5, 50], "horizon": [100]}
+            results = run_sweep(counting_model, grid, cache_dir, seeds=[1, 2], num_workers=2)
+            self.assertEqual(len(results), 8)
+            self.assertEqual(results[0], ({"n": 3, "gap": 5, "horizon": 100, "seed": 1}, {"events": 3}))
+            self.assertEqual(results[1][0]["seed"], 2)
+            self.assertEqual(results[6], ({"n": 10, "gap": 50, "horizon": 100, "seed": 1}, {"events": 2}))
+            self.assertEqual(len(os.listdir(cache_dir)), 8)
+
+            # Unchanged points are served from the cache (a model which fails if it were run)
+            def failing_model(simulator, parameters):
+                raise RuntimeError("Must not be run")
+
+            cached = run_sweep(
+                failing_model, grid, cache_dir, seeds=[1, 2], num_workers=1,
+                version=model_version(counting_model)
+            )
+            self.assertEqual(cached, results)
+
+            # Only the new points are run
+            grid["horizon"] = [100, 20]
+            extended = run_sweep(counting_model, grid, cache_dir, seeds=[1, 2], num_workers=1)
+            self.assertEqual(len(extended), 16)
+            self.assertEqual(len(os.listdir(cache_dir)), 16)
+            self.assertEqual(extended[2], ({"n": 3, "gap": 5, "horizon": 20, "seed": 1}, {"events": 3}))
+            self.assertEqual(extended[14], ({"n": 10, "gap": 50, "horizon": 20, "seed": 1}, {"events": 1}))
+
+            # A different model version invalidates the cache
+            with self.assertRaises(RuntimeError):
+                run_sweep(failing_model, grid, cache_dir, seeds=[1], num_workers=1, version="changed")
+
+    def test_invalid(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with self.assertRaises(ValueError):
+                run_sweep(counting_model, [1, 2], cache_dir)
+            with self.assertRaises(ValueError):
+                run_sweep(counting_model, {"seed": [1, 2]}, cache_dir)
+            with self.assertRaises(ValueError):
+                run_sweep(counting_model, {"n": [(1, 2)]}, cache_dir)
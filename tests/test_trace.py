@@ -0,0 +1,166 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2021 snkas
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import unittest
+import tempfile
+from discrevpy import Simulator, ArrayEventQueue, TraceWriter, read_trace
+
+
+def ping(result):
+    result.append("ping")
+
+
+def walker(steps):
+    for step in steps:
+        yield step
+
+
+def sleeper():
+    yield 4
+
+
+class Model:
+
+    def __init__(self):
+        self.result = []
+
+    def pong(self, value):
+        self.result.append(value)
+
+
+class TestTrace(unittest.TestCase):
+
+    def run_traced(self, path, capacity, event_queue=None):
+        simulator = Simulator(event_queue)
+        model = Model()
+        other = Model()
+        simulator.ready()
+        with TraceWriter(path, capacity) as writer:
+            simulator.trace(writer)
+            simulator.schedule(10, ping, model.result)
+            simulator.schedule_with_priority(5, 3, model.pong, 1)
+            simulator.schedule_with_priority(5, -3, other.pong, 2)
+            cancelled = simulator.schedule(7, ping, model.result)
+            simulator.cancel(cancelled)
+            simulator.schedule(20, model.pong, 3)
+            simulator.run()
+            self.assertEqual(writer.count(), 4)
+        return read_trace(path)
+
+    def test_trace(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.trace")
+            for event_queue in [None, ArrayEventQueue()]:
+                trace = self.run_traced(path, 100, event_queue)
+                self.assertEqual(list(trace["time"]), [5, 5, 10, 20])
+                self.assertEqual(list(trace["priority"]), [-3, 3, 0, 0])
+                self.assertEqual(list(trace["event_id"]), [2, 1, 0, 4])
+                self.assertEqual(list(trace["callback_id"]), [0, 0, 1, 0])
+                self.assertEqual(trace["callbacks"], [__name__ + ".Model.pong", __name__ + ".ping"])
+                self.assertEqual(trace["count"], 4)
+
+    def test_builtin_callbacks(self):
+        # Built-in methods share the method of their type
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "builtin.trace")
+            first = []
+            second = []
+            simulator = Simulator()
+            simulator.ready()
+            with TraceWriter(path, 100) as writer:
+                simulator.trace(writer)
+                simulator.schedule(1, first.append, 1)
+                simulator.schedule(2, second.append, 2)
+                simulator.schedule(3, len, first)
+                simulator.run()
+            trace = read_trace(path)
+            self.assertEqual(list(trace["callback_id"]), [0, 0, 1])
+            self.assertEqual(trace["callbacks"][0], "list.append")
+            self.assertEqual(len(trace["callbacks"]), 2)
+
+    def test_ring_buffer(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ring.trace")
+            trace = self.run_traced(path, 3)
+            self.assertEqual(list(trace["time"]), [5, 10, 20])
+            self.assertEqual(list(trace["event_id"]), [1, 0, 4])
+            self.assertEqual(trace["count"], 4)
+
+            trace = self.run_traced(path, 2)
+            self.assertEqual(list(trace["time"]), [10, 20])
+
+            trace = self.run_traced(path, 4)
+            self.assertEqual(list(trace["time"]), [5, 5, 10, 20])
+
+    def test_many_events(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "many.trace")
+            simulator = Simulator()
+            simulator.ready()
+            result = []
+            with TraceWriter(path, 1000) as writer:
+                simulator.trace(writer)
+                simulator.schedule_many((i, 0, result.append, (i,)) for i in range(2500))
+                simulator.run()
+            trace = read_trace(path)
+            self.assertEqual(list(trace["time"]), list(range(1500, 2500)))
+            self.assertEqual(list(trace["callback_id"]), [0] * 1000)
+            self.assertEqual(result, list(range(2500)))
+
+    def test_processes(self):
+        # The steps of each process are attributed to its generator function
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "processes.trace")
+            simulator = Simulator()
+            simulator.ready()
+            with TraceWriter(path, 100) as writer:
+                simulator.trace(writer)
+                simulator.process(walker([1, 2]))
+                simulator.process(sleeper(), delay=2)
+                simulator.process(walker([3]))
+                simulator.run()
+            trace = read_trace(path)
+            self.assertEqual(list(trace["time"]), [0, 0, 1, 2, 3, 3, 6])
+            self.assertEqual(list(trace["callback_id"]), [0, 0, 0, 1, 0, 0, 1])
+            self.assertEqual(trace["callbacks"], ["walker", "sleeper"])
+
+    def test_invalid(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "invalid.trace")
+            with self.assertRaises(ValueError):
+                TraceWriter(path, 0)
+            simulator = Simulator()
+            with TraceWriter(path, 10) as writer:
+                with self.assertRaises(ValueError):
+                    simulator.trace(writer)
+                simulator.ready()
+                with self.assertRaises(ValueError):
+                    simulator.trace("file")
+                simulator.trace(writer)
+                simulator.schedule(2 ** 64, ping, [])
+                with self.assertRaises(ValueError):
+                    simulator.run()
+            with open(path, "wb") as file:
+                file.write(b"0123456789" * 10)
+            with self.assertRaises(ValueError):
+                read_trace(path)